@@ -0,0 +1,144 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from threading import Lock
+from typing import Optional
+
+
+class OverloadError(RuntimeError):
+    """
+    Raised when a request cannot be completed within its deadline
+    """
+
+    def __init__(self, estimated_seconds: float, deadline_seconds: float,
+                 retry_after: float):
+        self.estimated_seconds = estimated_seconds
+        self.deadline_seconds = deadline_seconds
+        self.retry_after = retry_after
+        RuntimeError.__init__(self, f"Estimated completion in "
+                                    f"{round(estimated_seconds, 2)}s exceeds "
+                                    f"deadline of {deadline_seconds}s")
+
+    def to_dict(self) -> dict:
+        return {"error": "overloaded",
+                "estimated_seconds": round(self.estimated_seconds, 3),
+                "deadline_seconds": self.deadline_seconds,
+                "retry_after": round(self.retry_after, 3)}
+
+
+class AdmissionTicket:
+    """
+    Work admitted by an `AdmissionController`. Call `complete` with the
+    measured inference time when the work is done.
+    """
+
+    def __init__(self, controller, audio_seconds: float, work: float):
+        self._controller = controller
+        self.audio_seconds = audio_seconds
+        self.work = work
+        self._done = False
+
+    def complete(self, inference_seconds: Optional[float] = None):
+        """
+        Release this ticket's work and update the latency model
+        :param inference_seconds: measured inference time (None if failed)
+        """
+        if not self._done:
+            self._done = True
+            self._controller._complete(self, inference_seconds)
+
+
+class AdmissionController:
+    """
+    Estimate completion time for STT requests from recent inference speed
+    and work already admitted, rejecting requests that cannot meet their
+    deadline before any inference is done.
+    """
+
+    def __init__(self, concurrency: int = 1, initial_rtf: float = 0.5,
+                 overhead: float = 0.1, smoothing: float = 0.2):
+        """
+        :param concurrency: number of requests processed in parallel
+        :param initial_rtf: real-time factor (inference seconds per second
+            of audio) assumed before any requests are measured
+        :param overhead: fixed seconds of work assumed per request
+        :param smoothing: weight of new measurements in the moving average
+        """
+        self.concurrency = max(concurrency, 1)
+        self.rtf = initial_rtf
+        self.overhead = overhead
+        self.smoothing = smoothing
+        self.pending_work = 0.0
+        self.in_flight = 0
+        self.rejected = 0
+        self._lock = Lock()
+
+    def estimate(self, audio_seconds: float) -> (float, float):
+        """
+        Estimate completion time for a request
+        :param audio_seconds: duration of audio to process
+        :returns: (estimated seconds until completion, seconds of work)
+        """
+        work = self.overhead + self.rtf * audio_seconds
+        wait = self.pending_work / self.concurrency \
+            if self.in_flight >= self.concurrency else 0.0
+        return wait + work, work
+
+    def admit(self, audio_seconds: Optional[float],
+              deadline: Optional[float]) -> AdmissionTicket:
+        """
+        Admit a request or raise an `OverloadError`
+        :param audio_seconds: duration of audio to process (None if unknown)
+        :param deadline: seconds the request may take (None for no deadline)
+        :returns: ticket to complete when the request is done
+        """
+        audio_seconds = audio_seconds or 0.0
+        with self._lock:
+            estimated, work = self.estimate(audio_seconds)
+            if deadline is not None and estimated > deadline:
+                self.rejected += 1
+                raise OverloadError(estimated, deadline,
+                                    retry_after=estimated - work)
+            self.pending_work += work
+            self.in_flight += 1
+        return AdmissionTicket(self, audio_seconds, work)
+
+    def _complete(self, ticket: AdmissionTicket,
+                  inference_seconds: Optional[float]):
+        with self._lock:
+            self.pending_work = max(self.pending_work - ticket.work, 0.0)
+            self.in_flight -= 1
+            if inference_seconds is not None and ticket.audio_seconds:
+                rtf = max(inference_seconds - self.overhead, 0.0) / \
+                    ticket.audio_seconds
+                self.rtf += self.smoothing * (rtf - self.rtf)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {"rtf": self.rtf, "pending_work": self.pending_work,
+                    "in_flight": self.in_flight, "rejected": self.rejected}
@@ -0,0 +1,212 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from threading import Thread
+from time import time
+from typing import Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from ovos_bus_client import Message
+from ovos_utils.log import LOG
+
+
+class AsyncSpeechAPI:
+    """
+    Handles speech API requests as coroutines on a dedicated asyncio event
+    loop. Blocking STT and file work runs on a bounded thread pool while
+    waiting (i.e. for skills to acknowledge an utterance) is done with
+    futures, so pending requests do not each hold an OS thread. Requests
+    for a streaming API STT engine, which handles one request at a time,
+    wait for the engine on the event loop rather than on a worker thread.
+    """
+
+    def __init__(self, service, workers: int = 4, ack_timeout: float = 10):
+        """
+        :param service: NeonSpeechClient to handle requests for
+        :param workers: number of threads for blocking STT work
+        :param ack_timeout: seconds to wait for skills to acknowledge input
+        """
+        self.service = service
+        self.bus = service.bus
+        self.ack_timeout = ack_timeout
+        self.in_flight = 0
+        self.loop = asyncio.new_event_loop()
+        self._executor = ThreadPoolExecutor(max_workers=workers,
+                                            thread_name_prefix="speech_api")
+        # reply msg_type -> list of (ident, Future) awaiting a response
+        self._waiters: Dict[str, List[Tuple[str, asyncio.Future]]] = dict()
+        # Created on the event loop
+        self._stream_lock: Optional[asyncio.Lock] = None
+        self._thread = Thread(target=self._run_loop, daemon=True,
+                              name="speech_api_loop")
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def _submit(self, coro_fn: Callable, message: Message):
+        async def _track():
+            self.in_flight += 1
+            try:
+                await coro_fn(message)
+            except Exception as e:
+                LOG.exception(f"Failed to handle {message.msg_type}: {e}")
+            finally:
+                self.in_flight -= 1
+        asyncio.run_coroutine_threadsafe(_track(), self.loop)
+
+    async def run_blocking(self, fn: Callable, *args):
+        """
+        Run a blocking function on the worker thread pool
+        :param fn: function to call
+        :param args: positional args to pass to `fn`
+        :returns: value returned by `fn`
+        """
+        return await self.loop.run_in_executor(self._executor, fn, *args)
+
+    def handle_get_stt(self, message: Message):
+        """
+        Bus handler for `neon.get_stt`
+        """
+        self._submit(self._get_stt, message)
+
+    def handle_audio_input(self, message: Message):
+        """
+        Bus handler for `neon.audio_input`
+        """
+        self._submit(self._audio_input, message)
+
+    @asynccontextmanager
+    async def _stt_slot(self, message: Message):
+        """
+        Wait until the API STT engine can handle a request
+        :param message: API request message
+        :raises TimeoutError: if a streaming engine is not available before
+            the request deadline (default 30s)
+        """
+        if not hasattr(getattr(self.service, 'api_stt', None),
+                       'stream_start'):
+            yield
+            return
+        if self._stream_lock is None:
+            self._stream_lock = asyncio.Lock()
+        deadline = self.service._get_request_deadline(message)
+        timeout = 30 if deadline is None else max(deadline, 0)
+        try:
+            await asyncio.wait_for(self._stream_lock.acquire(), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError("Timed out waiting for streaming STT")
+        try:
+            yield
+        finally:
+            self._stream_lock.release()
+
+    async def _get_stt(self, message: Message):
+        try:
+            async with self._stt_slot(message):
+                await self.run_blocking(self.service.handle_get_stt, message)
+        except TimeoutError as e:
+            LOG.error(e)
+            ident = message.context.get("ident") or "neon.get_stt.response"
+            self.bus.emit(message.reply(
+                ident, data=self.service._get_error_data(e)))
+
+    async def _audio_input(self, message: Message):
+        ident = message.context.get("ident") or "neon.audio_input.response"
+        LOG.info(f"Handling audio input: {ident}")
+        try:
+            async with self._stt_slot(message):
+                utterance, reply_data = await self.run_blocking(
+                    self.service._transcribe_audio_input, message)
+            sent = time()
+            response = await self.emit_and_wait(utterance, self.ack_timeout)
+            self.service._record_latency("skills_ack", time() - sent)
+            if not response:
+                LOG.error(f"Skills didn't handle {utterance.context['ident']}!")
+            reply_data["skills_recv"] = response is not None
+            self.bus.emit(message.reply(ident, data=reply_data))
+        except Exception as e:
+            LOG.error(e)
+            self.bus.emit(message.reply(
+                ident, data=self.service._get_error_data(e)))
+
+    async def emit_and_wait(self, message: Message,
+                            timeout: float = 3.0) -> Optional[Message]:
+        """
+        Emit a message and wait for `<msg_type>.response` without blocking a
+        thread. A response is matched to the request by context `ident`; an
+        `ident` is added to the message context if it has none.
+        :param message: Message to emit
+        :param timeout: seconds to wait for a response
+        :returns: response Message, or None if the request timed out
+        """
+        reply_type = f"{message.msg_type}.response"
+        if reply_type not in self._waiters:
+            self._waiters[reply_type] = list()
+            self.bus.on(reply_type, self._handle_response)
+        if not message.context.get("ident"):
+            message.context["ident"] = str(uuid4())
+        waiter = (str(message.context["ident"]), self.loop.create_future())
+        self._waiters[reply_type].append(waiter)
+        try:
+            self.bus.emit(message)
+            return await asyncio.wait_for(waiter[1], timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            if waiter in self._waiters[reply_type]:
+                self._waiters[reply_type].remove(waiter)
+
+    def _handle_response(self, message: Message):
+        # Called from the bus thread
+        self.loop.call_soon_threadsafe(self._resolve_waiter, message)
+
+    def _resolve_waiter(self, message: Message):
+        ident = message.context.get("ident")
+        waiter = next((w for w in self._waiters.get(message.msg_type, [])
+                       if not w[1].done() and ident and w[0] == str(ident)),
+                      None)
+        if not waiter:
+            LOG.debug(f"Ignoring unmatched {message.msg_type} (ident={ident})")
+            return
+        waiter[1].set_result(message)
+        self._waiters[message.msg_type].remove(waiter)
+
+    def shutdown(self):
+        """
+        Stop the event loop and worker threads
+        """
+        for reply_type in self._waiters:
+            self.bus.remove(reply_type, self._handle_response)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._executor.shutdown(wait=False)
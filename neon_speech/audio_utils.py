@@ -0,0 +1,406 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import mmap
+import os
+import struct
+import sys
+import wave
+
+from typing import Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ovos_utils.log import LOG
+from pydub import AudioSegment
+
+DEFAULT_MAX_PAYLOAD_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_AUDIO_SECONDS = 3600
+# Long audio is transcribed whole unless windowing is configured
+DEFAULT_WINDOW_SECONDS = None
+
+
+class AudioLimitError(ValueError):
+    """
+    Raised when an audio input exceeds a configured size or duration limit
+    """
+
+
+def get_decoded_size(encoded_audio: str) -> int:
+    """
+    Get the number of bytes a base64 string decodes to without decoding it
+    :param encoded_audio: base64-encoded audio payload
+    :returns: decoded payload size in bytes
+    """
+    padding = encoded_audio[-2:].count('=')
+    return (len(encoded_audio) * 3) // 4 - padding
+
+
+def check_payload_size(size: int, max_bytes: Optional[int]):
+    """
+    Raise an `AudioLimitError` if `size` exceeds `max_bytes`
+    :param size: payload size in bytes
+    :param max_bytes: maximum allowed payload size (None or 0 for no limit)
+    """
+    if max_bytes and size > max_bytes:
+        raise AudioLimitError(f"Audio payload of {size} bytes exceeds limit "
+                              f"of {max_bytes} bytes")
+
+
+def check_audio_duration(duration: Optional[float],
+                         max_seconds: Optional[float]):
+    """
+    Raise an `AudioLimitError` if `duration` exceeds `max_seconds`
+    :param duration: audio duration in seconds (None if unknown)
+    :param max_seconds: maximum allowed duration (None or 0 for no limit)
+    """
+    if max_seconds and duration and duration > max_seconds:
+        raise AudioLimitError(f"Audio duration of {round(duration, 2)}s "
+                              f"exceeds limit of {max_seconds}s")
+
+
+def get_audio_duration(audio_file: str) -> Optional[float]:
+    """
+    Get the duration of an audio file without decoding the audio. WAV headers
+    are read directly; other formats are inspected with `ffprobe`.
+    :param audio_file: path to audio file
+    :returns: duration in seconds, or None if it could not be determined
+    """
+    try:
+        with wave.open(audio_file, 'rb') as wav:
+            return wav.getnframes() / wav.getframerate()
+    except (wave.Error, EOFError):
+        pass
+    try:
+        from pydub.utils import mediainfo
+        return float(mediainfo(audio_file)['duration'])
+    except Exception as e:
+        LOG.debug(f"Unable to determine duration of {audio_file}: {e}")
+        return None
+
+
+def _normalize_segment(segment: AudioSegment, sample_rate: int,
+                       sample_width: int) -> AudioSegment:
+    return (segment.set_channels(1).set_frame_rate(sample_rate)
+            .set_sample_width(sample_width))
+
+
+class MappedWav:
+    """
+    Memory-mapped PCM WAV file. The `pcm` attribute is a read-only,
+    zero-copy memoryview of the audio data chunk; pages are loaded from the
+    page cache as slices are accessed. The mapping is released once the
+    last view referencing it is garbage collected.
+    """
+
+    def __init__(self, audio_file: str):
+        """
+        :param audio_file: path to a PCM WAV file
+        :raises ValueError: if the file is not an uncompressed PCM WAV file
+        """
+        with open(audio_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < 12:
+                raise ValueError(f"Not a WAV file: {audio_file}")
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if data[:4] != b'RIFF' or data[8:12] != b'WAVE':
+            raise ValueError(f"Not a WAV file: {audio_file}")
+        fmt = None
+        offset = 12
+        while offset + 8 <= len(data):
+            chunk_id = data[offset:offset + 4]
+            chunk_size, = struct.unpack_from('<I', data, offset + 4)
+            offset += 8
+            if chunk_id == b'fmt ':
+                fmt = struct.unpack_from('<HHIIHH', data, offset)
+            elif chunk_id == b'data':
+                if not fmt or fmt[0] != 1:
+                    raise ValueError(f"Not a PCM WAV file: {audio_file}")
+                self.channels = fmt[1]
+                self.sample_rate = fmt[2]
+                self.sample_width = fmt[5] // 8
+                # Streamed WAV files may report a size larger than the file
+                end = min(offset + chunk_size, len(data))
+                end -= (end - offset) % (self.channels * self.sample_width)
+                self.pcm = memoryview(data)[offset:end]
+                return
+            offset += chunk_size + (chunk_size % 2)
+        raise ValueError(f"No data chunk in: {audio_file}")
+
+    def is_compatible(self, sample_rate: int, sample_width: int) -> bool:
+        """
+        Check if the audio can be used without conversion
+        :param sample_rate: desired sample rate
+        :param sample_width: desired sample width in bytes
+        :returns: True if the audio is mono with the requested format
+        """
+        return (self.channels, self.sample_rate, self.sample_width) == \
+            (1, sample_rate, sample_width)
+
+
+def iter_audio_windows(audio_file: str, sample_rate: int, sample_width: int,
+                       window_seconds: Optional[float] = None,
+                       use_mmap: bool = False) -> \
+        Iterator[Union[bytes, memoryview]]:
+    """
+    Iterate over mono PCM audio read from a file in windows of at most
+    `window_seconds`. WAV files are read incrementally so only one window is
+    held in memory at a time; other formats are decoded once and sliced.
+    :param audio_file: path to audio file
+    :param sample_rate: desired output sample rate
+    :param sample_width: desired output sample width in bytes
+    :param window_seconds: maximum window duration (None to read all audio)
+    :param use_mmap: if True, WAV files that need no conversion are
+        memory-mapped and windows are yielded as zero-copy memoryviews
+    :returns: iterator of raw PCM byte windows
+    """
+    if use_mmap:
+        try:
+            mapped = MappedWav(audio_file)
+        except (OSError, ValueError, struct.error) as e:
+            LOG.debug(f"Not memory-mapping {audio_file}: {e}")
+            mapped = None
+        if mapped and mapped.is_compatible(sample_rate, sample_width):
+            pcm = mapped.pcm
+            del mapped
+            window_bytes = int(window_seconds * sample_rate) * sample_width \
+                if window_seconds else len(pcm)
+            for start in range(0, len(pcm), max(window_bytes, 1)):
+                yield pcm[start:start + window_bytes]
+            return
+    try:
+        wav = wave.open(audio_file, 'rb')
+    except (wave.Error, EOFError):
+        wav = None
+    if wav is None:
+        segment = _normalize_segment(AudioSegment.from_file(audio_file),
+                                     sample_rate, sample_width)
+        if not window_seconds:
+            yield segment.raw_data
+            return
+        window_ms = int(window_seconds * 1000)
+        for start in range(0, len(segment), window_ms):
+            yield segment[start:start + window_ms].raw_data
+        return
+
+    with wav:
+        channels = wav.getnchannels()
+        in_rate = wav.getframerate()
+        in_width = wav.getsampwidth()
+        needs_conversion = (channels, in_rate, in_width) != \
+            (1, sample_rate, sample_width)
+        frames = int(window_seconds * in_rate) if window_seconds else \
+            wav.getnframes()
+        while True:
+            raw = wav.readframes(max(frames, 1))
+            if not raw:
+                break
+            if needs_conversion:
+                raw = _normalize_segment(
+                    AudioSegment(data=raw, sample_width=in_width,
+                                 frame_rate=in_rate, channels=channels),
+                    sample_rate, sample_width).raw_data
+            yield raw
+
+
+def get_frame_levels(audio: Union[bytes, memoryview], sample_width: int,
+                     frame_samples: int) -> np.ndarray:
+    """
+    Compute the RMS level of each frame of mono PCM audio in dBFS
+    :param audio: raw PCM audio
+    :param sample_width: sample width in bytes (1, 2, or 4)
+    :param frame_samples: samples per frame; a trailing partial frame is
+        padded with silence
+    :returns: array of frame levels in dBFS
+    """
+    dtype = {1: np.uint8, 2: np.int16, 4: np.int32}[sample_width]
+    samples = np.frombuffer(audio, dtype=dtype,
+                            count=len(audio) // sample_width)
+    if sample_width == 1:
+        # 8-bit PCM is unsigned
+        samples = samples.astype(np.int16) - 128
+    full_scale = float(2 ** (8 * sample_width - 1))
+    pad = -len(samples) % frame_samples
+    frames = np.pad(samples.astype(np.float64) / full_scale,
+                    (0, pad)).reshape(-1, frame_samples)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+def find_speech_bounds(audio: Union[bytes, memoryview], sample_rate: int,
+                       sample_width: int, threshold_db: float = -45.0,
+                       margin_seconds: float = 0.2,
+                       frame_seconds: float = 0.02, vad=None) -> \
+        Optional[Tuple[int, int]]:
+    """
+    Find the region of audio containing speech, including a margin of
+    surrounding audio
+    :param audio: raw mono PCM audio
+    :param sample_rate: audio sample rate
+    :param sample_width: audio sample width in bytes
+    :param threshold_db: frames with an RMS level above this are speech
+    :param margin_seconds: audio to keep before and after speech
+    :param frame_seconds: duration of analyzed frames
+    :param vad: optional VAD plugin used to classify frames instead of level
+    :returns: (start, end) byte offsets, or None if there is no speech
+    """
+    frame_samples = max(int(sample_rate * frame_seconds), 1)
+    frame_bytes = frame_samples * sample_width
+    if not len(audio):
+        return None
+    if vad:
+        speech = np.array([not vad.is_silence(bytes(audio[i:i + frame_bytes]))
+                           for i in range(0, len(audio), frame_bytes)])
+    else:
+        speech = get_frame_levels(audio, sample_width,
+                                  frame_samples) > threshold_db
+    voiced = np.flatnonzero(speech)
+    if not len(voiced):
+        return None
+    margin = int(margin_seconds * sample_rate) * sample_width
+    start = max(int(voiced[0]) * frame_bytes - margin, 0)
+    end = min((int(voiced[-1]) + 1) * frame_bytes + margin, len(audio))
+    return start, end
+
+
+def split_windows_at_silence(windows: Iterator[Union[bytes, memoryview]],
+                             sample_rate: int, sample_width: int,
+                             search_seconds: float = 5.0,
+                             frame_seconds: float = 0.02) -> Iterator[bytes]:
+    """
+    Move the boundaries between consecutive audio windows to the quietest
+    frame within the last `search_seconds` of each window so words are not
+    cut at fixed offsets. Audio after a boundary is carried into the next
+    window, so windows may be up to `search_seconds` longer than the input.
+    :param windows: iterator of raw mono PCM windows
+    :param sample_rate: audio sample rate
+    :param sample_width: audio sample width in bytes
+    :param search_seconds: audio at the end of each window to search
+    :param frame_seconds: duration of analyzed frames
+    :returns: iterator of raw PCM windows
+    """
+    frame_samples = max(int(sample_rate * frame_seconds), 1)
+    frame_bytes = frame_samples * sample_width
+    search_bytes = int(search_seconds * sample_rate) * sample_width
+    pending = None
+    for window in windows:
+        if pending is None:
+            pending = bytes(window)
+            continue
+        start = max(len(pending) - search_bytes, 0)
+        levels = get_frame_levels(memoryview(pending)[start:], sample_width,
+                                  frame_samples)
+        # Split in the middle of the quietest frame
+        quietest = int(levels.argmin())
+        split = min(start + quietest * frame_bytes +
+                    frame_samples // 2 * sample_width, len(pending))
+        yield pending[:split]
+        pending = pending[split:] + bytes(window)
+        del window
+    if pending:
+        yield pending
+
+
+def merge_window_transcriptions(
+        window_results: List[List[Tuple[str, float]]]) -> \
+        List[Tuple[str, float]]:
+    """
+    Combine per-window transcriptions into a single n-best list. The n-th
+    hypothesis joins the n-th alternative of each window (or a window's last
+    alternative if it has fewer) and confidences are averaged.
+    :param window_results: list of transcriptions for each window
+    :returns: list of merged (text, confidence) transcriptions
+    """
+    if len(window_results) == 1:
+        return window_results[0]
+    windows = [r for r in window_results if r and r[0][0]]
+    if not windows:
+        return []
+    merged = list()
+    for idx in range(max(len(r) for r in windows)):
+        hypotheses = [r[min(idx, len(r) - 1)] for r in windows]
+        hypotheses = [t for t in hypotheses if t[0]]
+        text = " ".join(t[0].strip() for t in hypotheses)
+        confidence = sum(t[1] for t in hypotheses) / len(hypotheses)
+        if (text, confidence) not in merged:
+            merged.append((text, confidence))
+    return merged
+
+
+def get_rss_bytes() -> Optional[int]:
+    """
+    Get the current resident set size of this process
+    :returns: RSS in bytes, or None if it could not be determined
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def get_peak_rss_bytes() -> Optional[int]:
+    """
+    Get the peak resident set size of this process since it started
+    :returns: peak RSS in bytes, or None if it could not be determined
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and KiB elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class AudioMemoryTracker:
+    """
+    Track the size of audio buffers held while handling a single request.
+    Reports also include the process RSS; `peak_rss_increase_bytes` is the
+    growth of the process peak RSS while the request was handled, which
+    includes any concurrent requests.
+    """
+
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+        self._start_peak_rss = get_peak_rss_bytes()
+
+    def add(self, size: int):
+        self.current += size
+        self.peak = max(self.peak, self.current)
+
+    def release(self, size: int):
+        self.current = max(self.current - size, 0)
+
+    def report(self) -> dict:
+        peak_rss = get_peak_rss_bytes()
+        return {"peak_audio_bytes": self.peak,
+                "rss_bytes": get_rss_bytes(),
+                "peak_rss_bytes": peak_rss,
+                "peak_rss_increase_bytes": peak_rss - self._start_peak_rss
+                if peak_rss is not None else None}
@@ -0,0 +1,204 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from concurrent.futures import Future
+from threading import Condition, Thread
+from time import time
+from typing import Callable, List, Optional, Tuple
+
+from ovos_plugin_manager.templates.stt import STT
+from ovos_utils.log import LOG
+from speech_recognition import AudioData
+
+from neon_speech.stt_pool import transcribe_audio
+
+
+class _BatchItem:
+    __slots__ = ("audio", "lang", "future")
+
+    def __init__(self, audio: AudioData, lang: str):
+        self.audio = audio
+        self.lang = lang
+        self.future = Future()
+
+
+def bucket_by_length(items: List[_BatchItem], max_ratio: float) -> \
+        List[List[_BatchItem]]:
+    """
+    Group items of similar audio length so padding within a batch is
+    bounded; the longest item in a bucket is at most `max_ratio` times the
+    shortest.
+    :param items: items to group
+    :param max_ratio: max ratio of longest to shortest audio in a bucket
+    :returns: list of buckets
+    """
+    buckets = list()
+    for item in sorted(items, key=lambda i: len(i.audio.frame_data)):
+        length = max(len(item.audio.frame_data), 1)
+        if buckets and length <= max_ratio * \
+                max(len(buckets[-1][0].audio.frame_data), 1):
+            buckets[-1].append(item)
+        else:
+            buckets.append([item])
+    return buckets
+
+
+def pad_audio(audio: List[AudioData]) -> List[AudioData]:
+    """
+    Pad audio with trailing silence to the length of the longest input
+    """
+    length = max(len(a.frame_data) for a in audio)
+    return [a if len(a.frame_data) == length else
+            AudioData(bytes(a.frame_data) +
+                      bytes(length - len(a.frame_data)),
+                      a.sample_rate, a.sample_width) for a in audio]
+
+
+class MicroBatcher:
+    """
+    Collects concurrent STT requests for a short window and runs them as
+    batched inference through an optional plugin method:
+    `transcribe_batch(audio: List[AudioData], lang: str) ->
+    List[List[Tuple[str, float]]]`. Requests for plugins without this method
+    bypass the batcher and are transcribed directly in the calling thread.
+    """
+
+    def __init__(self, get_engine: Callable[[], STT], max_batch_size: int = 8,
+                 max_wait: float = 0.02, bucket_ratio: float = 2.0,
+                 pad: bool = False):
+        """
+        :param get_engine: function returning the STT engine to use
+        :param max_batch_size: max requests per batch
+        :param max_wait: max seconds to wait for a batch to fill
+        :param bucket_ratio: max ratio of longest to shortest audio in a batch
+        :param pad: if True, pad audio in a batch to equal length
+        """
+        self._get_engine = get_engine
+        self.max_batch_size = max(max_batch_size, 1)
+        self.max_wait = max_wait
+        self.bucket_ratio = bucket_ratio
+        self.pad = pad
+        self._queue: List[_BatchItem] = list()
+        self._cond = Condition()
+        self._stopping = False
+        self.batches = 0
+        self.batched_requests = 0
+        self.bypassed_requests = 0
+        self._thread = Thread(target=self._run, daemon=True,
+                              name="stt_batcher")
+        self._thread.start()
+
+    def transcribe(self, audio: AudioData, lang: str,
+                   timeout: Optional[float] = None) -> \
+            List[Tuple[str, float]]:
+        """
+        Transcribe audio as part of the next batch
+        :param audio: audio to transcribe
+        :param lang: language of `audio`
+        :param timeout: max seconds to wait for a result
+        :returns: list of (transcription, confidence)
+        """
+        engine = self._get_engine()
+        if not hasattr(engine, "transcribe_batch"):
+            self.bypassed_requests += 1
+            return transcribe_audio(engine, audio, lang)
+        item = _BatchItem(audio, lang)
+        with self._cond:
+            if self._stopping:
+                raise RuntimeError("Batcher is shut down")
+            self._queue.append(item)
+            self._cond.notify_all()
+        return item.future.result(timeout)
+
+    def _collect(self) -> List[_BatchItem]:
+        with self._cond:
+            self._cond.wait_for(lambda: self._queue or self._stopping)
+            deadline = time() + self.max_wait
+            while len(self._queue) < self.max_batch_size and \
+                    not self._stopping:
+                remaining = deadline - time()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = self._queue[:self.max_batch_size]
+            del self._queue[:self.max_batch_size]
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if not batch:
+                return
+            by_lang = dict()
+            for item in batch:
+                by_lang.setdefault(item.lang, list()).append(item)
+            for lang, items in by_lang.items():
+                for bucket in bucket_by_length(items, self.bucket_ratio):
+                    self._transcribe_bucket(bucket, lang)
+
+    def _transcribe_bucket(self, bucket: List[_BatchItem], lang: str):
+        try:
+            engine = self._get_engine()
+            if len(bucket) > 1 and hasattr(engine, "transcribe_batch"):
+                audio = [i.audio for i in bucket]
+                results = engine.transcribe_batch(
+                    pad_audio(audio) if self.pad else audio, lang)
+                if len(results) != len(bucket):
+                    raise ValueError(f"Expected {len(bucket)} results, got "
+                                     f"{len(results)}")
+                self.batches += 1
+                self.batched_requests += len(bucket)
+                for item, result in zip(bucket, results):
+                    item.future.set_result(result)
+                return
+        except Exception as e:
+            LOG.error(f"Batched transcription failed: {e}")
+            for item in bucket:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+        for item in bucket:
+            try:
+                item.future.set_result(engine.transcribe(item.audio, lang))
+            except Exception as e:
+                item.future.set_exception(e)
+
+    def get_stats(self) -> dict:
+        with self._cond:
+            queued = len(self._queue)
+        return {"queued": queued, "batches": self.batches,
+                "batched_requests": self.batched_requests,
+                "bypassed_requests": self.bypassed_requests,
+                "mean_batch_size": self.batched_requests / self.batches
+                if self.batches else 0.0}
+
+    def shutdown(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._thread.join(5)
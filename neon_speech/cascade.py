@@ -0,0 +1,124 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from threading import Lock
+from time import monotonic
+from typing import Callable, List, Optional, Tuple
+
+from ovos_plugin_manager.templates.stt import STT
+from ovos_utils.log import LOG
+from speech_recognition import AudioData
+
+PRIMARY = "primary"
+SECONDARY = "secondary"
+
+
+def get_top_confidence(transcriptions) -> Optional[float]:
+    """
+    Get the confidence of the best hypothesis in an STT result
+    :param transcriptions: STT result as a list of (text, confidence)
+    :returns: highest confidence, or None if the result has no confidence
+    """
+    if not transcriptions or isinstance(transcriptions, str):
+        return None
+    return max(t[1] for t in transcriptions)
+
+
+class CascadeSTT:
+    """
+    Transcribes audio with a fast primary engine and only re-runs audio on a
+    slower, more accurate secondary engine when the primary result has low
+    confidence.
+    """
+
+    def __init__(self, primary: STT,
+                 secondary: Callable[[AudioData, str],
+                                     List[Tuple[str, float]]],
+                 threshold: float = 0.8,
+                 on_result: Optional[Callable[[str, float], None]] = None):
+        """
+        :param primary: fast STT engine tried first
+        :param secondary: function transcribing audio with the accurate engine
+        :param threshold: min top confidence to accept the primary result
+        :param on_result: optional callback with tier name and latency
+        """
+        self.primary = primary
+        self._secondary = secondary
+        self.threshold = threshold
+        self._on_result = on_result
+        self._lock = Lock()
+        self.requests = 0
+        self.escalations = 0
+        self._latency = {PRIMARY: 0.0, SECONDARY: 0.0}
+
+    def transcribe(self, audio: AudioData, lang: str) -> \
+            List[Tuple[str, float]]:
+        """
+        Transcribe audio, escalating to the secondary engine if needed
+        :param audio: audio to transcribe
+        :param lang: language of `audio`
+        :returns: list of (transcription, confidence)
+        """
+        start = monotonic()
+        try:
+            result = self.primary.transcribe(audio, lang)
+        except Exception as e:
+            LOG.error(f"Primary STT failed: {e}")
+            result = None
+        confidence = get_top_confidence(result)
+        self._record(PRIMARY, monotonic() - start)
+        if confidence is not None and confidence >= self.threshold:
+            return result
+        LOG.debug(f"Escalating STT (confidence={confidence})")
+        start = monotonic()
+        try:
+            return self._secondary(audio, lang)
+        finally:
+            self._record(SECONDARY, monotonic() - start)
+
+    def _record(self, tier: str, duration: float):
+        with self._lock:
+            if tier == PRIMARY:
+                self.requests += 1
+            else:
+                self.escalations += 1
+            self._latency[tier] += duration
+        if self._on_result:
+            self._on_result(tier, duration)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            counts = {PRIMARY: self.requests, SECONDARY: self.escalations}
+            return {
+                "requests": self.requests,
+                "escalations": self.escalations,
+                "escalation_rate": self.escalations / self.requests
+                if self.requests else 0.0,
+                "mean_latency": {tier: self._latency[tier] / counts[tier]
+                                 if counts[tier] else 0.0
+                                 for tier in (PRIMARY, SECONDARY)}}
@@ -107,13 +107,38 @@ def install_plugin(module, package, force_install):
 @neon_speech_cli.command(help="Install neon-speech module dependencies from config & cli")
 @click.option("--package", "-p", default=[], multiple=True,
               help="Additional package to install (can be repeated)")
-def install_dependencies(package: List[str]):
+@click.option("--force", "-f", default=False, is_flag=True,
+              help="Run pip even if dependencies are satisfied")
+def install_dependencies(package: List[str], force: bool):
+    from time import time
     from neon_utils.packaging_utils import install_packages_from_pip
-    from neon_speech.utils import build_extra_dependency_list
+    from neon_speech.utils import build_extra_dependency_list, \
+        get_dependency_fingerprint, get_unsatisfied_requirements, \
+        read_dependency_fingerprint, write_dependency_fingerprint
+    start = time()
     config = Configuration()
     dependencies = build_extra_dependency_list(config, list(package))
+    fingerprint = get_dependency_fingerprint(dependencies)
+    if not force:
+        if fingerprint == read_dependency_fingerprint():
+            click.echo(f"Dependencies unchanged ({fingerprint[:12]}); "
+                       f"skipped pip in {round(time() - start, 3)}s")
+            sys.exit(0)
+        unsatisfied = get_unsatisfied_requirements(dependencies)
+        if not unsatisfied:
+            write_dependency_fingerprint(fingerprint, dependencies)
+            click.echo(f"Dependencies satisfied ({fingerprint[:12]}); "
+                       f"skipped pip in {round(time() - start, 3)}s")
+            sys.exit(0)
+        click.echo(f"Installing unsatisfied dependencies: {unsatisfied}")
     result = install_packages_from_pip("neon-speech", dependencies)
     LOG.info(f"pip exit code: {result}")
+    if result == 0:
+        # Installing packages changes the fingerprint
+        fingerprint = get_dependency_fingerprint(dependencies)
+        write_dependency_fingerprint(fingerprint, dependencies)
+        click.echo(f"Dependencies installed ({fingerprint[:12]}) in "
+                   f"{round(time() - start, 3)}s")
     sys.exit(result)
 
 
@@ -123,5 +148,64 @@ def install_dependencies(package: List[str]):
 def init_plugin(plugin):
     from neon_speech.utils import init_stt_plugin
     from ovos_config.config import Configuration
-    plugin = plugin or Configuration().get("stt", {}).get("module")
-    init_stt_plugin(plugin)
+    stt_config = Configuration().get("stt", {})
+    plugin = plugin or stt_config.get("module")
+    init_stt_plugin(plugin, stt_config.get("model_cache"))
+
+
+@neon_speech_cli.command(help="Export saved recordings as WAV files")
+@click.option("--path", "-p", default=None,
+              help="Recording store directory (default from config)")
+@click.argument("output")
+def export_recordings(path, output):
+    from os.path import isdir, join
+    from ovos_config.locations import get_xdg_data_save_path
+    from neon_speech.recording_store import export_recordings
+    if path:
+        stores = {"": path}
+    else:
+        listener = Configuration().get("listener", {})
+        root = (listener.get("recording_store") or {}).get("path") or \
+            join(listener.get("save_path",
+                              f"{get_xdg_data_save_path()}/listener"),
+                 "recordings")
+        stores = {kind: join(root, kind) for kind in ("utterances",
+                                                      "wake_words")}
+    for kind, store_path in stores.items():
+        if not isdir(store_path):
+            click.echo(f"No recordings in {store_path}")
+            continue
+        count = export_recordings(store_path, join(output, kind))
+        click.echo(f"Exported {count} recordings from {store_path}")
+
+
+@neon_speech_cli.command(help="Evaluate early endpointing on recorded "
+                              "utterances")
+@click.option("--realtime", is_flag=True, default=False,
+              help="Stream audio in real time")
+@click.argument("audio_files", nargs=-1, required=True)
+def evaluate_endpointing(realtime, audio_files):
+    from json import dumps
+    from ovos_plugin_manager.stt import OVOSSTTFactory
+    from ovos_plugin_manager.vad import OVOSVADFactory
+    from neon_speech.endpointing import EndpointPolicy, \
+        evaluate_endpointing as _evaluate
+    config = Configuration()
+    listener = config.get("listener", {})
+    endpointing = listener.get("endpointing") or {}
+    vad_config = listener.get("VAD") or {}
+    policy = EndpointPolicy(
+        stable_seconds=endpointing.get("stable_seconds", 0.3),
+        min_silence_seconds=endpointing.get("min_silence_seconds", 0.15),
+        min_words=endpointing.get("min_words", 1),
+        require_punctuation=endpointing.get("require_punctuation", False))
+    summary = _evaluate(list(audio_files), OVOSSTTFactory.create(config),
+                        OVOSVADFactory.create(config), policy,
+                        config.get("lang", "en-us"),
+                        silence_seconds=vad_config.get(
+                            "silence_seconds", listener.get("silence_end",
+                                                            0.7)),
+                        sample_rate=listener.get("sample_rate", 16000),
+                        realtime=realtime,
+                        on_result=lambda r: click.echo(dumps(r)))
+    click.echo(dumps(summary, indent=2))
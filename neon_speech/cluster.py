@@ -0,0 +1,342 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha1
+from threading import Event, Lock, Thread, Timer
+from time import time
+from typing import Callable, Dict, Optional
+from uuid import uuid4
+
+from ovos_bus_client import Message
+from ovos_utils.log import LOG
+
+CLAIM = "neon.speech.cluster.claim"
+WON = "neon.speech.cluster.won"
+HEARTBEAT = "neon.speech.cluster.heartbeat"
+DONE = "neon.speech.cluster.done"
+
+
+class _Request:
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.message = None
+        self.handler = None
+        self.epoch = 0
+        self.claims: Dict[int, Dict[str, float]] = dict()
+        self.excluded = set()
+        self.owner = None
+        self.lease_expires = None
+        self.created = time()
+
+
+class ClusterCoordinator:
+    """
+    Coordinates API request handling between service instances sharing a
+    messagebus so each request is handled by exactly one instance.
+
+    Every instance receives each request and broadcasts a claim with its
+    current load. After `claim_window` seconds, all instances select the
+    same owner: the claim with the lowest (load, instance id). The owner
+    announces that it won before handling the request; an instance whose
+    election has not completed yet (i.e. it received the request or a claim
+    late) yields to the announced owner instead of electing itself. The
+    owner handles the request while broadcasting heartbeats. The instance
+    with the next best claim holds the request as a standby and, if the
+    owner's lease expires before it reports completion, runs a new election
+    that excludes the failed owner; other instances drop the request payload
+    as soon as the owner is known.
+    """
+
+    def __init__(self, bus, instance_id: Optional[str] = None,
+                 workers: int = 2, claim_window: float = 0.1,
+                 lease_seconds: float = 5.0,
+                 load_fn: Optional[Callable[[], float]] = None):
+        """
+        :param bus: messagebus client shared with other instances
+        :param instance_id: unique id of this instance
+        :param workers: max requests this instance handles concurrently
+        :param claim_window: seconds to collect claims before electing
+        :param lease_seconds: seconds without a heartbeat before an owner is
+            considered failed
+        :param load_fn: optional function returning this instance's load;
+            defaults to the number of requests being handled
+        """
+        self.bus = bus
+        self.instance_id = instance_id or uuid4().hex
+        self.claim_window = claim_window
+        self.lease_seconds = lease_seconds
+        self._load_fn = load_fn
+        self._executor = ThreadPoolExecutor(workers,
+                                            thread_name_prefix="cluster")
+        self._lock = Lock()
+        self._requests: Dict[str, _Request] = dict()
+        self._running = set()
+        self._stopping = Event()
+        self.handled = 0
+        self.failovers = 0
+        self.bus.on(CLAIM, self._on_claim)
+        self.bus.on(WON, self._on_won)
+        self.bus.on(HEARTBEAT, self._on_heartbeat)
+        self.bus.on(DONE, self._on_done)
+        self._monitor = Thread(target=self._monitor_leases, daemon=True,
+                               name="cluster_monitor")
+        self._monitor.start()
+
+    @property
+    def load(self) -> float:
+        if self._load_fn:
+            return self._load_fn()
+        return len(self._running)
+
+    @staticmethod
+    def get_request_id(message: Message) -> str:
+        """
+        Get an id for a request that is identical on every instance. The
+        message hash is always included so distinct requests reusing an
+        `ident` are not treated as the same request.
+        :param message: API request message
+        :returns: request id
+        """
+        digest = sha1(message.serialize().encode()).hexdigest()
+        ident = message.context.get("ident")
+        if ident:
+            return f"{message.msg_type}:{ident}:{digest}"
+        return digest
+
+    def wrap(self, handler: Callable[[Message], None]) -> \
+            Callable[[Message], None]:
+        """
+        Wrap a blocking API request handler so requests are only handled by
+        the elected instance
+        :param handler: bus handler that returns once the request is complete
+        :returns: bus handler to register
+        """
+        def wrapper(message: Message):
+            request_id = self.get_request_id(message)
+            with self._lock:
+                request = self._requests.setdefault(request_id,
+                                                    _Request(request_id))
+                # Another instance already won the election
+                claimed = request.owner is None
+                if claimed:
+                    request.message = message
+                    request.handler = handler
+            if claimed:
+                self._claim(request)
+            else:
+                LOG.debug(f"{request.owner} already handling {request_id}")
+        return wrapper
+
+    def _claim(self, request: _Request):
+        epoch = request.epoch
+        load = self.load
+        with self._lock:
+            request.claims.setdefault(epoch, dict())[self.instance_id] = load
+        self.bus.emit(Message(CLAIM, {"request_id": request.request_id,
+                                      "instance": self.instance_id,
+                                      "load": load,
+                                      "epoch": epoch}))
+        timer = Timer(self.claim_window, self._elect,
+                      (request.request_id, epoch))
+        timer.daemon = True
+        timer.start()
+
+    def _on_claim(self, message: Message):
+        request_id = message.data["request_id"]
+        epoch = message.data.get("epoch", 0)
+        rejoin = False
+        with self._lock:
+            # Claims may arrive before this instance receives the request
+            request = self._requests.setdefault(request_id,
+                                                _Request(request_id))
+            request.claims.setdefault(epoch, dict())[
+                message.data["instance"]] = message.data["load"]
+            if epoch > request.epoch and request.message is not None and \
+                    request_id not in self._running:
+                # Another instance detected a failed owner first; join the
+                # new election so every instance sees the same claims
+                if request.owner:
+                    request.excluded.add(request.owner)
+                request.owner = None
+                request.lease_expires = None
+                request.epoch = epoch
+                rejoin = True
+        if rejoin:
+            self._claim(request)
+
+    def _elect(self, request_id: str, epoch: int):
+        with self._lock:
+            request = self._requests.get(request_id)
+            if not request or request.epoch != epoch:
+                return
+            if request.owner is not None:
+                # Another instance announced it won this election
+                LOG.debug(f"Yielding {request_id} to {request.owner}")
+                return
+            claims = {k: v for k, v in request.claims.get(epoch, {}).items()
+                      if k not in request.excluded}
+            if not claims:
+                LOG.error(f"No claims for {request_id}")
+                return
+            owner = min(claims, key=lambda k: (claims[k], k))
+            request.owner = owner
+            request.lease_expires = time() + self.lease_seconds
+            mine = owner == self.instance_id
+            if mine:
+                self._running.add(request_id)
+            else:
+                self._release_payload(request)
+        if mine:
+            LOG.debug(f"Handling {request_id} (epoch={epoch})")
+            self.bus.emit(Message(WON, {"request_id": request_id,
+                                        "instance": self.instance_id,
+                                        "epoch": epoch}))
+            self._executor.submit(self._handle, request)
+        else:
+            LOG.debug(f"{owner} handling {request_id} (epoch={epoch})")
+
+    def _handle(self, request: _Request):
+        stop_heartbeat = Event()
+
+        def _heartbeat():
+            while not stop_heartbeat.wait(self.lease_seconds / 3):
+                self.bus.emit(Message(HEARTBEAT,
+                                      {"request_id": request.request_id,
+                                       "instance": self.instance_id}))
+        Thread(target=_heartbeat, daemon=True).start()
+        try:
+            request.handler(request.message)
+        except Exception as e:
+            LOG.exception(f"Failed to handle {request.request_id}: {e}")
+        finally:
+            stop_heartbeat.set()
+            with self._lock:
+                self._running.discard(request.request_id)
+                self.handled += 1
+            self.bus.emit(Message(DONE, {"request_id": request.request_id,
+                                         "instance": self.instance_id}))
+
+    def _on_won(self, message: Message):
+        request_id = message.data["request_id"]
+        instance = message.data["instance"]
+        epoch = message.data.get("epoch", 0)
+        if instance == self.instance_id:
+            return
+        with self._lock:
+            request = self._requests.setdefault(request_id,
+                                                _Request(request_id))
+            if epoch < request.epoch or instance in request.excluded:
+                return
+            if request.owner == self.instance_id:
+                LOG.warning(f"{instance} also won {request_id} "
+                            f"(epoch={epoch})")
+                return
+            request.epoch = epoch
+            request.owner = instance
+            request.lease_expires = time() + self.lease_seconds
+            self._release_payload(request)
+
+    def _release_payload(self, request: _Request):
+        """
+        Drop the payload of a request owned by another instance unless this
+        instance is the standby (next best claim) for a failover. Must be
+        called with `self._lock` held.
+        :param request: request with an owner
+        """
+        claims = {k: v for k, v in request.claims.get(request.epoch,
+                                                      {}).items()
+                  if k not in request.excluded and k != request.owner}
+        standby = min(claims, key=lambda k: (claims[k], k)) if claims \
+            else None
+        if standby != self.instance_id:
+            request.message = None
+            request.handler = None
+
+    def _on_heartbeat(self, message: Message):
+        with self._lock:
+            request = self._requests.get(message.data["request_id"])
+            if request and request.owner == message.data["instance"]:
+                request.lease_expires = time() + self.lease_seconds
+
+    def _on_done(self, message: Message):
+        with self._lock:
+            self._requests.pop(message.data["request_id"], None)
+
+    def _monitor_leases(self):
+        while not self._stopping.wait(min(self.lease_seconds / 3, 1)):
+            self.check_leases()
+
+    def check_leases(self):
+        """
+        Start a new election for any request whose owner's lease expired
+        and drop requests that were never received by this instance
+        """
+        now = time()
+        expired = list()
+        with self._lock:
+            for request_id, request in list(self._requests.items()):
+                if request.message is None:
+                    if now - request.created > self.lease_seconds:
+                        self._requests.pop(request_id)
+                    continue
+                if request.lease_expires and now > request.lease_expires and \
+                        request.owner != self.instance_id:
+                    LOG.warning(f"Lease expired for {request_id} on "
+                                f"{request.owner}")
+                    request.excluded.add(request.owner)
+                    request.owner = None
+                    request.lease_expires = None
+                    request.epoch += 1
+                    self.failovers += 1
+                    expired.append(request)
+        for request in expired:
+            self._claim(request)
+
+    def get_stats(self) -> dict:
+        """
+        Get this instance's cluster state
+        """
+        with self._lock:
+            return {"instance": self.instance_id,
+                    "load": self.load,
+                    "running": len(self._running),
+                    "tracked": len(self._requests),
+                    "handled": self.handled,
+                    "failovers": self.failovers}
+
+    def shutdown(self):
+        """
+        Stop monitoring leases and wait for running requests to complete
+        """
+        self._stopping.set()
+        self.bus.remove(CLAIM, self._on_claim)
+        self.bus.remove(WON, self._on_won)
+        self.bus.remove(HEARTBEAT, self._on_heartbeat)
+        self.bus.remove(DONE, self._on_done)
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,107 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from concurrent.futures import Future
+from hashlib import sha256
+from threading import Lock
+from time import time
+from typing import Any, Callable, Dict
+
+
+def hash_file(file_path: str, block_size: int = 65536) -> str:
+    """
+    Get a sha256 hash of a file's contents
+    :param file_path: path to file to hash
+    :param block_size: number of bytes to read at a time
+    :returns: hex digest of file contents
+    """
+    digest = sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class InFlightCoalescer:
+    """
+    Share the result of a running computation with identical requests that
+    arrive while it is in progress.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._in_flight: Dict[str, Future] = dict()
+        self.requests = 0
+        self.coalesced = 0
+        self.saved_seconds = 0.0
+
+    def run(self, key: str, fn: Callable[[], Any]) -> (Any, bool):
+        """
+        Run `fn`, or wait for the result of an in-flight call with `key`
+        :param key: identifier of the computation (i.e. a content hash)
+        :param fn: callable that performs the computation
+        :returns: (result of `fn`, True if the result was shared)
+        """
+        with self._lock:
+            self.requests += 1
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.coalesced += 1
+        if not leader:
+            result = future.result()
+            with self._lock:
+                self.saved_seconds += future.duration
+            return result, True
+        start = time()
+        try:
+            result = fn()
+        except BaseException as e:
+            self._complete(key, future, start)
+            future.set_exception(e)
+            raise
+        self._complete(key, future, start)
+        future.set_result(result)
+        return result, False
+
+    def _complete(self, key: str, future: Future, start: float):
+        future.duration = time() - start
+        with self._lock:
+            self._in_flight.pop(key, None)
+
+    def get_stats(self) -> dict:
+        """
+        Get counts of requests and work saved by coalescing
+        """
+        with self._lock:
+            return {"requests": self.requests,
+                    "coalesced": self.coalesced,
+                    "saved_seconds": self.saved_seconds}
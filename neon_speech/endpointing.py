@@ -0,0 +1,222 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from time import sleep
+from typing import Callable, Iterable, List, Optional
+
+from ovos_plugin_manager.templates.stt import STT
+from ovos_plugin_manager.templates.vad import VADEngine
+from ovos_utils.log import LOG
+
+from neon_speech.audio_utils import iter_audio_windows
+
+FINAL_PUNCTUATION = (".", "?", "!")
+# Words that rarely end a complete English request
+INCOMPLETE_ENDINGS = ("a", "an", "the", "and", "or", "but", "to", "of", "for",
+                      "with", "in", "on", "at", "from", "by", "about", "my",
+                      "your", "is", "are", "if", "because", "so", "than",
+                      "what", "what's", "how", "who", "where", "when", "why",
+                      "which", "please", "set", "turn", "play", "tell")
+
+
+class EndpointPolicy:
+    """
+    Decides when a command recording can end before the VAD silence timeout.
+    Recording ends early once a short silence follows speech, the streaming
+    hypothesis has not changed for `stable_seconds`, and the hypothesis looks
+    complete (final punctuation, or an ending that is not an incomplete word).
+    All durations are measured in seconds of audio so decisions are the same
+    offline and live.
+    """
+
+    def __init__(self, stable_seconds: float = 0.3,
+                 min_silence_seconds: float = 0.15, min_words: int = 1,
+                 require_punctuation: bool = False,
+                 incomplete_endings: Iterable[str] = INCOMPLETE_ENDINGS):
+        """
+        :param stable_seconds: seconds the hypothesis must remain unchanged
+        :param min_silence_seconds: seconds of trailing silence required
+        :param min_words: minimum words in the hypothesis
+        :param require_punctuation: if True, only end on final punctuation
+        :param incomplete_endings: words that indicate an incomplete request
+        """
+        self.stable_seconds = stable_seconds
+        self.min_silence_seconds = min_silence_seconds
+        self.min_words = min_words
+        self.require_punctuation = require_punctuation
+        self.incomplete_endings = set(incomplete_endings)
+        self.reset()
+
+    def reset(self):
+        """
+        Clear state at the start of a new recording
+        """
+        self._elapsed = 0.0
+        self._silence = 0.0
+        self._text = None
+        self._changed_at = 0.0
+
+    def is_complete(self, text: str) -> bool:
+        """
+        Check if a hypothesis looks like a complete request
+        :param text: transcript hypothesis
+        :returns: True if recording may end after `text`
+        """
+        text = text.strip()
+        words = text.split()
+        if len(words) < self.min_words:
+            return False
+        if text.endswith(FINAL_PUNCTUATION):
+            return True
+        if self.require_punctuation:
+            return False
+        return words[-1].lower().strip(",;:") not in self.incomplete_endings
+
+    def update(self, text: Optional[str], is_speech: bool,
+               chunk_seconds: float) -> bool:
+        """
+        Update state with a chunk of recorded audio
+        :param text: current streaming hypothesis
+        :param is_speech: True if the VAD detected speech in the chunk
+        :param chunk_seconds: duration of the chunk
+        :returns: True if recording should end now
+        """
+        self._elapsed += chunk_seconds
+        self._silence = 0.0 if is_speech else self._silence + chunk_seconds
+        normalized = " ".join((text or "").lower().split())
+        if normalized != self._text:
+            self._text = normalized
+            self._changed_at = self._elapsed
+        if not normalized or self._silence < self.min_silence_seconds:
+            return False
+        if self._elapsed - self._changed_at < self.stable_seconds:
+            return False
+        return self.is_complete(text)
+
+
+def _normalize(text: str) -> List[str]:
+    return [w.strip(".,?!;:") for w in text.lower().split()]
+
+
+def _get_transcript(engine: STT) -> str:
+    """
+    Get the top transcript from a streaming engine, or an empty string if
+    there are no results
+    """
+    transcriptions = engine.transcribe(None, None)
+    if isinstance(transcriptions, str):
+        return transcriptions
+    if not transcriptions:
+        return ""
+    return transcriptions[0][0] or ""
+
+
+def evaluate_endpointing(audio_files: List[str], engine: STT, vad: VADEngine,
+                         policy: EndpointPolicy, lang: str,
+                         silence_seconds: float = 0.7,
+                         sample_rate: int = 16000, sample_width: int = 2,
+                         chunk_seconds: float = 0.03, realtime: bool = False,
+                         on_result: Optional[Callable[[dict], None]] = None) \
+        -> dict:
+    """
+    Compare early endpointing against VAD silence endpointing over recorded
+    utterances. Each file is streamed to `engine` in chunks to find where
+    each method ends recording, then the audio up to the early endpoint is
+    transcribed separately to detect truncation.
+    :param audio_files: recorded utterance audio files
+    :param engine: streaming STT engine
+    :param vad: VAD engine used to classify chunks
+    :param policy: early endpointing policy to evaluate
+    :param lang: language of the recordings
+    :param silence_seconds: VAD silence that ends a recording
+    :param sample_rate: sample rate audio is streamed at
+    :param sample_width: sample width audio is streamed at
+    :param chunk_seconds: duration of each streamed chunk
+    :param realtime: if True, stream chunks in real time so that partial
+        hypotheses lag audio as they would in a live recording
+    :param on_result: optional callback with the result for each file
+    :returns: dict summary of latency gained and truncation errors
+    """
+    if not hasattr(engine, 'stream_start'):
+        raise ValueError(f"{engine} does not support streaming")
+    chunk_bytes = int(sample_rate * chunk_seconds) * sample_width
+    results = list()
+    for audio_file in audio_files:
+        audio = b"".join(bytes(w) for w in iter_audio_windows(
+            audio_file, sample_rate, sample_width))
+        chunks = [audio[i:i + chunk_bytes]
+                  for i in range(0, len(audio), chunk_bytes)]
+        policy.reset()
+        engine.stream_start(lang)
+        early_chunk = None
+        baseline_chunk = len(chunks)
+        heard_speech = False
+        silence = 0.0
+        for idx, chunk in enumerate(chunks):
+            engine.stream_data(chunk)
+            if realtime:
+                sleep(chunk_seconds)
+            is_speech = not vad.is_silence(chunk)
+            heard_speech = heard_speech or is_speech
+            silence = 0.0 if is_speech else silence + chunk_seconds
+            text = getattr(getattr(engine, 'stream', None), 'text', None)
+            if early_chunk is None and heard_speech and \
+                    policy.update(text, is_speech, chunk_seconds):
+                early_chunk = idx + 1
+            if heard_speech and silence >= silence_seconds:
+                baseline_chunk = idx + 1
+                break
+        baseline = _get_transcript(engine)
+        result = {"file": audio_file, "baseline_text": baseline,
+                  "early_text": None, "latency_gained": 0.0,
+                  "truncated": False}
+        if early_chunk is not None and early_chunk < baseline_chunk:
+            engine.stream_start(lang)
+            for chunk in chunks[:early_chunk]:
+                engine.stream_data(chunk)
+            early = _get_transcript(engine)
+            result["early_text"] = early
+            result["latency_gained"] = \
+                (baseline_chunk - early_chunk) * chunk_seconds
+            result["truncated"] = _normalize(early) != _normalize(baseline)
+        LOG.debug(f"Endpointing result: {result}")
+        if on_result:
+            on_result(result)
+        results.append(result)
+    early = [r for r in results if r["early_text"] is not None]
+    truncated = [r for r in early if r["truncated"]]
+    correct = [r for r in early if not r["truncated"]]
+    return {"files": len(results),
+            "early_endpoints": len(early),
+            "truncations": len(truncated),
+            "truncation_rate": len(truncated) / len(early) if early else 0.0,
+            "mean_latency_gained": sum(r["latency_gained"] for r in results) /
+            len(results) if results else 0.0,
+            "mean_latency_gained_correct":
+                sum(r["latency_gained"] for r in correct) / len(correct)
+                if correct else 0.0}
@@ -0,0 +1,282 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import os
+import wave
+
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from tempfile import mkstemp
+from threading import BoundedSemaphore, Thread
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from ovos_utils.log import LOG
+
+from neon_speech.audio_utils import AudioLimitError
+
+# Route handlers accept a path to uploaded audio and request parameters and
+# return (HTTP status, response data)
+RouteHandler = Callable[[str, dict], Tuple[int, dict]]
+
+RAW_FORMATS = ("raw", "pcm")
+AUDIO_FORMATS = ("wav", "mp3", "ogg", "flac", "webm")
+_READ_BYTES = 65536
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        Exception.__init__(self, message)
+        self.status = status
+
+
+class STTRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handles audio uploads. Audio is sent as the request body with either a
+    `Content-Length` or `Transfer-Encoding: chunked`; `lang`, `format` and,
+    for raw PCM, `sample_rate`, `sample_width` and `channels` are passed as
+    query parameters. `format` is one of `AUDIO_FORMATS` or `RAW_FORMATS`.
+    """
+    protocol_version = "HTTP/1.1"
+    server_version = "NeonSpeech"
+    server: 'STTHTTPServer'
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        audio_file = None
+        try:
+            route = self.server.routes.get(url.path)
+            if not route:
+                raise HTTPError(404, f"{url.path} not found")
+            audio_file = self._read_audio(params)
+            status, data = route(audio_file, params)
+        except HTTPError as e:
+            status, data = e.status, {"error": str(e)}
+            # Any unread body would be parsed as the next request
+            self.close_connection = True
+        except AudioLimitError as e:
+            status, data = 413, {"error": repr(e)}
+            self.close_connection = True
+        except Exception as e:
+            LOG.exception(e)
+            status, data = 500, {"error": repr(e)}
+        finally:
+            if audio_file and os.path.isfile(audio_file):
+                os.remove(audio_file)
+        self._send_json(status, data)
+
+    def _send_json(self, status: int, data: dict):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if data.get("retry_after"):
+            self.send_header("Retry-After", str(int(data["retry_after"]) + 1))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _iter_body(self):
+        """
+        Yield the request body in chunks, decoding chunked transfer encoding
+        """
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while True:
+                line = self.rfile.readline(1024)
+                try:
+                    size = int(line.split(b";")[0].strip(), 16)
+                except ValueError:
+                    raise HTTPError(400, "Invalid chunk size")
+                if size == 0:
+                    # Discard trailers
+                    while self.rfile.readline(1024) not in (b"\r\n", b"\n",
+                                                            b""):
+                        pass
+                    return
+                while size > 0:
+                    data = self.rfile.read(min(size, _READ_BYTES))
+                    if not data:
+                        raise HTTPError(400, "Incomplete chunk")
+                    size -= len(data)
+                    yield data
+                self.rfile.readline(1024)
+            return
+        try:
+            remaining = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if remaining > self.server.max_payload_bytes > 0:
+            raise AudioLimitError(f"Payload of {remaining} bytes exceeds "
+                                  f"limit of {self.server.max_payload_bytes}")
+        while remaining > 0:
+            data = self.rfile.read(min(remaining, _READ_BYTES))
+            if not data:
+                raise HTTPError(400, "Incomplete request body")
+            remaining -= len(data)
+            yield data
+
+    def _read_audio(self, params: dict) -> str:
+        """
+        Stream the request body to a temporary file, wrapping raw PCM in a
+        WAV header
+        :param params: request parameters
+        :returns: path to the written audio file
+        """
+        audio_format = params.get("format", "wav").lower().lstrip(".")
+        if audio_format not in AUDIO_FORMATS + RAW_FORMATS:
+            raise HTTPError(400, f"Unsupported audio format: {audio_format}")
+        raw = audio_format in RAW_FORMATS
+        if raw:
+            try:
+                wav_params = (int(params.get("channels", 1)),
+                              int(params.get("sample_width", 2)),
+                              int(params.get("sample_rate",
+                                             self.server.sample_rate)))
+            except ValueError as e:
+                raise HTTPError(400, f"Invalid audio parameters: {e}")
+        fd, audio_file = mkstemp(suffix=".wav" if raw else f".{audio_format}")
+        max_bytes = self.server.max_payload_bytes
+        written = 0
+        try:
+            if raw:
+                os.close(fd)
+                sink = wave.open(audio_file, "wb")
+                sink.setnchannels(wav_params[0])
+                sink.setsampwidth(wav_params[1])
+                sink.setframerate(wav_params[2])
+                write = sink.writeframesraw
+            else:
+                sink = open(fd, "wb")
+                write = sink.write
+            try:
+                for data in self._iter_body():
+                    written += len(data)
+                    if max_bytes and written > max_bytes:
+                        raise AudioLimitError(
+                            f"Payload exceeds limit of {max_bytes} bytes")
+                    write(data)
+            finally:
+                sink.close()
+        except BaseException:
+            os.remove(audio_file)
+            raise
+        if not written:
+            os.remove(audio_file)
+            raise HTTPError(400, "No audio in request body")
+        return audio_file
+
+    def log_message(self, format, *args):
+        LOG.debug(f"{self.address_string()} - {format % args}")
+
+
+class STTHTTPServer(HTTPServer):
+    """
+    HTTP server handling connections with a bounded pool of worker threads.
+    Connections beyond the pool and pending queue are rejected with a 503.
+    The listening socket is bound in `start`.
+    """
+    allow_reuse_address = True
+
+    def __init__(self, address: Tuple[str, int],
+                 routes: Dict[str, RouteHandler], workers: int = 4,
+                 max_pending: int = 16, keep_alive_timeout: float = 5,
+                 max_payload_bytes: Optional[int] = None,
+                 sample_rate: int = 16000):
+        """
+        :param address: (host, port) to listen on; port 0 picks a free port
+        :param routes: dict of URL path to request handler
+        :param workers: max connections handled concurrently
+        :param max_pending: max connections waiting for a worker
+        :param keep_alive_timeout: seconds an idle connection is kept open
+        :param max_payload_bytes: max request body size (None for no limit)
+        :param sample_rate: default sample rate of raw PCM uploads
+        """
+        self.routes = routes
+        self.max_payload_bytes = max_payload_bytes
+        self.sample_rate = sample_rate
+        self.keep_alive_timeout = keep_alive_timeout
+        self._slots = BoundedSemaphore(workers + max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=workers,
+                                            thread_name_prefix="stt_http")
+        HTTPServer.__init__(self, address, STTRequestHandler,
+                            bind_and_activate=False)
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def process_request(self, request, client_address):
+        if not self._slots.acquire(blocking=False):
+            LOG.warning(f"Rejecting HTTP connection from {client_address}")
+            try:
+                request.sendall(b"HTTP/1.1 503 Service Unavailable\r\n"
+                                b"Content-Length: 0\r\n"
+                                b"Connection: close\r\n\r\n")
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        self._executor.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address):
+        try:
+            request.settimeout(self.keep_alive_timeout)
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def start(self):
+        """
+        Bind the configured address and serve requests in a background thread
+        :raises OSError: if the address cannot be bound
+        """
+        try:
+            self.server_bind()
+            self.server_activate()
+        except OSError:
+            self.server_close()
+            raise
+        self._thread = Thread(target=self.serve_forever, daemon=True,
+                              name="stt_http_server")
+        self._thread.start()
+        LOG.info(f"STT HTTP server listening on {self.server_address}")
+
+    def stop(self):
+        if self._thread:
+            # `shutdown` blocks until `serve_forever` exits
+            self.shutdown()
+            self._thread.join(5)
+        self.server_close()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,183 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import gc
+import sys
+
+from contextlib import contextmanager
+from threading import Event, Lock, Thread
+from time import time
+from typing import Callable, Generic, Iterator, Optional, TypeVar
+
+from ovos_utils.log import LOG
+
+T = TypeVar("T")
+
+
+def release_memory():
+    """
+    Collect garbage and ask the allocator(s) to return free memory to the OS
+    """
+    gc.collect()
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        try:
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except Exception as e:
+            LOG.debug(f"Failed to empty torch cache: {e}")
+    try:
+        import ctypes
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        # Not glibc
+        pass
+
+
+class IdleUnloader(Generic[T]):
+    """
+    Holds an object that is expensive to keep loaded (i.e. an STT model),
+    releasing it after a period without use and loading it again on demand.
+    The object is never released while it is in use via `use()`.
+    """
+
+    def __init__(self, loader: Callable[[], T], idle_seconds: float,
+                 on_load: Optional[Callable[[float], None]] = None,
+                 check_interval: Optional[float] = None):
+        """
+        :param loader: function that loads and returns the object
+        :param idle_seconds: seconds without use before the object is released
+        :param on_load: optional callback with the load time in seconds
+        :param check_interval: seconds between idle checks
+        """
+        self._loader = loader
+        self.idle_seconds = idle_seconds
+        self._on_load = on_load
+        self._lock = Lock()
+        self._value = None
+        self._last_used = time()
+        self._keep_until = 0.0
+        self._in_use = 0
+        self.loads = 0
+        self.unloads = 0
+        self.last_load_seconds = None
+        self._stopping = Event()
+        self._thread = Thread(target=self._monitor, daemon=True,
+                              args=(check_interval or
+                                    max(min(idle_seconds / 4, 60), 0.01),),
+                              name="idle_unloader")
+        self._thread.start()
+
+    @property
+    def loaded(self) -> bool:
+        return self._value is not None
+
+    def set(self, value: Optional[T]):
+        """
+        Replace the held object, i.e. with one loaded at startup
+        """
+        with self._lock:
+            self._value = value
+            self._last_used = time()
+
+    def get(self) -> T:
+        """
+        Get the held object, loading it if it was released
+        """
+        with self._lock:
+            self._last_used = time()
+            if self._value is None:
+                start = time()
+                self._value = self._loader()
+                self.loads += 1
+                self.last_load_seconds = time() - start
+                LOG.info(f"Loaded in {self.last_load_seconds}s")
+                if self._on_load:
+                    self._on_load(self.last_load_seconds)
+            return self._value
+
+    @contextmanager
+    def use(self) -> Iterator[T]:
+        """
+        Get the held object, preventing it from being released until the
+        context exits
+        """
+        with self._lock:
+            self._in_use += 1
+        try:
+            yield self.get()
+        finally:
+            with self._lock:
+                self._in_use -= 1
+                self._last_used = time()
+
+    def preload(self, keep_seconds: Optional[float] = None) -> T:
+        """
+        Load the held object ahead of use
+        :param keep_seconds: minimum seconds to keep the object loaded
+        """
+        if keep_seconds:
+            self._keep_until = max(self._keep_until, time() + keep_seconds)
+        return self.get()
+
+    def release_if_idle(self) -> bool:
+        """
+        Release the held object if it is not in use and has not been used for
+        `idle_seconds`
+        :returns: True if the object was released
+        """
+        with self._lock:
+            now = time()
+            if self._value is None or self._in_use or \
+                    now < self._keep_until or \
+                    now - self._last_used < self.idle_seconds:
+                return False
+            value, self._value = self._value, None
+            self.unloads += 1
+        if hasattr(value, "shutdown"):
+            try:
+                value.shutdown()
+            except Exception as e:
+                LOG.error(f"Error shutting down {value}: {e}")
+        del value
+        release_memory()
+        LOG.info(f"Released after {self.idle_seconds}s idle")
+        return True
+
+    def _monitor(self, interval: float):
+        while not self._stopping.wait(interval):
+            self.release_if_idle()
+
+    def get_stats(self) -> dict:
+        return {"loaded": self.loaded, "loads": self.loads,
+                "unloads": self.unloads, "in_use": self._in_use,
+                "last_load_seconds": self.last_load_seconds,
+                "idle_seconds": time() - self._last_used}
+
+    def shutdown(self):
+        self._stopping.set()
@@ -0,0 +1,246 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import os
+
+from os.path import expanduser, isdir, isfile, join
+from time import time
+from typing import List, Optional
+
+from ovos_plugin_manager.utils import PluginTypes
+from ovos_utils.log import LOG
+from ovos_utils.xdg_utils import xdg_cache_home
+
+from neon_speech.coalescing import hash_file
+from neon_speech.plugin_index import get_plugin_index
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+# Model download locations of common ML libraries, redirected into the cache
+MODEL_ENV_VARS = {"HF_HOME": "huggingface",
+                  "TORCH_HOME": "torch",
+                  "NEMO_CACHE_DIR": "nemo"}
+
+
+def get_plugin_version(plugin: str) -> Optional[str]:
+    """
+    Get the installed version of an STT plugin without importing it
+    :param plugin: STT plugin entrypoint name
+    :returns: version of the distribution providing `plugin`, if installed
+    """
+    entry_point = get_plugin_index().get_entry_points(
+        PluginTypes.STT).get(plugin)
+    dist = getattr(entry_point, "dist", None)
+    return dist.version if dist else None
+
+
+def get_cache_dir(plugin: str, config: Optional[dict] = None) -> str:
+    """
+    Get the versioned cache directory for an STT plugin
+    :param plugin: STT plugin entrypoint name
+    :param config: `stt.model_cache` configuration
+    :returns: path to the cache directory for the installed plugin version
+    """
+    config = config or dict()
+    root = expanduser(config.get("path") or
+                      join(xdg_cache_home(), "neon", "stt_models"))
+    version = get_plugin_version(plugin) or "unknown"
+    return join(root, plugin, version)
+
+
+def activate_cache_dir(cache_dir: str) -> List[str]:
+    """
+    Point model download locations of common ML libraries at `cache_dir`.
+    This must be called before the plugin is imported. Note that this
+    changes the environment of the whole process; locations already set in
+    the environment are left unchanged.
+    :param cache_dir: plugin cache directory
+    :returns: names of environment variables that were set
+    """
+    activated = list()
+    for env_var, subdir in MODEL_ENV_VARS.items():
+        if os.environ.get(env_var):
+            LOG.info(f"Using configured {env_var}={os.environ[env_var]}")
+            continue
+        os.environ[env_var] = join(cache_dir, "downloads", subdir)
+        activated.append(env_var)
+    return activated
+
+
+def deactivate_cache_dir(activated: List[str]):
+    """
+    Restore model download locations changed by `activate_cache_dir`
+    :param activated: environment variables returned by `activate_cache_dir`
+    """
+    for env_var in activated:
+        os.environ.pop(env_var, None)
+
+
+def _file_index(cache_dir: str, checksums: bool) -> dict:
+    files = dict()
+    for root, _, filenames in os.walk(cache_dir):
+        for filename in filenames:
+            path = join(root, filename)
+            rel_path = os.path.relpath(path, cache_dir)
+            if rel_path == MANIFEST_FILE:
+                continue
+            files[rel_path] = {"size": os.path.getsize(path)}
+            if checksums:
+                files[rel_path]["sha256"] = hash_file(path)
+    return files
+
+
+def write_manifest(cache_dir: str, plugin: str, state_exported: bool):
+    """
+    Write a manifest of all files in `cache_dir` with sizes and checksums
+    :param cache_dir: plugin cache directory
+    :param plugin: STT plugin entrypoint name
+    :param state_exported: True if the plugin exported runtime state
+    """
+    manifest = {"manifest_version": MANIFEST_VERSION,
+                "plugin": plugin,
+                "plugin_version": get_plugin_version(plugin),
+                "created": time(),
+                "state_exported": state_exported,
+                "files": _file_index(cache_dir, True)}
+    with open(join(cache_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+
+def verify_cache(cache_dir: str, checksums: bool = False) -> Optional[dict]:
+    """
+    Check that a cache directory matches its manifest
+    :param cache_dir: plugin cache directory
+    :param checksums: if True, verify sha256 of every file (slow for large
+        models); else verify file sizes only
+    :returns: manifest if the cache is valid, else None
+    """
+    manifest_path = join(cache_dir, MANIFEST_FILE)
+    if not isfile(manifest_path):
+        return None
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        LOG.error(f"Invalid cache manifest {manifest_path}: {e}")
+        return None
+    if manifest.get("manifest_version") != MANIFEST_VERSION:
+        LOG.warning(f"Unsupported cache manifest version in {cache_dir}")
+        return None
+    expected = manifest.get("files", {})
+    for rel_path, spec in expected.items():
+        path = join(cache_dir, rel_path)
+        if not isfile(path) or os.path.getsize(path) != spec["size"]:
+            LOG.error(f"Cache file missing or modified: {path}")
+            return None
+        if checksums and hash_file(path) != spec["sha256"]:
+            LOG.error(f"Cache file checksum mismatch: {path}")
+            return None
+    return manifest
+
+
+def build_model_cache(plugin: str, config: Optional[dict] = None) -> \
+        Optional[str]:
+    """
+    Download models for an STT plugin into a versioned cache directory and
+    export any serialized runtime state the plugin supports via an optional
+    `export_cache(path)` method. A manifest is written for integrity checks.
+    :param plugin: STT plugin entrypoint name
+    :param config: `stt.model_cache` configuration
+    :returns: path to the populated cache directory, None if not installed
+    """
+    from ovos_plugin_manager.stt import load_stt_plugin
+    cache_dir = get_cache_dir(plugin, config)
+    os.makedirs(cache_dir, exist_ok=True)
+    activated = activate_cache_dir(cache_dir)
+    try:
+        clazz = load_stt_plugin(plugin)
+        if not clazz:
+            LOG.warning(f"Could not find plugin: {plugin}")
+            return None
+        LOG.info(f"Initializing plugin: {plugin}")
+        try:
+            engine = clazz()
+        except TypeError:
+            engine = clazz(results_event=None)
+    finally:
+        deactivate_cache_dir(activated)
+    state_exported = False
+    if hasattr(engine, "export_cache"):
+        state_dir = join(cache_dir, "state")
+        os.makedirs(state_dir, exist_ok=True)
+        LOG.info(f"Exporting runtime state to {state_dir}")
+        engine.export_cache(state_dir)
+        state_exported = True
+    write_manifest(cache_dir, plugin, state_exported)
+    LOG.info(f"Wrote model cache: {cache_dir}")
+    return cache_dir
+
+
+def load_model_cache(plugin: str, config: Optional[dict] = None) -> \
+        Optional[str]:
+    """
+    Validate and activate a model cache created by `build_model_cache`.
+    Model download locations stay redirected for the life of the process so
+    that plugins loaded or reloaded later also use the cache.
+    :param plugin: STT plugin entrypoint name
+    :param config: `stt.model_cache` configuration
+    :returns: path to the valid cache directory, else None
+    """
+    config = config or dict()
+    cache_dir = get_cache_dir(plugin, config)
+    if not isdir(cache_dir):
+        LOG.debug(f"No model cache for {plugin} at {cache_dir}")
+        return None
+    manifest = verify_cache(cache_dir, config.get("verify") == "sha256")
+    if not manifest:
+        LOG.warning(f"Ignoring invalid model cache: {cache_dir}")
+        return None
+    activate_cache_dir(cache_dir)
+    LOG.info(f"Using model cache: {cache_dir}")
+    return cache_dir
+
+
+def restore_engine_state(engine, cache_dir: str) -> bool:
+    """
+    Restore runtime state exported by `build_model_cache` into an engine
+    that supports an optional `load_cache(path)` method
+    :param engine: initialized STT plugin
+    :param cache_dir: valid plugin cache directory
+    :returns: True if state was restored
+    """
+    state_dir = join(cache_dir, "state")
+    if not (isdir(state_dir) and hasattr(engine, "load_cache")):
+        return False
+    try:
+        engine.load_cache(state_dir)
+        return True
+    except Exception as e:
+        LOG.error(f"Failed to restore cached state from {state_dir}: {e}")
+        return False
@@ -0,0 +1,98 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from threading import Lock
+from time import time
+from typing import Callable, Optional
+
+
+class PartialTranscriptPublisher:
+    """
+    Rate-limits and de-duplicates interim transcripts from a streaming STT
+    engine before they are published. A transcript that arrives before
+    `min_interval` has passed is held and published by a later `update` or
+    by `reset`.
+    """
+
+    def __init__(self, emit: Callable[[str], None], min_interval: float = 0.25,
+                 min_chars: int = 1):
+        """
+        :param emit: callback to publish a partial transcript
+        :param min_interval: minimum seconds between published transcripts
+        :param min_chars: minimum transcript length to publish
+        """
+        self._emit = emit
+        self.min_interval = min_interval
+        self.min_chars = min_chars
+        self._lock = Lock()
+        self._last_text = None
+        self._last_time = 0.0
+        # (text, normalized text) held back by the rate limit
+        self._pending = None
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return " ".join(text.lower().split())
+
+    def update(self, text: Optional[str], now: Optional[float] = None) -> bool:
+        """
+        Publish `text` if it changed since the last publish and the rate limit
+        allows it, else hold it until the rate limit allows it. If `text` is
+        empty, a held transcript is published if the rate limit allows it.
+        :param text: current interim transcript
+        :param now: current time (defaults to `time()`)
+        :returns: True if a transcript was published
+        """
+        now = now or time()
+        with self._lock:
+            candidate = self._pending
+            if text and len(self._normalize(text)) >= self.min_chars:
+                candidate = (text.strip(), self._normalize(text))
+            if not candidate or candidate[1] == self._last_text:
+                self._pending = None
+                return False
+            if now - self._last_time < self.min_interval:
+                self._pending = candidate
+                return False
+            self._pending = None
+            self._last_text = candidate[1]
+            self._last_time = now
+        self._emit(candidate[0])
+        return True
+
+    def reset(self):
+        """
+        Publish any held transcript and clear state at the end of an utterance
+        """
+        with self._lock:
+            pending = self._pending
+            self._pending = None
+            self._last_text = None
+            self._last_time = 0.0
+        if pending:
+            self._emit(pending[0])
@@ -0,0 +1,156 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from threading import RLock
+from time import monotonic
+from typing import Dict, Optional
+
+from ovos_plugin_manager.utils import PluginTypes
+from ovos_utils.log import LOG
+
+
+class PluginIndex:
+    """
+    Per-process index of plugin entry points. Each plugin type is scanned
+    once and only requested plugins are loaded; loaded classes are cached.
+    A lookup for a name not in the index rescans its plugin type so plugins
+    installed at runtime are still found.
+    """
+
+    def __init__(self):
+        self._entry_points: Dict[str, dict] = dict()
+        self._classes: Dict[tuple, type] = dict()
+        self._lock = RLock()
+        self._cold_time: Dict[str, float] = dict()
+        self.scans = 0
+        self.lookups = 0
+        self.scan_time = 0.0
+        self.saved_time = 0.0
+
+    def _scan(self, plugin_type: str) -> dict:
+        try:
+            from importlib_metadata import entry_points
+        except ImportError:
+            from importlib.metadata import entry_points
+        start = monotonic()
+        found = {ep.name: ep for ep in entry_points(group=plugin_type)}
+        self._entry_points[plugin_type] = found
+        self.scans += 1
+        self.scan_time += monotonic() - start
+        return found
+
+    def get_entry_points(self, plugin_type: str) -> dict:
+        """
+        Get entry points of a plugin type without loading them
+        :param plugin_type: entry point group to get
+        :returns: dict of plugin name to entry point
+        """
+        with self._lock:
+            if plugin_type not in self._entry_points:
+                self._scan(plugin_type)
+            return self._entry_points[plugin_type]
+
+    def load_plugin(self, name: str,
+                    plugin_type: Optional[str] = None) -> Optional[type]:
+        """
+        Get a plugin class by entry point name. This is a drop-in replacement
+        for `ovos_plugin_manager.utils.load_plugin`.
+        :param name: plugin entry point name
+        :param plugin_type: plugin type to search (None for all types)
+        :returns: loaded plugin class, or None if not found
+        """
+        start = monotonic()
+        plugin_types = [plugin_type] if plugin_type else \
+            [t.value for t in PluginTypes]
+        with self._lock:
+            self.lookups += 1
+            for group in plugin_types:
+                key = (group, name)
+                if key in self._classes:
+                    # Estimate savings against a cold scan and load
+                    self.saved_time += max(self._cold_time.get(group, 0) -
+                                           (monotonic() - start), 0)
+                    return self._classes[key]
+                if group in self._entry_points:
+                    entry_point = self._entry_points[group].get(name)
+                    if not entry_point and plugin_type:
+                        # The plugin may have been installed since the scan
+                        entry_point = self._scan(group).get(name)
+                else:
+                    entry_point = self._scan(group).get(name)
+                if not entry_point:
+                    continue
+                try:
+                    self._classes[key] = entry_point.load()
+                except Exception as e:
+                    LOG.error(f"Failed to load plugin entry point "
+                              f"{entry_point}: {e}")
+                    return None
+                self._cold_time.setdefault(group, monotonic() - start)
+                return self._classes[key]
+        LOG.warning(f"Could not find the plugin "
+                    f"{plugin_type or 'all plugin types'}.{name}")
+        return None
+
+    def invalidate(self):
+        """
+        Clear the index so the next lookup rescans installed plugins
+        """
+        with self._lock:
+            self._entry_points.clear()
+            self._classes.clear()
+            self._cold_time.clear()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {"lookups": self.lookups, "scans": self.scans,
+                    "scan_seconds": round(self.scan_time, 6),
+                    "cached": len(self._classes),
+                    "saved_seconds": round(self.saved_time, 6)}
+
+
+_INDEX = PluginIndex()
+
+
+def get_plugin_index() -> PluginIndex:
+    return _INDEX
+
+
+def install_plugin_index() -> PluginIndex:
+    """
+    Resolve plugins for the OVOS plugin factories through the process plugin
+    index. Factories import `load_plugin` when called, so this applies to
+    STT (including `fallback_module`), VAD, wake word and microphone plugins
+    created after this call.
+    :returns: the process plugin index
+    """
+    import ovos_plugin_manager.utils as opm_utils
+    if opm_utils.load_plugin != _INDEX.load_plugin:
+        opm_utils.load_plugin = _INDEX.load_plugin
+        LOG.debug("Using cached plugin index")
+    return _INDEX
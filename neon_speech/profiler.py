@@ -0,0 +1,205 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import sys
+import tracemalloc
+
+from collections import Counter
+from os.path import join
+from tempfile import mkdtemp
+from threading import Event, Lock, Thread, enumerate as enumerate_threads, \
+    get_ident, get_native_id
+from time import strftime, time
+from typing import Optional
+
+from ovos_utils.log import LOG
+
+
+def _collapse_stack(frame) -> str:
+    """
+    Format a frame and its callers as a semicolon-delimited stack, outermost
+    frame first, as used by flame graph tools
+    """
+    names = list()
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def _get_thread_cpu_time(native_id: Optional[int]) -> Optional[int]:
+    """
+    Get the CPU time a thread of this process has used
+    :param native_id: OS thread id
+    :returns: nanoseconds on CPU, or None if not available
+    """
+    if native_id is None:
+        return None
+    try:
+        with open(f"/proc/self/task/{native_id}/schedstat") as f:
+            return int(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class SamplingProfiler:
+    """
+    On-demand profiler for a running process. CPU usage is measured by
+    periodically sampling the stacks of threads that used CPU time since the
+    previous sample and written as collapsed stacks (`cpu.collapsed`). Where
+    per-thread CPU time is not available (no procfs), all threads are
+    sampled and written as wall-clock stacks (`wall.collapsed`). Memory
+    allocation is measured with periodic `tracemalloc` snapshot diffs. Only
+    one profiling session may run at a time.
+    """
+
+    def __init__(self, output_dir: str, interval: float = 0.01,
+                 malloc_interval: float = 10, max_duration: float = 300):
+        """
+        :param output_dir: directory to write profiling sessions to
+        :param interval: seconds between stack samples
+        :param malloc_interval: seconds between tracemalloc snapshots
+        :param max_duration: maximum seconds a session may run
+        """
+        self.output_dir = output_dir
+        self.interval = interval
+        self.malloc_interval = malloc_interval
+        self.max_duration = max_duration
+        self._lock = Lock()
+        self._stop_event = Event()
+        self._thread = None
+        self._session = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration: Optional[float] = None,
+              trace_malloc: bool = True) -> dict:
+        """
+        Start a profiling session that stops after `duration` seconds
+        :param duration: seconds to profile (limited to `max_duration`)
+        :param trace_malloc: if True, also record tracemalloc diffs
+        :returns: dict session info
+        :raises RuntimeError: if a session is already running
+        """
+        with self._lock:
+            if self.running:
+                raise RuntimeError("Profiler already running")
+            duration = min(duration or self.max_duration, self.max_duration)
+            os.makedirs(self.output_dir, exist_ok=True)
+            # Sessions started in the same second get unique directories
+            path = mkdtemp(prefix=strftime("%Y%m%d-%H%M%S-"),
+                           dir=self.output_dir)
+            self._session = {"path": path, "duration": duration,
+                             "trace_malloc": trace_malloc, "started": time()}
+            self._stop_event.clear()
+            self._thread = Thread(target=self._run, args=(self._session,),
+                                  daemon=True, name="profiler")
+            self._thread.start()
+            LOG.info(f"Started profiling for {duration}s: {path}")
+            return dict(self._session)
+
+    def stop(self, timeout: float = 30) -> Optional[dict]:
+        """
+        Stop the running profiling session and wait for results to be written
+        :param timeout: max seconds to wait for results
+        :returns: dict session summary, or None if no session was run
+        """
+        thread = self._thread
+        if thread is None:
+            return None
+        self._stop_event.set()
+        thread.join(timeout)
+        return dict(self._session) if self._session else None
+
+    def _run(self, session: dict):
+        started_malloc = False
+        if session["trace_malloc"] and not tracemalloc.is_tracing():
+            tracemalloc.start(25)
+            started_malloc = True
+        snapshot = tracemalloc.take_snapshot() \
+            if session["trace_malloc"] else None
+        next_snapshot = time() + self.malloc_interval
+        snapshot_count = 0
+        stacks = Counter()
+        samples = 0
+        end = session["started"] + session["duration"]
+        own_thread = get_ident()
+        cpu_clock = _get_thread_cpu_time(get_native_id()) is not None
+        cpu_times = dict()
+        try:
+            while not self._stop_event.wait(self.interval) and time() < end:
+                native_ids = {t.ident: t.native_id
+                              for t in enumerate_threads()}
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own_thread:
+                        continue
+                    if cpu_clock:
+                        # Skip threads that were idle since the last sample
+                        cpu_time = _get_thread_cpu_time(
+                            native_ids.get(thread_id))
+                        previous = cpu_times.get(thread_id)
+                        cpu_times[thread_id] = cpu_time
+                        if cpu_time is None or previous is None or \
+                                cpu_time <= previous:
+                            continue
+                    stacks[_collapse_stack(frame)] += 1
+                samples += 1
+                if snapshot and time() >= next_snapshot:
+                    snapshot = self._write_malloc_diff(
+                        session["path"], snapshot, snapshot_count)
+                    snapshot_count += 1
+                    next_snapshot = time() + self.malloc_interval
+            if snapshot:
+                self._write_malloc_diff(session["path"], snapshot,
+                                        snapshot_count)
+                snapshot_count += 1
+        finally:
+            if started_malloc:
+                tracemalloc.stop()
+        clock = "cpu" if cpu_clock else "wall"
+        with open(join(session["path"], f"{clock}.collapsed"), 'w') as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        session.update({"samples": samples, "clock": clock,
+                        "malloc_snapshots": snapshot_count,
+                        "elapsed": time() - session["started"]})
+        LOG.info(f"Profiling complete: {session}")
+
+    @staticmethod
+    def _write_malloc_diff(path: str, previous: tracemalloc.Snapshot,
+                           index: int) -> tracemalloc.Snapshot:
+        snapshot = tracemalloc.take_snapshot()
+        stats = snapshot.compare_to(previous, "lineno")
+        with open(join(path, f"malloc-{index:04d}.txt"), 'w') as f:
+            for stat in stats[:50]:
+                f.write(f"{stat}\n")
+        return snapshot
@@ -0,0 +1,228 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import os
+import wave
+
+from os.path import basename, getmtime, getsize, isfile, join
+from threading import Lock
+from time import time
+from typing import Iterator, List, Optional
+from uuid import uuid4
+
+from ovos_utils.log import LOG
+
+from neon_speech.save_queue import BackgroundSaveQueue
+
+SEGMENT_PREFIX = "segment-"
+HANDLE_SCHEME = "recording://"
+
+
+def get_segments(path: str) -> List[str]:
+    """
+    Get paths (without extension) of all segments in a store, oldest first
+    :param path: recording store directory
+    :returns: list of segment paths
+    """
+    names = {f.rsplit('.', 1)[0] for f in os.listdir(path)
+             if f.startswith(SEGMENT_PREFIX)}
+    return [join(path, n) for n in sorted(names)]
+
+
+def iter_records(path: str) -> Iterator[dict]:
+    """
+    Iterate over index entries of all written recordings, oldest first.
+    Each entry includes the `segment` path it belongs to.
+    :param path: recording store directory
+    :returns: iterator of index entries
+    """
+    for segment in get_segments(path):
+        if not isfile(f"{segment}.idx"):
+            continue
+        with open(f"{segment}.idx") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    LOG.warning(f"Skipping invalid index entry in {segment}")
+                    continue
+                record["segment"] = segment
+                yield record
+
+
+def read_record(record: dict) -> bytes:
+    """
+    Read the audio for an index entry returned by `iter_records`
+    :param record: index entry
+    :returns: raw PCM audio
+    """
+    with open(f"{record['segment']}.bin", 'rb') as f:
+        f.seek(record["offset"])
+        return f.read(record["length"])
+
+
+def export_recordings(path: str, output_dir: str) -> int:
+    """
+    Export all recordings in a store as WAV files with JSON metadata
+    :param path: recording store directory
+    :param output_dir: directory to write files to
+    :returns: number of recordings exported
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    count = 0
+    for record in iter_records(path):
+        name = join(output_dir, record["id"])
+        with wave.open(f"{name}.wav", 'wb') as wav:
+            wav.setframerate(record["sample_rate"])
+            wav.setsampwidth(record["sample_width"])
+            wav.setnchannels(record["channels"])
+            wav.writeframes(read_record(record))
+        with open(f"{name}.json", 'w') as f:
+            f.write(record["meta"])
+        count += 1
+    return count
+
+
+class RecordingStore:
+    """
+    Append-only storage for audio recordings. Recordings are appended to
+    rotating segment files by a background thread; each segment has a JSON
+    lines index of (id, offset, length, audio format, metadata). Whole
+    segments are deleted, oldest first, to stay within the retention limits.
+    """
+
+    def __init__(self, path: str, segment_bytes: int = 64 * 1024 * 1024,
+                 max_bytes: int = 1024 * 1024 * 1024,
+                 max_age: Optional[float] = None, max_queue: int = 64):
+        """
+        :param path: directory to write segment files to
+        :param segment_bytes: audio bytes per segment before rotating
+        :param max_bytes: maximum total size of all segments
+        :param max_age: maximum age of a segment in seconds (None for no limit)
+        :param max_queue: maximum recordings waiting to be written; the
+            oldest is dropped when the limit is reached (0 for no limit)
+        """
+        self.path = path
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(path, exist_ok=True)
+        segments = get_segments(path)
+        self._segment = int(basename(segments[-1])[len(SEGMENT_PREFIX):]) \
+            if segments else 0
+        self._segment_size = self.segment_bytes  # rotate on first write
+        self._audio_file = None
+        self._index_file = None
+        self._lock = Lock()
+        self.apply_retention()
+        self._queue = BackgroundSaveQueue(max_queue, basename(path))
+
+    def append(self, audio: bytes, metadata: dict, sample_rate: int,
+               sample_width: int, channels: int = 1) -> str:
+        """
+        Queue a recording to be written. This does not perform any disk I/O.
+        :param audio: raw PCM audio
+        :param metadata: JSON-serializable metadata to store in the index
+        :param sample_rate: audio sample rate
+        :param sample_width: audio sample width in bytes
+        :param channels: number of audio channels
+        :returns: handle that can be used to look up the recording
+        """
+        record = {"id": uuid4().hex, "time": time(),
+                  "sample_rate": sample_rate, "sample_width": sample_width,
+                  "channels": channels,
+                  # Serialize now; callers may modify `metadata` after return
+                  "meta": json.dumps(metadata, default=str)}
+        self._queue.submit(self._write, record, bytes(audio))
+        return f"{HANDLE_SCHEME}{self.path}#{record['id']}"
+
+    def flush(self):
+        """
+        Block until all queued recordings are written
+        """
+        self._queue.join()
+
+    def get_stats(self) -> dict:
+        """
+        Get write queue depth and counters
+        """
+        return self._queue.get_stats()
+
+    def shutdown(self):
+        """
+        Write any queued recordings and stop the writer thread
+        """
+        self._queue.shutdown()
+        self._close_segment()
+
+    def _close_segment(self):
+        for f in (self._audio_file, self._index_file):
+            if f:
+                f.close()
+        self._audio_file = self._index_file = None
+
+    def _write(self, record: dict, audio: bytes):
+        with self._lock:
+            if self._segment_size + len(audio) > self.segment_bytes and \
+                    self._segment_size:
+                self._close_segment()
+                self._segment += 1
+                self._segment_size = 0
+                name = join(self.path, f"{SEGMENT_PREFIX}{self._segment:06d}")
+                self._audio_file = open(f"{name}.bin", 'ab')
+                self._index_file = open(f"{name}.idx", 'a')
+                self.apply_retention()
+            record["offset"] = self._audio_file.tell()
+            record["length"] = len(audio)
+            self._audio_file.write(audio)
+            self._audio_file.flush()
+            # The index entry is only written once audio is on disk
+            self._index_file.write(json.dumps(record) + '\n')
+            self._index_file.flush()
+            self._segment_size += len(audio)
+
+    def apply_retention(self):
+        """
+        Delete the oldest segments until the store is within its limits. The
+        segment currently being written is never deleted.
+        """
+        segments = get_segments(self.path)[:-1]
+        sizes = {s: sum(getsize(f"{s}.{ext}") for ext in ("bin", "idx")
+                        if isfile(f"{s}.{ext}")) for s in segments}
+        total = sum(sizes.values())
+        for segment in segments:
+            expired = self.max_age and isfile(f"{segment}.idx") and \
+                time() - getmtime(f"{segment}.idx") > self.max_age
+            if total <= self.max_bytes and not expired:
+                continue
+            for ext in ("bin", "idx"):
+                if isfile(f"{segment}.{ext}"):
+                    os.remove(f"{segment}.{ext}")
+            total -= sizes[segment]
+            LOG.debug(f"Removed recording segment: {segment}")
@@ -0,0 +1,364 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from queue import Empty
+from threading import BoundedSemaphore, Thread
+from time import time
+from typing import Callable, List, Optional, Tuple
+
+from neon_utils.parse_utils import clean_quotes
+from ovos_plugin_manager.templates.hotwords import HotWordEngine
+from ovos_plugin_manager.templates.vad import VADEngine
+from ovos_utils.log import LOG
+from speech_recognition import AudioData
+
+from neon_speech.stt_pool import STTEnginePool
+
+# Called with (transcriptions, command audio, timing) for each utterance
+UtteranceCallback = Callable[[List[Tuple[str, float]], AudioData, dict],
+                             None]
+
+
+class SatelliteState(str, Enum):
+    WAITING_WAKEWORD = "waiting_wakeword"
+    WAITING_SPEECH = "waiting_speech"
+    IN_COMMAND = "in_command"
+
+
+class SatelliteSession:
+    """
+    Detects and transcribes utterances in a continuous PCM audio stream from
+    a remote device. Audio is passed through an optional hotword engine and
+    a VAD; once a command starts, audio is streamed to an STT engine in real
+    time so the transcript is available as soon as speech ends.
+    """
+
+    def __init__(self, vad: VADEngine, engines: STTEnginePool, lang: str,
+                 on_utterance: UtteranceCallback,
+                 hotword: Optional[HotWordEngine] = None,
+                 sample_rate: int = 16000, sample_width: int = 2,
+                 chunk_seconds: float = 0.03, speech_seconds: float = 0.1,
+                 silence_seconds: float = 0.5, before_seconds: float = 0.5,
+                 max_seconds: float = 10.0, acquire_timeout: float = 0.5,
+                 on_event: Optional[Callable[[dict], None]] = None):
+        """
+        :param vad: VAD plugin instance for this session
+        :param engines: pool of STT engines to transcribe commands with
+        :param lang: language of speech
+        :param on_utterance: callback for each transcribed command
+        :param hotword: optional hotword engine required before a command
+        :param sample_rate: audio sample rate
+        :param sample_width: audio sample width in bytes
+        :param chunk_seconds: duration of audio chunks passed to the VAD
+        :param speech_seconds: speech required to start a command
+        :param silence_seconds: silence after speech that ends a command
+        :param before_seconds: audio before speech included in a command
+        :param max_seconds: max duration of a command
+        :param acquire_timeout: max seconds to wait for an STT engine before
+            dropping a command
+        :param on_event: optional callback for state change events
+        """
+        self.vad = vad
+        self.engines = engines
+        self.lang = lang
+        self.hotword = hotword
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.chunk_seconds = chunk_seconds
+        self.chunk_bytes = int(sample_rate * chunk_seconds) * sample_width
+        # Durations are tracked in chunks
+        self._speech_chunks = max(round(speech_seconds / chunk_seconds), 1)
+        self._silence_chunks = max(round(silence_seconds / chunk_seconds), 1)
+        self._max_chunks = max(round(max_seconds / chunk_seconds), 1)
+        self.acquire_timeout = acquire_timeout
+        self._on_utterance = on_utterance
+        self._on_event = on_event
+        # Commands are finalized in order without blocking audio processing
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="satellite_stt")
+        self._buffer = bytearray()
+        self._before = deque(maxlen=self._speech_chunks +
+                             round(before_seconds / chunk_seconds))
+        self._engine = None
+        self._command: List[bytes] = list()
+        self._speech_count = 0
+        self._silence_count = 0
+        self._heard_speech = False
+        self.state = self._initial_state
+
+    @property
+    def _initial_state(self) -> SatelliteState:
+        return SatelliteState.WAITING_WAKEWORD if self.hotword else \
+            SatelliteState.WAITING_SPEECH
+
+    def feed(self, audio: bytes):
+        """
+        Process received audio
+        :param audio: raw PCM audio in any sized chunks
+        """
+        self._buffer.extend(audio)
+        while len(self._buffer) >= self.chunk_bytes:
+            chunk = bytes(self._buffer[:self.chunk_bytes])
+            del self._buffer[:self.chunk_bytes]
+            self._process_chunk(chunk)
+
+    def _process_chunk(self, chunk: bytes):
+        if self.state == SatelliteState.WAITING_WAKEWORD:
+            self.hotword.update(chunk)
+            if self.hotword.found_wake_word(chunk):
+                LOG.info(f"Satellite wake word detected: "
+                         f"{self.hotword.key_phrase}")
+                self._emit({"type": "wake_word",
+                            "wake_word": self.hotword.key_phrase})
+                # Like a local microphone, record immediately after the
+                # wake word
+                self._start_command()
+            return
+        is_speech = not self.vad.is_silence(chunk)
+        if self.state == SatelliteState.WAITING_SPEECH:
+            self._before.append(chunk)
+            self._speech_count = self._speech_count + 1 if is_speech else 0
+            if self._speech_count >= self._speech_chunks:
+                self._start_command(list(self._before))
+                self._heard_speech = True
+            return
+        self._add_command_audio(chunk)
+        if is_speech:
+            self._heard_speech = True
+            self._silence_count = 0
+        else:
+            self._silence_count += 1
+        if (self._heard_speech and
+                self._silence_count >= self._silence_chunks) or \
+                len(self._command) >= self._max_chunks:
+            self._end_command()
+
+    def _start_command(self, audio: Optional[List[bytes]] = None):
+        try:
+            self._engine = self.engines.acquire(self.acquire_timeout)
+        except Empty:
+            LOG.warning("No STT engine available; dropping satellite command")
+            self._emit({"type": "busy"})
+            self._reset()
+            return
+        self.state = SatelliteState.IN_COMMAND
+        self._emit({"type": "listening"})
+        self._command = list()
+        self._silence_count = 0
+        self._heard_speech = False
+        if hasattr(self._engine, 'stream_start'):
+            self._engine.stream_start(self.lang)
+        for chunk in audio or []:
+            self._add_command_audio(chunk)
+
+    def _add_command_audio(self, chunk: bytes):
+        self._command.append(chunk)
+        if hasattr(self._engine, 'stream_data'):
+            self._engine.stream_data(chunk)
+
+    def _end_command(self):
+        end_time = time()
+        audio = AudioData(b''.join(self._command), self.sample_rate,
+                          self.sample_width)
+        engine = self._engine
+        self._reset()
+        self._executor.submit(self._finalize_command, engine, audio, end_time)
+
+    def _finalize_command(self, engine, audio: AudioData, end_time: float):
+        """
+        Get the transcript of a completed command, send it to the client, and
+        pass it to the utterance callback
+        """
+        try:
+            if hasattr(engine, 'stream_start'):
+                transcriptions = engine.transcribe(None, None)
+            else:
+                transcriptions = engine.transcribe(audio, self.lang)
+        except Exception as e:
+            LOG.error(f"Satellite STT failed: {e}")
+            transcriptions = []
+        finally:
+            self.engines.release(engine)
+        if isinstance(transcriptions, str):
+            LOG.error("Transcriptions is a str, no alternatives provided")
+            transcriptions = [(transcriptions, 1.0)]
+        transcriptions = [(clean_quotes(t[0]), t[1])
+                          for t in transcriptions or []]
+        timing = {"get_stt": time() - end_time}
+        self._emit({"type": "utterance",
+                    "transcripts": [t[0] for t in transcriptions],
+                    "transcripts_with_conf": transcriptions,
+                    "timing": timing})
+        try:
+            self._on_utterance(transcriptions, audio, timing)
+        except Exception as e:
+            LOG.exception(f"Failed to handle satellite utterance: {e}")
+
+    def _reset(self):
+        self._engine = None
+        self._command = list()
+        self._before.clear()
+        self._speech_count = 0
+        self.vad.reset()
+        self.state = self._initial_state
+
+    def _emit(self, event: dict):
+        if self._on_event:
+            try:
+                self._on_event(event)
+            except Exception as e:
+                LOG.error(f"Failed to send satellite event: {e}")
+
+    def close(self):
+        """
+        Abandon any command in progress, wait for completed commands to be
+        handled, and release resources
+        """
+        if self._engine:
+            if hasattr(self._engine, 'stream_stop'):
+                try:
+                    self._engine.stream_stop()
+                except Exception as e:
+                    LOG.error(e)
+            self.engines.release(self._engine)
+        self._reset()
+        self._executor.shutdown(wait=True)
+        if self.hotword and hasattr(self.hotword, 'shutdown'):
+            self.hotword.shutdown()
+
+
+class SatelliteServer:
+    """
+    WebSocket server accepting audio streams from remote satellite devices.
+
+    A client sends a JSON text message with session options (`lang`,
+    `sample_rate`, `sample_width`, `format` of `pcm` or `opus`, `wake_word`
+    and `context`), followed by binary audio messages; each Opus message is
+    one packet. The server replies with JSON events as text messages:
+    `ready`, `wake_word`, `listening`, `busy` if no STT engine is available,
+    `utterance` as soon as a transcript is available, and `handled` once it
+    was sent to skills.
+    """
+
+    def __init__(self, create_session: Callable[[dict, Callable[[dict], None]],
+                                                SatelliteSession],
+                 host: str = "127.0.0.1", port: int = 8011,
+                 max_sessions: int = 4, handshake_timeout: float = 10):
+        """
+        :param create_session: function creating a session from client
+            options and a function to send events to the client
+        :param host: host to listen on
+        :param port: port to listen on; 0 picks a free port
+        :param max_sessions: max concurrent satellite connections
+        :param handshake_timeout: seconds to wait for session options
+        """
+        self._create_session = create_session
+        self.host = host
+        self.port = port
+        self.handshake_timeout = handshake_timeout
+        self._slots = BoundedSemaphore(max_sessions)
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        """
+        Serve connections in a background thread. Requires the optional
+        `websockets` dependency.
+        """
+        try:
+            from websockets.sync.server import serve
+        except ImportError:
+            raise ImportError("Satellite ingest requires `websockets`; "
+                              "install `neon-speech[websocket]`")
+        self._server = serve(self._handle_connection, self.host, self.port)
+        self.port = self._server.socket.getsockname()[1]
+        self._thread = Thread(target=self._server.serve_forever, daemon=True,
+                              name="satellite_server")
+        self._thread.start()
+        LOG.info(f"Satellite server listening on {self.host}:{self.port}")
+
+    def _handle_connection(self, websocket):
+        if not self._slots.acquire(blocking=False):
+            websocket.close(1013, "Too many satellites connected")
+            return
+        session = None
+        try:
+            options = json.loads(websocket.recv(self.handshake_timeout))
+            decode = self._get_decoder(options)
+
+            def _send(event: dict):
+                websocket.send(json.dumps(event))
+
+            session = self._create_session(options, _send)
+            _send({"type": "ready", "state": session.state.value})
+            for message in websocket:
+                if isinstance(message, str):
+                    if json.loads(message).get("type") == "end":
+                        break
+                    continue
+                session.feed(decode(message) if decode else message)
+        except Exception as e:
+            LOG.exception(f"Satellite connection failed: {e}")
+            websocket.close(1011, repr(e)[:120])
+        finally:
+            if session:
+                session.close()
+            self._slots.release()
+
+    @staticmethod
+    def _get_decoder(options: dict) -> Optional[Callable[[bytes], bytes]]:
+        """
+        Get a function to decode received audio messages to PCM
+        :param options: session options from the client
+        :returns: decoder, or None if audio is PCM
+        """
+        audio_format = options.get("format", "pcm")
+        if audio_format == "pcm":
+            return None
+        if audio_format != "opus":
+            raise ValueError(f"Unsupported audio format: {audio_format}")
+        try:
+            import opuslib
+        except ImportError:
+            raise ImportError("Opus audio requires `opuslib`")
+        sample_rate = options.get("sample_rate", 16000)
+        decoder = opuslib.Decoder(sample_rate, 1)
+        # Max Opus packet duration is 120ms
+        frame_size = int(sample_rate * 0.12)
+        return lambda packet: decoder.decode(packet, frame_size)
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+        if self._thread:
+            self._thread.join(5)
@@ -0,0 +1,162 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from collections import deque
+from threading import Condition, Thread
+from typing import Callable, Optional
+from uuid import uuid4
+
+from ovos_utils.log import LOG
+
+HANDLE_SCHEME = "pending://"
+
+
+class PendingSave:
+    """
+    Handle for a queued write. `state` is one of "pending", "saved",
+    "dropped", or "failed"; `path` is set once the write completes.
+    """
+
+    def __init__(self):
+        self.handle = f"{HANDLE_SCHEME}{uuid4().hex}"
+        self.state = "pending"
+        self.path = None
+
+
+class BackgroundSaveQueue:
+    """
+    Bounded queue of writes executed by a single background thread. When the
+    queue is full, the oldest queued write is dropped so that the caller
+    never blocks on disk I/O.
+    """
+
+    def __init__(self, max_size: int = 32, name: str = "save",
+                 on_complete: Optional[Callable[[PendingSave], None]] = None):
+        """
+        :param max_size: maximum queued writes (0 for no limit)
+        :param name: name used in log messages and the worker thread name
+        :param on_complete: optional callback for each completed write
+        """
+        self.max_size = max_size
+        self.name = name
+        self._on_complete = on_complete
+        self._queue = deque()
+        self._cond = Condition()
+        self._active = 0
+        self._stopping = False
+        self.dropped = 0
+        self.completed = 0
+        self.failed = 0
+        self._thread = Thread(target=self._run, daemon=True,
+                              name=f"{name}_queue")
+        self._thread.start()
+
+    @property
+    def depth(self) -> int:
+        """
+        Number of writes queued or in progress
+        """
+        with self._cond:
+            return len(self._queue) + self._active
+
+    def submit(self, fn: Callable, *args, **kwargs) -> PendingSave:
+        """
+        Queue `fn(*args, **kwargs)` to run in the background. The return
+        value of `fn` is used as the saved path.
+        :returns: handle for the queued write
+        """
+        pending = PendingSave()
+        with self._cond:
+            if self.max_size and len(self._queue) >= self.max_size:
+                dropped, *_ = self._queue.popleft()
+                dropped.state = "dropped"
+                self.dropped += 1
+                LOG.warning(f"{self.name} queue full, dropped "
+                            f"{dropped.handle} (total={self.dropped})")
+            self._queue.append((pending, fn, args, kwargs))
+            self._cond.notify_all()
+        return pending
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for all queued writes to complete
+        :param timeout: max seconds to wait
+        :returns: True if the queue is empty
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._queue and not self._active, timeout)
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop the worker thread after writing any queued items
+        :param wait: if True, block until the worker thread exits
+        """
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if wait:
+            self._thread.join()
+
+    def get_stats(self) -> dict:
+        """
+        Get queue depth and write counters
+        """
+        with self._cond:
+            return {"depth": len(self._queue) + self._active,
+                    "max_size": self.max_size,
+                    "dropped": self.dropped,
+                    "completed": self.completed,
+                    "failed": self.failed}
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._stopping)
+                if not self._queue:
+                    return
+                pending, fn, args, kwargs = self._queue.popleft()
+                self._active += 1
+            try:
+                pending.path = fn(*args, **kwargs)
+                pending.state = "saved"
+            except Exception as e:
+                LOG.exception(f"{self.name} write failed: {e}")
+                pending.state = "failed"
+            with self._cond:
+                self._active -= 1
+                if pending.state == "saved":
+                    self.completed += 1
+                else:
+                    self.failed += 1
+                self._cond.notify_all()
+            if self._on_complete:
+                try:
+                    self._on_complete(pending)
+                except Exception as e:
+                    LOG.error(f"{self.name} completion callback failed: {e}")
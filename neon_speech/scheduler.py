@@ -0,0 +1,191 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from collections import deque, Counter
+from math import ceil
+from threading import Condition, Thread
+from time import time
+from typing import Callable, Dict, List, Optional
+
+from ovos_utils.log import LOG
+
+DEFAULT_CLASSES = ("interactive", "default", "bulk")
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """
+    Get the nearest-rank percentile of a list of values
+    :param values: list of values
+    :param pct: percentile to compute (0-100)
+    :returns: value at the requested percentile, or None if `values` is empty
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+class _Job:
+    __slots__ = ("fn", "priority", "client", "enqueued", "start_tag",
+                 "finish_tag")
+
+    def __init__(self, fn: Callable, priority: str, client: str):
+        self.fn = fn
+        self.priority = priority
+        self.client = client
+        self.enqueued = time()
+        self.start_tag = 0.0
+        self.finish_tag = 0.0
+
+
+class PriorityScheduler:
+    """
+    Run jobs on a fixed set of worker threads. Jobs in a higher priority class
+    always run before lower priority jobs; within a class, clients share
+    workers by weighted fair queuing (start-time fair queuing) and each
+    client is limited to `max_per_client` concurrent jobs.
+    """
+
+    def __init__(self, workers: int = 2, classes: tuple = DEFAULT_CLASSES,
+                 max_per_client: int = 0,
+                 client_weights: Optional[Dict[str, float]] = None,
+                 stats_window: int = 1000):
+        """
+        :param workers: number of jobs to run concurrently
+        :param classes: priority class names, highest priority first
+        :param max_per_client: max concurrent jobs per client (0 for no limit)
+        :param client_weights: relative share of workers per client (default 1)
+        :param stats_window: number of recent wait times kept per class
+        """
+        self.classes = tuple(classes)
+        self.max_per_client = max_per_client
+        self.client_weights = client_weights or dict()
+        self._cond = Condition()
+        self._queues = {c: dict() for c in self.classes}
+        self._last_finish = {c: dict() for c in self.classes}
+        self._virtual_time = {c: 0.0 for c in self.classes}
+        self._running = Counter()
+        self._waits = {c: deque(maxlen=stats_window) for c in self.classes}
+        self._stopping = False
+        self._threads = [Thread(target=self._worker, daemon=True,
+                                name=f"stt_scheduler_{i}")
+                         for i in range(max(workers, 1))]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, fn: Callable, priority: Optional[str] = None,
+               client: Optional[str] = None, cost: float = 1.0):
+        """
+        Queue a job to be run by a worker thread
+        :param fn: callable to run with no arguments
+        :param priority: priority class (lowest priority if not recognized)
+        :param client: identifier of the client submitting the job
+        :param cost: relative amount of work for fair queuing
+        """
+        if priority not in self.classes:
+            priority = self.classes[-1]
+        client = client or "unknown"
+        job = _Job(fn, priority, client)
+        weight = float(self.client_weights.get(client, 1.0)) or 1.0
+        with self._cond:
+            last_finish = self._last_finish[priority].get(client, 0.0)
+            job.start_tag = max(self._virtual_time[priority], last_finish)
+            job.finish_tag = job.start_tag + cost / weight
+            self._last_finish[priority][client] = job.finish_tag
+            self._queues[priority].setdefault(client, deque()).append(job)
+            self._cond.notify()
+
+    def _next_job(self) -> Optional[_Job]:
+        for priority in self.classes:
+            queues = self._queues[priority]
+            candidates = [q[0] for client, q in queues.items() if q and
+                          (not self.max_per_client or
+                           self._running[client] < self.max_per_client)]
+            if not candidates:
+                continue
+            job = min(candidates, key=lambda j: j.finish_tag)
+            queues[job.client].popleft()
+            if not queues[job.client]:
+                queues.pop(job.client)
+                if not any(queues):
+                    # Class is idle; forget finish tags of inactive clients
+                    self._last_finish[priority].clear()
+            self._virtual_time[priority] = job.start_tag
+            self._running[job.client] += 1
+            self._waits[priority].append(time() - job.enqueued)
+            return job
+        return None
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None and not self._stopping:
+                    self._cond.wait()
+                    job = self._next_job()
+                if job is None:
+                    return
+            try:
+                job.fn()
+            except Exception as e:
+                LOG.exception(f"Scheduled job failed: {e}")
+            finally:
+                with self._cond:
+                    self._running[job.client] -= 1
+                    if self._running[job.client] <= 0:
+                        self._running.pop(job.client)
+                    self._cond.notify_all()
+
+    def get_stats(self) -> dict:
+        """
+        Get queue depth and recent queue wait times for each priority class
+        :returns: dict of priority class to stats
+        """
+        with self._cond:
+            stats = dict()
+            for priority in self.classes:
+                waits = list(self._waits[priority])
+                stats[priority] = {
+                    "queued": sum(len(q) for q in
+                                  self._queues[priority].values()),
+                    "count": len(waits),
+                    "mean_wait": sum(waits) / len(waits) if waits else None,
+                    "p50_wait": percentile(waits, 50),
+                    "p95_wait": percentile(waits, 95),
+                    "max_wait": max(waits) if waits else None}
+            stats["running"] = dict(self._running)
+            return stats
+
+    def shutdown(self):
+        """
+        Stop worker threads after queued jobs complete
+        """
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
@@ -0,0 +1,136 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+from ovos_plugin_manager.templates.vad import VADEngine
+
+
+@dataclass
+class SpeechSegment:
+    """
+    A contiguous region of audio bounded by silence
+    """
+    start: float
+    end: float
+    audio: bytes
+    has_speech: bool = True
+
+
+class SilenceSegmenter:
+    """
+    Incrementally split PCM audio into segments at silences detected by a VAD
+    plugin. Segments are cut in the middle of the most recent silence once
+    `min_silence_seconds` of silence is observed, or when a segment reaches
+    `max_segment_seconds`.
+    """
+
+    def __init__(self, vad: VADEngine, sample_rate: int, sample_width: int,
+                 max_segment_seconds: float = 20.0,
+                 min_silence_seconds: float = 0.3,
+                 min_segment_seconds: float = 1.0):
+        self.vad = vad
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.max_segment_seconds = max_segment_seconds
+        self.min_silence_seconds = min_silence_seconds
+        self.min_segment_seconds = min_segment_seconds
+        frame_ms = getattr(vad, "frame_duration_ms", None) or 30
+        self._frame_bytes = int(sample_rate * frame_ms / 1000) * sample_width
+        self._buffer = bytearray()
+        self._pending = b''
+        self._offset = 0  # bytes emitted before the start of `_buffer`
+        self._silence_run = 0  # bytes of consecutive trailing silence
+        self._cut_point = None  # best split position within `_buffer`
+        self._has_speech = False
+        if hasattr(vad, "reset"):
+            vad.reset()
+
+    def _seconds(self, num_bytes: int) -> float:
+        return num_bytes / (self.sample_rate * self.sample_width)
+
+    def _emit(self, end: int) -> SpeechSegment:
+        segment = SpeechSegment(start=self._seconds(self._offset),
+                                end=self._seconds(self._offset + end),
+                                audio=bytes(self._buffer[:end]),
+                                has_speech=self._has_speech)
+        del self._buffer[:end]
+        self._offset += end
+        self._cut_point = None
+        self._silence_run = min(self._silence_run, len(self._buffer))
+        # Remaining audio contains speech if it is more than trailing silence
+        self._has_speech = len(self._buffer) > self._silence_run
+        return segment
+
+    def feed(self, audio: bytes) -> List[SpeechSegment]:
+        """
+        Add audio to the segmenter
+        :param audio: mono PCM audio bytes
+        :returns: list of segments completed by this audio
+        """
+        segments = list()
+        data = self._pending + audio
+        usable = len(data) - len(data) % self._frame_bytes
+        self._pending = data[usable:]
+        min_silence = self.min_silence_seconds * self.sample_rate * \
+            self.sample_width
+        max_bytes = int(self.max_segment_seconds * self.sample_rate) * \
+            self.sample_width
+        min_bytes = int(self.min_segment_seconds * self.sample_rate) * \
+            self.sample_width
+        for i in range(0, usable, self._frame_bytes):
+            frame = data[i:i + self._frame_bytes]
+            self._buffer += frame
+            if self.vad.is_silence(frame):
+                self._silence_run += len(frame)
+                if self._silence_run >= min_silence:
+                    middle = len(self._buffer) - self._silence_run // 2
+                    middle -= middle % self.sample_width
+                    self._cut_point = middle
+            else:
+                if self._cut_point and self._cut_point >= min_bytes:
+                    # Speech resumed after a long enough silence
+                    segments.append(self._emit(self._cut_point))
+                self._silence_run = 0
+                self._has_speech = True
+            if len(self._buffer) >= max_bytes:
+                segments.append(self._emit(self._cut_point or
+                                           len(self._buffer)))
+        return segments
+
+    def flush(self) -> Optional[SpeechSegment]:
+        """
+        Emit any remaining buffered audio as a final segment
+        :returns: final segment if any audio remains, else None
+        """
+        self._buffer += self._pending
+        self._pending = b''
+        if not self._buffer:
+            return None
+        return self._emit(len(self._buffer))
@@ -27,7 +27,10 @@
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import os
-from typing import Dict, List, Tuple
+import socket
+from contextlib import contextmanager
+from copy import deepcopy
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 import ovos_dinkum_listener.plugins
 
@@ -35,7 +38,6 @@ from tempfile import mkstemp
 from threading import Lock, Event
 from time import time
 
-from pydub import AudioSegment
 from speech_recognition import AudioData
 from neon_utils.file_utils import decode_base64_string_to_file
 from ovos_utils.log import LOG, log_deprecation
@@ -44,14 +46,46 @@ from neon_utils.metrics_utils import Stopwatch
 from neon_utils.parse_utils import clean_quotes
 from neon_utils.user_utils import apply_local_user_profile_updates
 from ovos_bus_client import Message
-from ovos_config.config import update_mycroft_config
+from ovos_config.config import Configuration, update_mycroft_config
+from ovos_dinkum_listener.plugins import FakeStreamingSTT
 from ovos_dinkum_listener.service import OVOSDinkumVoiceService
-from ovos_dinkum_listener.voice_loop.voice_loop import ListeningMode
+from ovos_dinkum_listener.voice_loop.voice_loop import ChunkInfo, \
+    ListeningMode, ListeningState
 
 from ovos_plugin_manager.stt import OVOSSTTFactory as STTFactory
 
+from neon_speech.admission import AdmissionController, OverloadError
+from neon_speech.async_api import AsyncSpeechAPI
+from neon_speech.cluster import ClusterCoordinator
+from neon_speech.shared_stt import PriorityLock, SharedSTT
+from neon_speech.idle import IdleUnloader
+from neon_speech.batching import MicroBatcher
+from neon_speech.cascade import CascadeSTT
+from neon_speech.http_api import HTTPError, STTHTTPServer
+from neon_speech.plugin_index import install_plugin_index
+from neon_speech.satellite import SatelliteServer, SatelliteSession
+from neon_speech.recording_store import RecordingStore
+from neon_speech.slo import SLOMonitor
+from neon_speech.profiler import SamplingProfiler
+from neon_speech.partials import PartialTranscriptPublisher
+from neon_speech.endpointing import EndpointPolicy
+from neon_speech.save_queue import BackgroundSaveQueue, PendingSave
+from neon_speech.model_cache import load_model_cache, restore_engine_state
+from neon_speech.coalescing import InFlightCoalescer, hash_file
+from neon_speech.scheduler import PriorityScheduler, DEFAULT_CLASSES
+from neon_speech.segmentation import SilenceSegmenter
+from neon_speech.stt_pool import STTEnginePool, warmup_stt
+from neon_speech.audio_utils import AudioLimitError, AudioMemoryTracker, \
+    check_audio_duration, check_payload_size, get_audio_duration, \
+    get_decoded_size, iter_audio_windows, merge_window_transcriptions, \
+    find_speech_bounds, split_windows_at_silence, DEFAULT_MAX_AUDIO_SECONDS, DEFAULT_MAX_PAYLOAD_BYTES, \
+    DEFAULT_WINDOW_SECONDS
+
 _SERVICE_READY = Event()
 
+# Keys in audio context that are returned in API responses, not parser data
+_API_REPLY_KEYS = ("memory", "segments", "coalesced", "conditioning")
+
 
 def on_ready():
     LOG.info('Speech client is ready.')
@@ -82,6 +116,10 @@ def on_started():
 
 
 class NeonSpeechClient(OVOSDinkumVoiceService):
+    _api_stt = None
+    _api_stt_holder = None
+    _api_stt_langs = None
+
     def __init__(self, ready_hook=on_ready, error_hook=on_error,
                  stopping_hook=on_stopping, alive_hook=on_alive,
                  started_hook=on_started, watchdog=lambda: None,
@@ -101,6 +139,38 @@ class NeonSpeechClient(OVOSDinkumVoiceService):
             LOG.info("Updating global config with passed config")
             from neon_speech.utils import patch_config
             patch_config(speech_config)
+        # Model cache must be activated before STT plugins are loaded
+        stt_config = Configuration().get('stt', {})
+        cache_config = stt_config.get('model_cache') or {}
+        if cache_config.get('enabled') and stt_config.get('module'):
+            self._model_cache = load_model_cache(stt_config['module'],
+                                                 cache_config)
+        else:
+            self._model_cache = None
+        listener_config = Configuration().get('listener', {})
+        # Plugin lookups must be indexed before any plugins are loaded
+        self._plugin_index = install_plugin_index() \
+            if listener_config.get('plugin_index', True) else None
+        partials_config = listener_config.get('partial_transcripts') or {}
+        if partials_config.get('enabled'):
+            self._partials = PartialTranscriptPublisher(
+                self._emit_partial_utterance,
+                min_interval=partials_config.get('min_interval', 0.25),
+                min_chars=partials_config.get('min_chars', 1))
+        else:
+            self._partials = None
+        endpoint_config = listener_config.get('endpointing') or {}
+        if endpoint_config.get('enabled'):
+            self._endpoint_policy = EndpointPolicy(
+                stable_seconds=endpoint_config.get('stable_seconds', 0.3),
+                min_silence_seconds=endpoint_config.get('min_silence_seconds',
+                                                        0.15),
+                min_words=endpoint_config.get('min_words', 1),
+                require_punctuation=endpoint_config.get(
+                    'require_punctuation', False))
+        else:
+            self._endpoint_policy = None
+        self._in_command = False
         # Don't init SpeechClient, because we're overriding self.loop
         OVOSDinkumVoiceService.__init__(self,
                                         on_ready=wrapped_ready_hook(ready_hook),
@@ -128,11 +198,314 @@ class NeonSpeechClient(OVOSDinkumVoiceService):
 
         self.lock = Lock()
         self._stop_service = Event()
+        self._segment_lock = Lock()
+        self._segment_vad_lock = Lock()
+        self._segment_vad = None
+        # Conditioning uses a separate stateful VAD from segmentation
+        self._condition_vad_lock = Lock()
+        self._condition_vad = None
+        self._segment_pool = None
+        self._segment_executor = None
+        self._coalescer = InFlightCoalescer()
+        scheduler_config = self.config['listener'].get('scheduler') or {}
+        if scheduler_config.get('enabled'):
+            self._scheduler = PriorityScheduler(
+                workers=scheduler_config.get('workers', 2),
+                classes=scheduler_config.get('classes', DEFAULT_CLASSES),
+                max_per_client=scheduler_config.get('max_per_client', 0),
+                client_weights=scheduler_config.get('client_weights'))
+        else:
+            self._scheduler = None
+        admission_config = self.config['listener'].get('admission') or {}
+        if admission_config.get('enabled'):
+            self._admission = AdmissionController(
+                concurrency=admission_config.get('concurrency', 1),
+                initial_rtf=admission_config.get('initial_rtf', 0.5),
+                overhead=admission_config.get('overhead', 0.1))
+        else:
+            self._admission = None
+        async_config = self.config['listener'].get('async_api') or {}
+        if async_config.get('enabled'):
+            if self._scheduler:
+                LOG.warning("Scheduler is not used with async_api enabled")
+            self._async_api = AsyncSpeechAPI(
+                self, workers=async_config.get('workers', 4),
+                ack_timeout=async_config.get('ack_timeout', 10))
+        else:
+            self._async_api = None
+        cluster_config = self.config['listener'].get('cluster') or {}
+        if cluster_config.get('enabled'):
+            if self._scheduler or self._async_api:
+                LOG.warning("Scheduler and async_api are not used for API "
+                            "requests with cluster enabled")
+            self._cluster = ClusterCoordinator(
+                self.bus, instance_id=cluster_config.get('instance_id') or
+                f"{socket.gethostname()}-{os.getpid()}",
+                workers=cluster_config.get('workers', 2),
+                claim_window=cluster_config.get('claim_window', 0.1),
+                lease_seconds=cluster_config.get('lease_seconds', 5))
+        else:
+            self._cluster = None
         if self.config.get('listener', {}).get('enable_stt_api', True):
-            self.api_stt = STTFactory.create(config=self.config)
+            self.api_stt = self._share_voice_loop_stt() or \
+                STTFactory.create(config=self.config)
         else:
             LOG.info("Skipping api_stt init")
             self.api_stt = None
+        if self._model_cache:
+            stream_engine = getattr(self.stt, 'engine', self.stt)
+            engines = (stream_engine,) \
+                if isinstance(self._api_stt, SharedSTT) \
+                else (self._api_stt, stream_engine)
+            for engine in engines:
+                if engine and restore_engine_state(engine, self._model_cache):
+                    LOG.info(f"Restored cached state for {engine}")
+        idle_config = self.config['listener'].get('idle_unload') or {}
+        if idle_config.get('enabled') and self._api_stt is not None:
+            if isinstance(self._api_stt, SharedSTT):
+                LOG.warning("api_stt is shared with the voice loop and will "
+                            "not be unloaded when idle")
+            else:
+                self._api_stt_holder = IdleUnloader(
+                    self._load_api_stt, idle_config.get('idle_seconds', 1800),
+                    on_load=self._on_api_stt_load)
+                self._api_stt_holder.set(self._api_stt)
+                self._api_stt = None
+        batch_config = self.config['listener'].get('batching') or {}
+        if batch_config.get('enabled'):
+            self._batcher = MicroBatcher(
+                lambda: self.api_stt,
+                max_batch_size=batch_config.get('max_batch_size', 8),
+                max_wait=batch_config.get('max_wait', 0.02),
+                bucket_ratio=batch_config.get('bucket_ratio', 2.0),
+                pad=batch_config.get('pad', False))
+        else:
+            self._batcher = None
+        cascade_config = self.config['listener'].get('cascade') or {}
+        if cascade_config.get('enabled') and cascade_config.get('primary') \
+                and self.api_stt:
+            if hasattr(self.api_stt, 'stream_start'):
+                LOG.warning("STT cascade is not used with a streaming api_stt")
+                self._cascade = None
+            else:
+                self._cascade = CascadeSTT(
+                    STTFactory.create(config={
+                        "lang": self.config.get('lang'),
+                        "stt": cascade_config['primary']}),
+                    self._transcribe_api,
+                    threshold=cascade_config.get('threshold', 0.8),
+                    on_result=self._on_cascade_result)
+        else:
+            self._cascade = None
+        self.warmup_timings = dict()
+        store_config = self.config['listener'].get('recording_store') or {}
+        if store_config.get('enabled'):
+            store_path = store_config.get('path') or \
+                os.path.join(self.default_save_path, "recordings")
+            self._recording_stores = {
+                kind: RecordingStore(
+                    os.path.join(store_path, kind),
+                    segment_bytes=int(store_config.get('segment_mb', 64) *
+                                      1024 * 1024),
+                    max_bytes=int(store_config.get('max_mb', 1024) *
+                                  1024 * 1024),
+                    max_age=store_config.get('max_age_days') and
+                    store_config['max_age_days'] * 86400,
+                    max_queue=store_config.get('max_queue', 64))
+                for kind in ("utterances", "wake_words")}
+        else:
+            self._recording_stores = None
+        slo_config = self.config['listener'].get('slo') or {}
+        if slo_config.get('enabled') and slo_config.get('objectives'):
+            self._slo = SLOMonitor(
+                slo_config['objectives'],
+                window_seconds=slo_config.get('window_seconds', 300),
+                min_samples=slo_config.get('min_samples', 20),
+                cooldown=slo_config.get('cooldown', 60))
+        else:
+            self._slo = None
+        profiler_config = self.config['listener'].get('profiler') or {}
+        if profiler_config.get('enabled'):
+            self._profiler = SamplingProfiler(
+                os.path.expanduser(profiler_config.get('path') or
+                                   os.path.join(self.default_save_path,
+                                                "profiles")),
+                interval=profiler_config.get('interval', 0.01),
+                malloc_interval=profiler_config.get('malloc_interval', 10),
+                max_duration=profiler_config.get('max_duration', 300))
+        else:
+            self._profiler = None
+        save_config = self.config['listener'].get('background_save') or {}
+        if save_config.get('enabled'):
+            self._save_queue = BackgroundSaveQueue(
+                save_config.get('max_queue', 32), "audio_save",
+                on_complete=self._on_save_complete)
+        else:
+            self._save_queue = None
+        http_config = self.config['listener'].get('http_api') or {}
+        if http_config.get('enabled'):
+            self._http_server = STTHTTPServer(
+                (http_config.get('host', '127.0.0.1'),
+                 http_config.get('port', 8010)),
+                {"/stt": self._handle_http_stt,
+                 "/audio_input": self._handle_http_audio_input},
+                workers=http_config.get('workers', 4),
+                max_pending=http_config.get('max_pending', 16),
+                keep_alive_timeout=http_config.get('keep_alive_timeout', 5),
+                max_payload_bytes=self._api_limits["max_payload_bytes"],
+                sample_rate=self.config['listener'].get('sample_rate', 16000))
+        else:
+            self._http_server = None
+        satellite_config = self.config['listener'].get('satellite') or {}
+        if satellite_config.get('enabled'):
+            self._satellite_engines = STTEnginePool(
+                lambda: STTFactory.create(config=self.config),
+                satellite_config.get('stt_engines', 2))
+            self._satellite_server = SatelliteServer(
+                self._create_satellite_session,
+                host=satellite_config.get('host', '127.0.0.1'),
+                port=satellite_config.get('port', 8011),
+                max_sessions=satellite_config.get('max_sessions', 4))
+        else:
+            self._satellite_engines = None
+            self._satellite_server = None
+        if self._plugin_index:
+            LOG.info(f"Plugin index: {self._plugin_index.get_stats()}")
+
+    def _init_voice_loop(self, listener_config: dict):
+        loop = OVOSDinkumVoiceService._init_voice_loop(self, listener_config)
+        if self._partials or self._endpoint_policy:
+            loop.chunk_callback = self._on_chunk
+        return loop
+
+    def _on_chunk(self, chunk_info: ChunkInfo):
+        """
+        Check a streaming STT engine for an updated interim transcript after
+        each chunk of recorded audio, publishing partial transcripts and
+        ending the recording early if the endpointing policy allows it
+        """
+        if self.voice_loop.state != ListeningState.IN_COMMAND:
+            if self._in_command:
+                self._in_command = False
+                for state in (self._partials, self._endpoint_policy):
+                    if state:
+                        state.reset()
+            return
+        self._in_command = True
+        stream = getattr(self.voice_loop.stt, 'stream', None)
+        text = getattr(stream, 'text', None)
+        if self._partials:
+            self._partials.update(text)
+        if self._endpoint_policy and self._endpoint_policy.update(
+                text, chunk_info.is_speech,
+                self.voice_loop.mic.seconds_per_chunk):
+            saved = max(self.voice_loop.silence_seconds_left, 0)
+            LOG.info(f"Early endpoint ({saved}s before silence timeout): "
+                     f"{text}")
+            self.bus.emit(Message("neon.metric", {"name": "early_endpoint",
+                                                  "duration": saved}))
+            self.voice_loop.state = ListeningState.AFTER_COMMAND
+
+    def _emit_partial_utterance(self, text: str):
+        lang = getattr(self.voice_loop.stt, 'lang', None) or \
+            self.config.get('lang')
+        self.bus.emit(Message("recognizer_loop:partial_utterance",
+                              {"utterance": text, "lang": lang}))
+
+    @property
+    def api_stt(self):
+        """
+        STT engine used for API requests. If idle unloading is enabled, the
+        engine is loaded on access if it was released.
+        """
+        if self._api_stt_holder:
+            return self._api_stt_holder.get()
+        return self._api_stt
+
+    @api_stt.setter
+    def api_stt(self, engine):
+        self._cache_api_stt_langs(engine)
+        if self._api_stt_holder:
+            self._api_stt_holder.set(engine)
+        else:
+            self._api_stt = engine
+
+    @contextmanager
+    def _use_api_stt(self):
+        """
+        Get the API STT engine, preventing an idle unload until the context
+        exits
+        """
+        if self._api_stt_holder:
+            with self._api_stt_holder.use() as engine:
+                yield engine
+        else:
+            yield self._api_stt
+
+    def _cache_api_stt_langs(self, engine):
+        """
+        Cache the languages supported by the API STT engine so they can be
+        reported without loading an unloaded engine
+        """
+        if engine is not None:
+            self._api_stt_langs = \
+                list(getattr(engine, 'available_languages', None) or [])
+
+    def _load_api_stt(self):
+        engine = STTFactory.create(config=self.config)
+        if self._model_cache:
+            restore_engine_state(engine, self._model_cache)
+        self._cache_api_stt_langs(engine)
+        return engine
+
+    def _on_api_stt_load(self, duration: float):
+        LOG.info(f"Reloaded api_stt in {duration}s")
+        self.bus.emit(Message("neon.metric", {"name": "api_stt_load",
+                                              "duration": duration}))
+
+    def _transcribe_api(self, audio: AudioData, lang: str) -> \
+            List[Tuple[str, float]]:
+        """
+        Transcribe audio with the API STT engine, batching concurrent
+        requests if configured
+        """
+        if self._batcher:
+            return self._batcher.transcribe(audio, lang)
+        return self.api_stt.transcribe(audio, lang)
+
+    def _on_cascade_result(self, tier: str, duration: float):
+        self.bus.emit(Message("neon.metric", {"name": f"stt_cascade_{tier}",
+                                              "duration": duration}))
+
+    def _share_voice_loop_stt(self) -> Optional[SharedSTT]:
+        """
+        If configured, share the voice loop STT model with the API. Voice loop
+        inference takes priority over API requests.
+        :returns: API view of the voice loop STT engine, if shared
+        """
+        if not self.config['listener'].get('share_stt'):
+            return None
+        if not isinstance(self.stt, FakeStreamingSTT):
+            LOG.warning("Voice loop STT is a streaming engine and cannot be "
+                        "shared; loading a separate model for API requests")
+            return None
+        engine = self.stt.engine
+        if isinstance(engine, SharedSTT):
+            engine = engine.engine
+        lock = PriorityLock()
+        self.stt.engine = SharedSTT(engine, lock, high_priority=True)
+        LOG.info(f"Sharing STT model with API: {engine.__class__.__name__}")
+        return SharedSTT(engine, lock)
+
+    def reload_configuration(self):
+        OVOSDinkumVoiceService.reload_configuration(self)
+        if self._plugin_index:
+            LOG.debug(f"Plugin index: {self._plugin_index.get_stats()}")
+        if isinstance(self._api_stt, SharedSTT) and \
+                not isinstance(getattr(self.stt, 'engine', None), SharedSTT):
+            # The voice loop STT was reloaded; share the new model
+            self.api_stt = self._share_voice_loop_stt() or \
+                STTFactory.create(config=self.config)
 
     def _record_end_signal(self):
         self._stt_stopwatch.start()
@@ -142,6 +515,9 @@ class NeonSpeechClient(OVOSDinkumVoiceService):
         self._stt_stopwatch.stop()
         stt_context.setdefault("timing", dict())
         stt_context["timing"]["get_stt"] = self._stt_stopwatch.time
+        self._record_latency("get_stt", self._stt_stopwatch.time)
+        self._record_latency("transform_audio",
+                             stt_context["timing"].get("transform_audio"))
 
         # This is where the first Message of the interaction is created
         OVOSDinkumVoiceService._stt_text(self, text, stt_context)
@@ -150,21 +526,80 @@ class NeonSpeechClient(OVOSDinkumVoiceService):
     def _save_stt(self, audio_bytes, stt_meta, save_path=None):
         stopwatch = Stopwatch("save_audio", True, self.bus)
         with stopwatch:
-            path = OVOSDinkumVoiceService._save_stt(self, audio_bytes, stt_meta,
-                                                    save_path)
+            if self._recording_stores and not save_path:
+                path = self._store_recording("utterances", audio_bytes,
+                                             stt_meta)
+            elif self._save_queue:
+                # Copy metadata since the caller continues to modify it
+                path = self._save_queue.submit(
+                    OVOSDinkumVoiceService._save_stt, self, audio_bytes,
+                    deepcopy(stt_meta), save_path).handle
+            else:
+                path = OVOSDinkumVoiceService._save_stt(self, audio_bytes,
+                                                        stt_meta, save_path)
         stt_meta.setdefault('timing', dict())
         stt_meta['timing']['save_audio'] = stopwatch.time
+        self._record_latency("save_audio", stopwatch.time)
         return path
 
     def _save_ww(self, audio_bytes, ww_meta, save_path=None):
         stopwatch = Stopwatch("save_ww", True, self.bus)
         with stopwatch:
-            path = OVOSDinkumVoiceService._save_ww(self, audio_bytes, ww_meta,
-                                                   save_path)
+            if self._recording_stores and not save_path:
+                path = self._store_recording(
+                    "wake_words", audio_bytes,
+                    self._compile_ww_context(ww_meta["key_phrase"],
+                                             ww_meta["module"]))
+            elif self._save_queue:
+                path = self._save_queue.submit(
+                    OVOSDinkumVoiceService._save_ww, self, audio_bytes,
+                    deepcopy(ww_meta), save_path).handle
+            else:
+                path = OVOSDinkumVoiceService._save_ww(self, audio_bytes,
+                                                       ww_meta, save_path)
         ww_meta.setdefault('timing', dict())
         ww_meta['timing']['save_ww'] = stopwatch.time
+        self._record_latency("save_ww", stopwatch.time)
         return path
 
+    def _record_latency(self, stage: str, duration: Optional[float]):
+        """
+        Check a stage latency against its configured SLO and emit
+        `neon.speech.slo_violation` if the objective is not being met
+        :param stage: name of the measured stage
+        :param duration: measured latency in seconds
+        """
+        if not self._slo:
+            return
+        violation = self._slo.record(stage, duration)
+        if violation:
+            LOG.warning(f"SLO violation: {violation}")
+            self.bus.emit(Message("neon.speech.slo_violation", violation))
+
+    def _on_save_complete(self, pending: PendingSave):
+        """
+        Notify listeners of the path a queued recording was saved to
+        :param pending: completed save
+        """
+        self.bus.emit(Message("neon.speech.recording_saved",
+                              {"handle": pending.handle,
+                               "path": pending.path,
+                               "state": pending.state}))
+
+    def _store_recording(self, kind: str, audio_bytes: bytes,
+                         metadata: dict) -> str:
+        """
+        Queue a recording to be written to the configured recording store
+        :param kind: recording store name ("utterances" or "wake_words")
+        :param audio_bytes: raw recorded audio
+        :param metadata: metadata to store with the recording
+        :returns: handle of the stored recording
+        """
+        mic = self.voice_loop.mic
+        return self._recording_stores[kind].append(
+            audio_bytes, metadata, mic.sample_rate, mic.sample_width,
+            mic.sample_channels)
+
     def _validate_message_context(self, message: Message, native_sources=None):
         if message.context.get('destination') and \
                 "audio" not in message.context['destination']:
@@ -174,12 +609,55 @@ class NeonSpeechClient(OVOSDinkumVoiceService):
         return OVOSDinkumVoiceService._validate_message_context(self, message,
                                                                 native_sources)
 
+    def _after_start(self):
+        OVOSDinkumVoiceService._after_start(self)
+        self._warmup_stt()
+
+    def _warmup_stt(self):
+        """
+        Run synthetic audio through the API and voice loop STT engines for
+        each configured language so the first real request does not pay for
+        lazy initialization. This blocks until complete so readiness is only
+        reported for a warm service.
+        """
+        warmup_config = self.config['listener'].get('warmup') or {}
+        if not warmup_config.get('enabled'):
+            return
+        langs = warmup_config.get('languages') or \
+            [self.config.get('lang') or 'en-us'] + \
+            [lang for lang in self.config.get('secondary_langs', [])
+             if lang != self.config.get('lang')]
+        seconds = warmup_config.get('seconds', 1.0)
+        iterations = max(warmup_config.get('iterations', 2), 1)
+        sample_rate = self.config['listener'].get('sample_rate', 16000)
+        engines = {"voice_loop": getattr(self.stt, 'engine', self.stt)}
+        if self.api_stt:
+            engines["api_stt"] = self.api_stt
+        if self._cascade:
+            engines["cascade_primary"] = self._cascade.primary
+        start = time()
+        timings = dict()
+        for name, engine in engines.items():
+            timings[name] = dict()
+            for lang in langs:
+                durations = [warmup_stt(engine, lang, seconds, sample_rate)
+                             for _ in range(iterations)]
+                timings[name][lang] = {"first": durations[0],
+                                       "warm": durations[-1]}
+                LOG.info(f"Warmed up {name} ({lang}): "
+                         f"first={durations[0]}s, warm={durations[-1]}s")
+        timings["total"] = time() - start
+        self.warmup_timings = timings
+        self.bus.emit(Message("neon.metric", {"name": "stt_warmup",
+                                              "duration": timings["total"]}))
+
     def run(self):
         if self.config.get('listener', {}).get('enable_voice_loop', True):
             OVOSDinkumVoiceService.run(self)
         else:
             LOG.info(f"Running without voice_loop")
             self.register_event_handlers()
+            self._warmup_stt()
             self.status.set_ready()
             try:
                 self._stop_service.wait()
@@ -194,6 +672,31 @@ class NeonSpeechClient(OVOSDinkumVoiceService):
     def shutdown(self):
         LOG.info("Shutting Down")
         self.stop()
+        if self._segment_executor:
+            self._segment_executor.shutdown(wait=False)
+            self._segment_pool.shutdown()
+        if self._scheduler:
+            self._scheduler.shutdown()
+        if self._recording_stores:
+            for store in self._recording_stores.values():
+                store.shutdown()
+        if self._save_queue:
+            self._save_queue.shutdown()
+        if self._profiler:
+            self._profiler.stop()
+        if self._async_api:
+            self._async_api.shutdown()
+        if self._cluster:
+            self._cluster.shutdown()
+        if self._api_stt_holder:
+            self._api_stt_holder.shutdown()
+        if self._batcher:
+            self._batcher.shutdown()
+        if self._http_server:
+            self._http_server.stop()
+        if self._satellite_server:
+            self._satellite_server.stop()
+            self._satellite_engines.shutdown()
         self._stop_service.set()
 
     def register_event_handlers(self):
@@ -206,8 +709,40 @@ class NeonSpeechClient(OVOSDinkumVoiceService):
         self.bus.once("mycroft.ready", self.handle_ready)
 
         # Register API Handlers
-        self.bus.on("neon.get_stt", self.handle_get_stt)
-        self.bus.on("neon.audio_input", self.handle_audio_input)
+        if self._http_server:
+            try:
+                self._http_server.start()
+            except OSError as e:
+                LOG.error(f"Failed to start HTTP API on "
+                          f"{self._http_server.server_address}: {e}")
+        if self._satellite_server:
+            try:
+                self._satellite_server.start()
+            except ImportError as e:
+                LOG.error(e)
+        if self._cluster:
+            self.bus.on("neon.get_stt",
+                        self._cluster.wrap(self.handle_get_stt))
+            self.bus.on("neon.audio_input",
+                        self._cluster.wrap(self.handle_audio_input))
+        elif self._async_api:
+            self.bus.on("neon.get_stt", self._async_api.handle_get_stt)
+            self.bus.on("neon.audio_input",
+                        self._async_api.handle_audio_input)
+        else:
+            self.bus.on("neon.get_stt", self._scheduled(self.handle_get_stt))
+            self.bus.on("neon.audio_input",
+                        self._scheduled(self.handle_audio_input))
+        self.bus.on("neon.speech.get_scheduler_stats",
+                    self.handle_get_scheduler_stats)
+        self.bus.on("neon.speech.get_status", self.handle_get_status)
+        self.bus.on("neon.speech.preload", self.handle_preload)
+        self.bus.on("neon.speech.get_cluster_stats",
+                    self.handle_get_cluster_stats)
+        self.bus.on("neon.speech.get_save_stats", self.handle_get_save_stats)
+        self.bus.on("neon.speech.get_slo_status", self.handle_get_slo_status)
+        self.bus.on("neon.speech.profile.start", self.handle_profile_start)
+        self.bus.on("neon.speech.profile.stop", self.handle_profile_stop)
 
         # State Change Notifications
         self.bus.on("neon.wake_words_state", self.handle_wake_words_state)
@@ -223,6 +758,152 @@ class NeonSpeechClient(OVOSDinkumVoiceService):
         # TODO: Patching config reload behavior
         self.bus.on("configuration.patch", self._patch_handle_config_reload)
 
+    def _scheduled(self, handler: callable) -> callable:
+        """
+        Wrap an API request handler so requests are run by the priority
+        scheduler, if enabled.
+        :param handler: bus handler to wrap
+        :returns: bus handler that queues requests with the scheduler
+        """
+        def wrapper(message: Message):
+            if not self._scheduler:
+                return handler(message)
+            priority, client = self._get_request_priority(message)
+            queued_time = time()
+
+            def _run():
+                message.context.setdefault("timing", dict())
+                message.context["timing"]["queue_wait"] = time() - queued_time
+                handler(message)
+
+            LOG.debug(f"Queueing {message.msg_type} for {client} "
+                      f"(priority={priority})")
+            self._scheduler.submit(_run, priority, client)
+        return wrapper
+
+    def _get_request_priority(self, message: Message) -> (str, str):
+        """
+        Determine the scheduling priority class and client of an API request.
+        An explicit `priority` in context takes precedence over the configured
+        class for the requesting `client`.
+        :param message: API request message
+        :returns: (priority class, client identifier)
+        """
+        config = self.config['listener'].get('scheduler') or {}
+        client = message.context.get("client") or "unknown"
+        client_id = message.context.get("client_id") or client
+        priority = message.context.get("priority")
+        if priority not in self._scheduler.classes:
+            priority = (config.get('client_classes') or {}).get(client) or \
+                config.get('default_class', "default")
+        return priority, client_id
+
+    def handle_get_scheduler_stats(self, message: Message):
+        """
+        Handle a request for API request scheduler statistics
+        :param message: Message associated with request
+        """
+        if not self._scheduler:
+            self.bus.emit(message.response({"error": "scheduler disabled"}))
+            return
+        self.bus.emit(message.response(self._scheduler.get_stats()))
+
+    def handle_get_cluster_stats(self, message: Message):
+        """
+        Handle a request for this instance's cluster state
+        :param message: Message associated with request
+        """
+        if not self._cluster:
+            self.bus.emit(message.response({"error": "cluster disabled"}))
+            return
+        self.bus.emit(message.response(self._cluster.get_stats()))
+
+    def handle_preload(self, message: Message):
+        """
+        Handle a hint to load models ahead of expected traffic
+        :param message: Message optionally containing `keep_seconds`, the
+            minimum time to keep models loaded
+        """
+        if not self._api_stt_holder:
+            self.bus.emit(message.response(
+                {"loaded": self._api_stt is not None}))
+            return
+        self._api_stt_holder.preload(message.data.get("keep_seconds"))
+        self.bus.emit(message.response(
+            {"loaded": True, **self._api_stt_holder.get_stats()}))
+
+    def handle_get_status(self, message: Message):
+        """
+        Handle a request for service status, including STT warmup timings
+        and stats for enabled API features
+        :param message: Message associated with request
+        """
+        self.bus.emit(message.response(
+            {"state": self.status.state.name,
+             "ready": self.status.check_ready(),
+             "warmup": self.warmup_timings,
+             "api_stt": self._api_stt_holder.get_stats() if
+             self._api_stt_holder else {"loaded": self._api_stt is not None},
+             "batching": self._batcher.get_stats() if self._batcher else
+             None,
+             "cascade": self._cascade.get_stats() if self._cascade else
+             None,
+             "coalescing": self._coalescer.get_stats() if
+             self.config['listener'].get('coalesce_requests') else None,
+             "plugin_index": self._plugin_index.get_stats() if
+             self._plugin_index else None}))
+
+    def handle_get_save_stats(self, message: Message):
+        """
+        Handle a request for background audio save queue depth and counters
+        :param message: Message associated with request
+        """
+        stats = dict()
+        if self._save_queue:
+            stats["files"] = self._save_queue.get_stats()
+        for kind, store in (self._recording_stores or {}).items():
+            stats[kind] = store.get_stats()
+        self.bus.emit(message.response(stats))
+
+    def handle_get_slo_status(self, message: Message):
+        """
+        Handle a request for current latency SLO burn rates
+        :param message: Message associated with request
+        """
+        if not self._slo:
+            self.bus.emit(message.response({"error": "slo disabled"}))
+            return
+        self.bus.emit(message.response(self._slo.get_burn_rates()))
+
+    def handle_profile_start(self, message: Message):
+        """
+        Handle a request to start profiling the running service
+        :param message: Message optionally containing `duration` in seconds
+            and `trace_malloc` to enable/disable memory profiling
+        """
+        if not self._profiler:
+            self.bus.emit(message.response({"error": "profiler disabled"}))
+            return
+        try:
+            session = self._profiler.start(
+                message.data.get("duration"),
+                message.data.get("trace_malloc", True))
+            self.bus.emit(message.response(session))
+        except RuntimeError as e:
+            self.bus.emit(message.response({"error": repr(e)}))
+
+    def handle_profile_stop(self, message: Message):
+        """
+        Handle a request to stop profiling and write results
+        :param message: Message associated with request
+        """
+        if not self._profiler:
+            self.bus.emit(message.response({"error": "profiler disabled"}))
+            return
+        session = self._profiler.stop()
+        self.bus.emit(message.response(session or
+                                       {"error": "profiler not started"}))
+
     def _patch_handle_config_reload(self, _: Message):
         # This patches observed behavior where the filewatcher fails to trigger.
         # Configuration reload is idempotent, so calling it again will have
@@ -234,8 +915,8 @@ class NeonSpeechClient(OVOSDinkumVoiceService):
         if self.config.get('listener', {}).get('enable_voice_loop', True):
             return OVOSDinkumVoiceService._handle_get_languages_stt(self,
                                                                     message)
-        # For server use, get the API STT langs
-        stt_langs = self.api_stt.available_languages or \
+        # For server use, get the API STT langs cached when it was loaded
+        stt_langs = self._api_stt_langs or \
             [self.config.get('lang') or 'en-us']
         LOG.debug(f"Got stt_langs: {stt_langs}")
         self.bus.emit(message.response({'langs': list(stt_langs)}))
@@ -387,33 +1068,43 @@ class NeonSpeechClient(OVOSDinkumVoiceService):
         Emits a response to the sender with stt data or error data
         :param message: Message associated with request
         """
+        ident = message.context.get("ident") or "neon.get_stt.response"
+        LOG.info(f"Handling STT request: {ident}")
+        data = self._get_stt_response(message)
+        self.bus.emit(message.reply(ident, data=data))
+
+    def _get_stt_response(self, message: Message) -> dict:
+        """
+        Transcribe the audio in a `neon.get_stt` request. Request timing is
+        added to `message.context`.
+        :param message: Message associated with request
+        :returns: response data with stt data or error data
+        """
         received_time = time()
-        if message.data.get("audio_data"):
-            wav_file_path = self._write_encoded_file(
-                message.data.pop("audio_data"))
-        else:
-            wav_file_path = message.data.get("audio_file")
         lang = message.data.get("lang")
-        ident = message.context.get("ident") or "neon.get_stt.response"
 
         message.context.setdefault("timing", dict())
-        LOG.info(f"Handling STT request: {ident}")
+        try:
+            wav_file_path = self._get_request_audio_file(message)
+        except AudioLimitError as e:
+            LOG.warning(e)
+            message.context['timing']['response_sent'] = time()
+            return {"error": repr(e)}
         if not wav_file_path:
             message.context['timing']['response_sent'] = time()
-            self.bus.emit(message.reply(
-                ident, data={"error": f"audio_file not specified!"}))
-            return
+            return {"error": f"audio_file not specified!"}
 
         if not os.path.isfile(wav_file_path):
             message.context['timing']['response_sent'] = time()
-            self.bus.emit(message.reply(
-                ident, data={"error": f"{wav_file_path} Not found!"}))
+            return {"error": f"{wav_file_path} Not found!"}
 
         try:
 
             _, parser_data, transcriptions = \
-                self._get_stt_from_file(wav_file_path, lang)
+                self._get_stt_coalesced(wav_file_path, lang,
+                                        self._get_request_deadline(message))
             timing = parser_data.pop('timing')
+            reply_data = self._pop_reply_data(parser_data)
             message.context["timing"] = {**message.context["timing"], **timing}
             sent_time = message.context["timing"].get("client_sent",
                                                       received_time)
@@ -422,14 +1113,14 @@ class NeonSpeechClient(OVOSDinkumVoiceService):
                     received_time - sent_time
             message.context['timing']['response_sent'] = time()
             transcribed_str = [t[0] for t in transcriptions]
-            self.bus.emit(message.reply(ident,
-                                        data={"parser_data": parser_data,
-                                              "transcripts": transcribed_str,
-                                              "transcripts_with_conf": transcriptions}))
+            return {"parser_data": parser_data,
+                    "transcripts": transcribed_str,
+                    "transcripts_with_conf": transcriptions,
+                    **reply_data}
         except Exception as e:
             LOG.error(e)
             message.context['timing']['response_sent'] = time()
-            self.bus.emit(message.reply(ident, data={"error": repr(e)}))
+            return self._get_error_data(e)
 
     def handle_audio_input(self, message):
         """
@@ -437,63 +1128,225 @@ class NeonSpeechClient(OVOSDinkumVoiceService):
         Handles remote audio input to Neon and replies with confirmation
         :param message: Message associated with request
         """
+        ident = message.context.get("ident") or "neon.audio_input.response"
+        LOG.info(f"Handling audio input: {ident}")
+        # Reply to original message with transcription/audio parser data
+        self.bus.emit(message.reply(
+            ident, data=self._get_audio_input_response(message)))
 
-        def build_context(msg: Message):
-            ctx: dict = message.context
-            defaults = {'client_name': 'mycroft_listener',
-                        'client': 'api',
-                        'source': 'speech_api',
-                        'ident': time(),
-                        'username': self._default_user["user"]["username"] or
-                        "local",
-                        'user_profiles': [self._default_user.content]}
-            ctx = {**defaults, **ctx, 'destination': ['skills']}
-            ctx['timing'] = {**ctx.get('timing', {}),
-                             **{'start': msg.data.get('time'),
-                                'transcribed': time()}}
-            return ctx
+    def _get_audio_input_response(self, message: Message) -> dict:
+        """
+        Transcribe the audio in a `neon.audio_input` request and send the
+        resulting utterance to skills
+        :param message: Message associated with request
+        :returns: response data with stt data or error data
+        """
+        try:
+            utterance, reply_data = self._transcribe_audio_input(message)
+            # Send a new message to the skills module with proper routing ctx
+            reply_data["skills_recv"] = \
+                self._emit_utterance_to_skills(utterance)
+            return reply_data
+        except Exception as e:
+            LOG.error(e)
+            return self._get_error_data(e)
 
+    def _handle_http_stt(self, audio_file: str, params: dict) -> \
+            (int, dict):
+        """
+        Handle an HTTP `POST /stt` request
+        :param audio_file: path to uploaded audio
+        :param params: request parameters
+        :returns: (HTTP status, response data)
+        """
+        message = self._get_http_message("neon.get_stt", audio_file, params)
+        return self._get_http_response(message,
+                                       self._get_stt_response(message))
+
+    def _handle_http_audio_input(self, audio_file: str, params: dict) -> \
+            (int, dict):
+        """
+        Handle an HTTP `POST /audio_input` request
+        :param audio_file: path to uploaded audio
+        :param params: request parameters
+        :returns: (HTTP status, response data)
+        """
+        message = self._get_http_message("neon.audio_input", audio_file,
+                                         params)
+        return self._get_http_response(
+            message, self._get_audio_input_response(message))
+
+    @staticmethod
+    def _get_http_message(msg_type: str, audio_file: str,
+                          params: dict) -> Message:
+        """
+        Build an API request Message for an HTTP request
+        :param msg_type: API message type to build
+        :param audio_file: path to uploaded audio
+        :param params: request parameters
+        :returns: Message equivalent to a messagebus API request
+        :raises HTTPError: if a parameter is invalid
+        """
+        context = {"source": "http_api", "timing": dict()}
+        if params.get("deadline"):
+            try:
+                context["deadline"] = float(params["deadline"])
+            except ValueError:
+                raise HTTPError(400, f"Invalid deadline: "
+                                     f"{params['deadline']}")
+        data = {"audio_file": audio_file}
+        if params.get("lang"):
+            data["lang"] = params["lang"]
+        return Message(msg_type, data, context)
+
+    @staticmethod
+    def _get_http_response(message: Message, data: dict) -> (int, dict):
+        """
+        Build an HTTP response from API response data
+        :param message: handled API request Message
+        :param data: API response data
+        :returns: (HTTP status, response data including timing)
+        """
+        if data.get("error") == "overloaded":
+            status = 503
+        elif "error" in data:
+            status = 500
+        else:
+            status = 200
+        return status, {**data, "timing": message.context.get("timing", {})}
+
+    def _create_satellite_session(self, options: dict,
+                                  send: Callable[[dict], None]) -> \
+            SatelliteSession:
+        """
+        Create a session to handle audio streamed from a satellite device
+        :param options: session options sent by the satellite
+        :param send: function to send an event to the satellite
+        :returns: SatelliteSession for the connection
+        """
+        from ovos_plugin_manager.vad import OVOSVADFactory
+        listener_config = self.config['listener']
+        vad_config = listener_config.get('VAD') or {}
+        satellite_config = listener_config.get('satellite') or {}
+        sample_rate = listener_config.get('sample_rate', 16000)
+        if options.get('sample_rate', sample_rate) != sample_rate:
+            raise ValueError(f"Satellite audio must be {sample_rate}Hz")
+        lang = options.get('lang') or self.config.get('lang')
+        hotword = None
+        if options.get('wake_word'):
+            from ovos_plugin_manager.wakewords import OVOSWakeWordFactory
+            hotword = OVOSWakeWordFactory.create_hotword(
+                options['wake_word'], self.config, lang)
+        context = {**(options.get('context') or {}), 'source': 'satellite'}
+        LOG.info(f"Satellite connected: {context}")
+
+        def _on_utterance(transcriptions, audio, timing):
+            send(self._handle_satellite_utterance(context, lang,
+                                                  transcriptions, audio,
+                                                  timing))
+
+        return SatelliteSession(
+            OVOSVADFactory.create(self.config), self._satellite_engines,
+            lang, _on_utterance, hotword=hotword, sample_rate=sample_rate,
+            sample_width=options.get('sample_width', 2),
+            chunk_seconds=satellite_config.get('chunk_seconds', 0.03),
+            speech_seconds=vad_config.get('speech_seconds', 0.1),
+            silence_seconds=vad_config.get('silence_seconds', 0.5),
+            before_seconds=vad_config.get('before_seconds', 0.5),
+            max_seconds=listener_config.get('recording_timeout', 10.0),
+            on_event=send)
+
+    def _handle_satellite_utterance(self, context: dict, lang: str,
+                                    transcriptions: List[Tuple[str, float]],
+                                    audio: AudioData, timing: dict) -> dict:
+        """
+        Send an utterance transcribed from satellite audio to skills, as if
+        it were sent with `neon.audio_input`. This is called from the session
+        worker thread after the transcript was sent to the satellite.
+        :param context: satellite session context
+        :param lang: language of the utterance
+        :param transcriptions: list of (transcription, confidence)
+        :param audio: recorded command audio
+        :param timing: timing of the STT request
+        :returns: event data to send to the satellite
+        """
+        start = time()
+        _, parser_data = self.transformers.transform(audio)
+        timing = {**timing, "transform_audio": time() - start}
+        self._record_latency("get_stt", timing["get_stt"])
+        self._record_latency("transform_audio", timing["transform_audio"])
+        transcribed_str = [t[0] for t in transcriptions]
+        event = {"type": "handled", "parser_data": parser_data}
+        if not transcriptions:
+            LOG.info("No speech transcribed from satellite audio")
+            event["skills_recv"] = False
+            return event
+        ctx = self._get_utterance_context({**context,
+                                           "audio_parser_data": parser_data,
+                                           "timing": timing})
+        utterance = Message('recognizer_loop:utterance',
+                            {"utterances": transcribed_str, "lang": lang},
+                            ctx)
+        event["skills_recv"] = self._emit_utterance_to_skills(utterance)
+        return event
+
+    def _get_utterance_context(self, context: dict,
+                               start: Optional[float] = None) -> dict:
+        """
+        Build the context of an utterance Message sent to skills for remote
+        audio input
+        :param context: request context to include
+        :param start: time the client started handling the input
+        :returns: utterance Message context
+        """
+        defaults = {'client_name': 'mycroft_listener',
+                    'client': 'api',
+                    'source': 'speech_api',
+                    'ident': time(),
+                    'username': self._default_user["user"]["username"] or
+                    "local",
+                    'user_profiles': [self._default_user.content]}
+        ctx = {**defaults, **context, 'destination': ['skills']}
+        ctx['timing'] = {**ctx.get('timing', {}),
+                         **{'start': start,
+                            'transcribed': time()}}
+        return ctx
+
+    def _transcribe_audio_input(self, message: Message) -> (Message, dict):
+        """
+        Transcribe the audio in a `neon.audio_input` request
+        :param message: Message associated with request
+        :returns: (utterance Message to send to skills, response data)
+        """
         received_time = time()
         sent_time = message.context.get("timing", {}).get("client_sent",
                                                           received_time)
         if received_time != sent_time:
             message.context['timing']['client_to_core'] = \
                 received_time - sent_time
-        ident = message.context.get("ident") or "neon.audio_input.response"
-        LOG.info(f"Handling audio input: {ident}")
-        if message.data.get("audio_data"):
-            wav_file_path = self._write_encoded_file(
-                message.data.pop("audio_data"))
-        else:
-            wav_file_path = message.data.get("audio_file")
         lang = message.data.get("lang")
-        try:
-            # _=transformed audio_data
-            _, parser_data, transcriptions = \
-                self._get_stt_from_file(wav_file_path, lang)
-            timing = parser_data.pop('timing')
-            message.context["audio_parser_data"] = parser_data
-            message.context.setdefault('timing', dict())
-            message.context['timing'] = {**timing, **message.context['timing']}
-            context = build_context(message)
-            transribed_str = [t[0] for t in transcriptions]
-            data = {
-                "utterances": transribed_str,
-                "lang": message.data.get("lang", "en-us")
-            }
-            # Send a new message to the skills module with proper routing ctx
-            handled = self._emit_utterance_to_skills(Message(
-                'recognizer_loop:utterance', data, context))
-
-            # Reply to original message with transcription/audio parser data
-            self.bus.emit(message.reply(ident,
-                                        data={"parser_data": parser_data,
-                                              "transcripts": transribed_str,
-                                              "transcripts_with_conf": transcriptions,
-                                              "skills_recv": handled}))
-        except Exception as e:
-            LOG.error(e)
-            self.bus.emit(message.reply(ident, data={"error": repr(e)}))
+        wav_file_path = self._get_request_audio_file(message)
+        # _=transformed audio_data
+        _, parser_data, transcriptions = \
+            self._get_stt_coalesced(wav_file_path, lang,
+                                    self._get_request_deadline(message))
+        timing = parser_data.pop('timing')
+        reply_data = self._pop_reply_data(parser_data)
+        message.context["audio_parser_data"] = parser_data
+        message.context.setdefault('timing', dict())
+        message.context['timing'] = {**timing, **message.context['timing']}
+        context = self._get_utterance_context(message.context,
+                                              message.data.get('time'))
+        transribed_str = [t[0] for t in transcriptions]
+        data = {
+            "utterances": transribed_str,
+            "lang": message.data.get("lang", "en-us")
+        }
+        return Message('recognizer_loop:utterance', data, context), \
+            {"parser_data": parser_data,
+             "transcripts": transribed_str,
+             "transcripts_with_conf": transcriptions,
+             **reply_data}
 
     def handle_internet_connected(self, _):
         """
@@ -530,6 +1383,79 @@ class NeonSpeechClient(OVOSDinkumVoiceService):
         if not check_online():
             self.handle_offline(message)
 
+    @property
+    def _api_limits(self) -> dict:
+        """
+        Configured limits for audio handled by the STT API
+        """
+        limits = self.config.get('listener', {}).get('api_limits') or {}
+        return {"max_payload_bytes": limits.get("max_payload_bytes",
+                                                DEFAULT_MAX_PAYLOAD_BYTES),
+                "max_audio_seconds": limits.get("max_audio_seconds",
+                                                DEFAULT_MAX_AUDIO_SECONDS),
+                "window_seconds": limits.get("window_seconds",
+                                             DEFAULT_WINDOW_SECONDS),
+                "window_search_seconds": limits.get("window_search_seconds",
+                                                    5.0),
+                "mmap_files": limits.get("mmap_files", False)}
+
+    def _get_request_audio_file(self, message: Message) -> Optional[str]:
+        """
+        Get a path to the audio associated with an API request, writing any
+        encoded `audio_data` to a file. Payload size is validated before
+        anything is decoded.
+        :param message: Message containing `audio_data` or `audio_file`
+        :returns: path to the audio file to process, if specified
+        """
+        max_bytes = self._api_limits["max_payload_bytes"]
+        if message.data.get("audio_data"):
+            audio_data = message.data.pop("audio_data")
+            check_payload_size(get_decoded_size(audio_data), max_bytes)
+            return self._write_encoded_file(audio_data)
+        wav_file_path = message.data.get("audio_file")
+        if wav_file_path and os.path.isfile(wav_file_path):
+            check_payload_size(os.path.getsize(wav_file_path), max_bytes)
+        return wav_file_path
+
+    def _get_request_deadline(self, message: Message) -> Optional[float]:
+        """
+        Get the number of seconds remaining to complete an API request. A
+        client-supplied `deadline` in context takes precedence over the
+        configured default; time spent queued is subtracted.
+        :param message: API request message
+        :returns: seconds remaining, or None if there is no deadline
+        """
+        config = self.config['listener'].get('admission') or {}
+        deadline = message.context.get("deadline")
+        if deadline is None:
+            deadline = config.get("deadline")
+        if deadline is None:
+            return None
+        return float(deadline) - \
+            message.context.get("timing", {}).get("queue_wait", 0)
+
+    @staticmethod
+    def _get_error_data(e: Exception) -> dict:
+        """
+        Build API response data for a failed request
+        :param e: Exception raised while handling the request
+        :returns: dict response data
+        """
+        if isinstance(e, OverloadError):
+            return e.to_dict()
+        return {"error": repr(e)}
+
+    @staticmethod
+    def _pop_reply_data(parser_data: dict) -> dict:
+        """
+        Extract request metadata from audio context for inclusion in an API
+        response
+        :param parser_data: audio context returned by `_get_stt_from_file`
+        :returns: dict of data to add to the response
+        """
+        return {key: parser_data.pop(key) for key in _API_REPLY_KEYS
+                if key in parser_data}
+
     @staticmethod
     def _write_encoded_file(audio_data: str) -> str:
         _, output_path = mkstemp()
@@ -538,62 +1464,321 @@ class NeonSpeechClient(OVOSDinkumVoiceService):
         wav_file_path = decode_base64_string_to_file(audio_data, output_path)
         return wav_file_path
 
-    def _get_stt_from_file(self, wav_file: str,
-                           lang: str = None) -> (AudioData, dict, List[Tuple[str, float]]):
+    def _get_stt_coalesced(self, wav_file: str, lang: str = None,
+                           deadline: Optional[float] = None) -> \
+            (AudioData, dict, List[Tuple[str, float]]):
         """
-        Performs STT and audio processing on the specified wav_file
+        Get STT for the specified wav_file. If `coalesce_requests` is enabled,
+        a request for the same audio and language as one already in progress
+        waits for and shares that result instead of repeating the work.
         :param wav_file: wav audio file to process
         :param lang: language of passed audio
+        :param deadline: seconds the request may take to complete
+        :return: (AudioData of object, extracted context, transcriptions)
+        """
+        if not self.config['listener'].get('coalesce_requests'):
+            return self._get_stt_admitted(wav_file, lang, deadline)
+        lang = lang or self.config.get('lang')
+        key = f"{lang}:{hash_file(wav_file)}"
+        (audio, audio_context, transcriptions), shared = \
+            self._coalescer.run(key, lambda: self._get_stt_admitted(
+                wav_file, lang, deadline))
+        # Each request gets its own copy of the shared context to update
+        audio_context = deepcopy(audio_context)
+        if shared:
+            LOG.info(f"Shared in-flight STT result for {wav_file}")
+            audio_context["coalesced"] = True
+            self.bus.emit(Message("neon.metric",
+                                  {"name": "stt_coalesced",
+                                   "duration": audio_context['timing']
+                                   ['get_stt']}))
+        return audio, audio_context, list(transcriptions)
+
+    def _get_stt_admitted(self, wav_file: str, lang: str = None,
+                          deadline: Optional[float] = None) -> \
+            (AudioData, dict, List[Tuple[str, float]]):
+        """
+        Get STT for the specified wav_file if admission control estimates it
+        can be completed within `deadline`, else raise an `OverloadError`.
+        :param wav_file: wav audio file to process
+        :param lang: language of passed audio
+        :param deadline: seconds the request may take to complete
+        :return: (AudioData of object, extracted context, transcriptions)
+        """
+        if not self._admission:
+            return self._get_stt_from_file(wav_file, lang, deadline)
+        ticket = self._admission.admit(get_audio_duration(wav_file), deadline)
+        inference_time = None
+        try:
+            result = self._get_stt_from_file(wav_file, lang, deadline)
+            inference_time = result[1]['timing'].get('inference')
+            return result
+        finally:
+            ticket.complete(inference_time)
+
+    def _get_stt_from_file(self, wav_file: str, lang: str = None,
+                           deadline: Optional[float] = None) -> (AudioData, dict, List[Tuple[str, float]]):
+        """
+        Performs STT and audio processing on the specified wav_file. Audio
+        longer than the configured `window_seconds` is read and transcribed in
+        bounded windows split at silence; audio transformers receive the
+        first window only.
+        :param wav_file: wav audio file to process
+        :param lang: language of passed audio
+        :param deadline: max seconds to wait for a streaming STT engine
+        :return: (AudioData of object, extracted context, transcriptions)
+        """
+        # Hold the engine so an idle unload cannot release it mid-request
+        with self._use_api_stt() as api_stt:
+            return self._transcribe_file(api_stt, wav_file, lang, deadline)
+
+    def _transcribe_file(self, api_stt, wav_file: str, lang: str = None,
+                         deadline: Optional[float] = None) -> \
+            (AudioData, dict, List[Tuple[str, float]]):
+        """
+        Implements `_get_stt_from_file` with an API STT engine held in use
+        :param api_stt: API STT engine
+        :param wav_file: wav audio file to process
+        :param lang: language of passed audio
+        :param deadline: max seconds to wait for a streaming STT engine
         :return: (AudioData of object, extracted context, transcriptions)
         """
-        from neon_utils.file_utils import get_audio_file_stream
         _stopwatch = Stopwatch()
+        memory = AudioMemoryTracker()
+        limits = self._api_limits
         lang = lang or self.config.get('lang')
         desired_sample_rate = self.config['listener'].get('sample_rate', 16000)
         desired_sample_width = self.config['listener'].get('sample_width', 2)
-        segment = (AudioSegment.from_file(wav_file).set_channels(1)
-                   .set_frame_rate(desired_sample_rate)
-                   .set_sample_width(desired_sample_width))
-        LOG.debug(f"Audio fr={segment.frame_rate},sw={segment.sample_width},"
-                  f"fw={segment.frame_width},ch={segment.channels}")
-        audio_data = AudioData(segment.raw_data, segment.frame_rate,
-                               segment.sample_width)
-        if not self.api_stt:
+        duration = get_audio_duration(wav_file)
+        check_audio_duration(duration, limits["max_audio_seconds"])
+        if not api_stt:
             raise RuntimeError("api_stt not initialized."
                                " is `listener['enable_stt_api'] set to False?")
+        window_seconds = limits["window_seconds"]
+        if not duration or not window_seconds or duration <= window_seconds:
+            window_seconds = None
+        long_audio = self.config['listener'].get('long_audio') or {}
+        segmented = bool(long_audio.get('enabled') and duration and
+                         duration >= long_audio.get('min_seconds', 30))
+        segments = None
+        windows = iter_audio_windows(wav_file, desired_sample_rate,
+                                     desired_sample_width, window_seconds,
+                                     limits["mmap_files"])
+        if window_seconds and not segmented:
+            windows = split_windows_at_silence(
+                windows, desired_sample_rate, desired_sample_width,
+                limits["window_search_seconds"])
+        conditioning_config = self.config['listener'].get('conditioning') or {}
+        conditioning = None
+        if conditioning_config.get('enabled') and not window_seconds and \
+                not segmented:
+            windows, conditioning = self._condition_audio(
+                windows, desired_sample_rate, desired_sample_width,
+                conditioning_config)
+        # Only the first window is retained (for audio transformers)
+        audio_data = None
+        # Time spent waiting for the streaming engine is not inference time
+        lock_wait = 0.0
+        ran_stt = True
         with _stopwatch:
-            if hasattr(self.api_stt, 'stream_start'):
-                audio_stream = get_audio_file_stream(wav_file, desired_sample_rate)
-                if self.lock.acquire(True, 30):
-                    LOG.info(f"Starting STT processing (lang={lang}): {wav_file}")
-                    self.api_stt.stream_start(lang)
-                    while True:
-                        try:
-                            data = audio_stream.read(1024)
-                            self.api_stt.stream_data(data)
-                        except EOFError:
-                            break
-                    transcriptions = self.api_stt.transcribe(None, None)
-                    self.lock.release()
+            if conditioning and conditioning["silent"]:
+                LOG.info(f"No speech detected, skipping STT: {wav_file}")
+                transcriptions = []
+                ran_stt = False
+            elif segmented:
+                transcriptions, segments, audio_data = \
+                    self._transcribe_segments(windows, lang, memory)
+            elif hasattr(api_stt, 'stream_start'):
+                timeout = 30 if deadline is None else max(deadline, 0)
+                lock_start = time()
+                locked = self.lock.acquire(True, timeout)
+                lock_wait = time() - lock_start
+                if locked:
+                    try:
+                        LOG.info(f"Starting STT processing (lang={lang}): "
+                                 f"{wav_file}")
+                        api_stt.stream_start(lang)
+                        for window in windows:
+                            memory.add(len(window))
+                            if audio_data is None:
+                                audio_data = AudioData(window,
+                                                       desired_sample_rate,
+                                                       desired_sample_width)
+                            else:
+                                memory.release(len(window))
+                            for i in range(0, len(window), 1024):
+                                api_stt.stream_data(window[i:i + 1024])
+                            del window
+                        transcriptions = api_stt.transcribe(None, None)
+                    finally:
+                        self.lock.release()
                 else:
                     LOG.error(f"Timed out acquiring lock, not processing: {wav_file}")
                     transcriptions = []
+                    ran_stt = False
             else:
-                transcriptions = self.api_stt.transcribe(audio_data, lang)
+                window_results = list()
+                for window in windows:
+                    memory.add(len(window))
+                    window_audio = AudioData(window, desired_sample_rate,
+                                             desired_sample_width)
+                    del window
+                    if self._cascade:
+                        result = self._cascade.transcribe(window_audio, lang)
+                    elif self._batcher:
+                        result = self._batcher.transcribe(window_audio, lang)
+                    else:
+                        result = api_stt.transcribe(window_audio, lang)
+                    if isinstance(result, str):
+                        LOG.error("Transcriptions is a str, no alternatives "
+                                  "provided")
+                        result = [(result, 1.0)]
+                    window_results.append(result)
+                    if audio_data is None:
+                        audio_data = window_audio
+                    else:
+                        memory.release(len(window_audio.frame_data))
+                    del window_audio
+                transcriptions = merge_window_transcriptions(window_results)
             if isinstance(transcriptions, str):
                 LOG.error("Transcriptions is a str, no alternatives provided")
                 transcriptions = [transcriptions]
 
             transcriptions = [(clean_quotes(t[0]), t[1]) for t in transcriptions]
 
+        if audio_data is None:
+            audio_data = AudioData(next(windows, b''), desired_sample_rate,
+                                   desired_sample_width)
+            memory.add(len(audio_data.frame_data))
+        windows.close()
+        LOG.debug(f"Audio duration={duration},windowed={bool(window_seconds)}")
         get_stt = float(_stopwatch.time)
         with _stopwatch:
             audio, audio_context = self.transformers.transform(audio_data)
         audio_context["timing"] = {"get_stt": get_stt,
                                    "transform_audio": _stopwatch.time}
+        if ran_stt:
+            audio_context["timing"]["inference"] = get_stt - lock_wait
+        self._record_latency("get_stt", get_stt)
+        self._record_latency("transform_audio", _stopwatch.time)
+        audio_context["memory"] = memory.report()
+        if segments is not None:
+            audio_context["segments"] = segments
+        if conditioning is not None:
+            audio_context["conditioning"] = conditioning
         LOG.info(f"Transcribed: {transcriptions}")
         return audio, audio_context, transcriptions
 
+    def _condition_audio(self, windows: Iterator[bytes], sample_rate: int,
+                         sample_width: int, config: dict) -> \
+            (Iterator[bytes], dict):
+        """
+        Detect silent input and trim leading and trailing silence from audio
+        before STT.
+        :param windows: iterator yielding the complete audio as one window
+        :param sample_rate: audio sample rate
+        :param sample_width: audio sample width in bytes
+        :param config: `listener.conditioning` configuration
+        :returns: (iterator yielding conditioned audio, conditioning report)
+        """
+        audio = b''.join(windows)
+        windows.close()
+        with self._condition_vad_lock:
+            if config.get('use_vad') and not self._condition_vad:
+                from ovos_plugin_manager.vad import OVOSVADFactory
+                self._condition_vad = OVOSVADFactory.create(self.config)
+            bounds = find_speech_bounds(
+                audio, sample_rate, sample_width,
+                threshold_db=config.get('threshold_db', -45.0),
+                margin_seconds=config.get('margin_seconds', 0.2),
+                frame_seconds=config.get('frame_seconds', 0.02),
+                vad=self._condition_vad if config.get('use_vad') else None)
+        bytes_per_second = sample_rate * sample_width
+        original = len(audio) / bytes_per_second
+        if bounds:
+            audio = audio[bounds[0]:bounds[1]]
+            trimmed = original - len(audio) / bytes_per_second
+        else:
+            # Silent audio skips STT but is still passed to transformers
+            trimmed = original
+        LOG.debug(f"Trimmed {trimmed}s of silence (silent={not bounds})")
+
+        def _conditioned():
+            yield audio
+
+        return _conditioned(), {"original_seconds": round(original, 3),
+                                "trimmed_seconds": round(trimmed, 3),
+                                "silent": bounds is None}
+
+    def _transcribe_segments(self, windows: Iterator[bytes], lang: str,
+                             memory: AudioMemoryTracker) -> \
+            (List[Tuple[str, float]], List[dict], Optional[AudioData]):
+        """
+        Split audio into segments at silences using the configured VAD plugin
+        and transcribe segments concurrently with a pool of STT engines.
+        :param windows: iterator of PCM audio windows
+        :param lang: language of audio
+        :param memory: tracker for audio held by this request
+        :returns: (stitched transcriptions, per-segment results, first segment)
+        """
+        config = self.config['listener'].get('long_audio') or {}
+        sample_rate = self.config['listener'].get('sample_rate', 16000)
+        sample_width = self.config['listener'].get('sample_width', 2)
+        with self._segment_lock:
+            if not self._segment_pool:
+                from concurrent.futures import ThreadPoolExecutor
+                from ovos_plugin_manager.vad import OVOSVADFactory
+                workers = config.get('workers', 2)
+                self._segment_vad = OVOSVADFactory.create(self.config)
+                self._segment_pool = STTEnginePool(
+                    lambda: STTFactory.create(config=self.config), workers)
+                self._segment_executor = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="stt_segment")
+        max_pending = 2 * self._segment_pool.size
+        first_audio = None
+        pending = list()
+
+        def _submit(segment):
+            nonlocal first_audio
+            audio = AudioData(segment.audio, sample_rate, sample_width)
+            if first_audio is None:
+                first_audio = audio
+            if not segment.has_speech:
+                LOG.debug(f"Skipping silent segment at {segment.start}s")
+                return
+            if len([f for _, f in pending if not f.done()]) >= max_pending:
+                # Bound buffered audio by waiting on the oldest segment
+                next(f for _, f in pending if not f.done()).result()
+            pending.append((segment, self._segment_executor.submit(
+                self._segment_pool.transcribe, audio, lang)))
+
+        # The VAD plugin is stateful, so segmentation is serialized
+        with self._segment_vad_lock:
+            segmenter = SilenceSegmenter(
+                self._segment_vad, sample_rate, sample_width,
+                max_segment_seconds=config.get('max_segment_seconds', 20),
+                min_silence_seconds=config.get('min_silence_seconds', 0.3))
+            for window in windows:
+                memory.add(len(window))
+                for segment in segmenter.feed(window):
+                    _submit(segment)
+                memory.release(len(window))
+            final = segmenter.flush()
+            if final:
+                _submit(final)
+
+        segments = list()
+        for segment, future in pending:
+            transcriptions = [(clean_quotes(t[0]), t[1])
+                              for t in future.result()]
+            segments.append({"start": round(segment.start, 3),
+                             "end": round(segment.end, 3),
+                             "transcripts_with_conf": transcriptions})
+        LOG.info(f"Transcribed {len(segments)} segments")
+        transcriptions = merge_window_transcriptions(
+            [s["transcripts_with_conf"] for s in segments])
+        return transcriptions, segments, first_audio
+
     def _emit_utterance_to_skills(self, message_to_emit: Message) -> bool:
         """
         Emits a message containing a user utterance to skills for intent
@@ -603,7 +1788,9 @@ class NeonSpeechClient(OVOSDinkumVoiceService):
         """
         # Emit single intent request
         ident = message_to_emit.context['ident']
+        sent = time()
         resp = self.bus.wait_for_response(message_to_emit, timeout=10)
+        self._record_latency("skills_ack", time() - sent)
         if not resp:
             LOG.error(f"Skills didn't handle {ident}!")
             return False
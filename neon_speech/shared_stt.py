@@ -0,0 +1,120 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from contextlib import contextmanager
+from threading import Condition
+from typing import Optional
+
+from ovos_plugin_manager.templates.stt import STT
+
+
+class PriorityLock:
+    """
+    A non-reentrant lock where high priority waiters are always granted the
+    lock before low priority waiters.
+    """
+
+    def __init__(self):
+        self._cond = Condition()
+        self._locked = False
+        self._high_waiting = 0
+
+    def acquire(self, high_priority: bool = False,
+                timeout: Optional[float] = None) -> bool:
+        """
+        Acquire the lock
+        :param high_priority: if True, take precedence over low priority
+            waiters
+        :param timeout: max seconds to wait (None to wait indefinitely)
+        :returns: True if the lock was acquired
+        """
+        with self._cond:
+            if high_priority:
+                self._high_waiting += 1
+            try:
+                acquired = self._cond.wait_for(
+                    lambda: not self._locked and
+                    (high_priority or not self._high_waiting), timeout)
+                if acquired:
+                    self._locked = True
+                return acquired
+            finally:
+                if high_priority:
+                    self._high_waiting -= 1
+                    # Low priority waiters may proceed if no others remain
+                    self._cond.notify_all()
+
+    def release(self):
+        with self._cond:
+            self._locked = False
+            self._cond.notify_all()
+
+    @contextmanager
+    def hold(self, high_priority: bool = False):
+        self.acquire(high_priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class SharedSTT:
+    """
+    A view of an STT engine that is shared by multiple callers. Inference is
+    serialized with a `PriorityLock` so one model can serve both the voice
+    loop (high priority) and API requests (low priority); all other
+    attributes are read from the wrapped engine.
+    """
+
+    def __init__(self, engine: STT, lock: PriorityLock,
+                 high_priority: bool = False):
+        """
+        :param engine: STT engine to share
+        :param lock: lock shared by all views of `engine`
+        :param high_priority: if True, this view takes precedence
+        """
+        self.engine = engine
+        self.lock = lock
+        self.high_priority = high_priority
+
+    def __getattr__(self, item):
+        attr = getattr(self.engine, item)
+        if item == "transcribe_batch":
+            def transcribe_batch(*args, **kwargs):
+                with self.lock.hold(self.high_priority):
+                    return attr(*args, **kwargs)
+            return transcribe_batch
+        return attr
+
+    def execute(self, audio, language: Optional[str] = None):
+        with self.lock.hold(self.high_priority):
+            return self.engine.execute(audio, language)
+
+    def transcribe(self, audio, lang: Optional[str] = None):
+        with self.lock.hold(self.high_priority):
+            return self.engine.transcribe(audio, lang)
@@ -0,0 +1,118 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from collections import deque
+from threading import Lock
+from time import time
+from typing import Dict, Optional
+
+from neon_speech.scheduler import percentile
+
+
+class SLOMonitor:
+    """
+    Evaluates per-stage latency objectives over a sliding time window. Each
+    objective requires the given percentile of samples to be at or below a
+    threshold; the burn rate is the fraction of samples over the threshold
+    divided by the error budget (100 - percentile)%. A burn rate above 1
+    means the error budget is being spent faster than the objective allows.
+    """
+
+    def __init__(self, objectives: Dict[str, dict], window_seconds: float = 300,
+                 min_samples: int = 20, cooldown: float = 60,
+                 max_samples: int = 10000):
+        """
+        :param objectives: dict of stage name to
+            {"threshold": seconds, "percentile": 0-100}
+        :param window_seconds: age of the oldest sample evaluated
+        :param min_samples: samples required before a violation is reported
+        :param cooldown: minimum seconds between violations for one stage
+        :param max_samples: maximum samples retained per stage
+        """
+        self.objectives = {stage: {"threshold": float(spec["threshold"]),
+                                   "percentile": spec.get("percentile", 95)}
+                           for stage, spec in objectives.items()}
+        self.window_seconds = window_seconds
+        self.min_samples = min_samples
+        self.cooldown = cooldown
+        self._samples = {stage: deque(maxlen=max_samples)
+                         for stage in self.objectives}
+        self._last_violation = dict()
+        self._lock = Lock()
+
+    def _evaluate(self, stage: str, now: float) -> dict:
+        samples = self._samples[stage]
+        while samples and now - samples[0][0] > self.window_seconds:
+            samples.popleft()
+        objective = self.objectives[stage]
+        values = [s[1] for s in samples]
+        over = len([v for v in values if v > objective["threshold"]])
+        budget = (100 - objective["percentile"]) / 100
+        bad_fraction = over / len(values) if values else 0.0
+        return {"stage": stage,
+                "samples": len(values),
+                "percentile": objective["percentile"],
+                "threshold": objective["threshold"],
+                "value": percentile(values, objective["percentile"]),
+                "burn_rate": bad_fraction / budget if budget else
+                float(over > 0)}
+
+    def record(self, stage: str, duration: float,
+               now: Optional[float] = None) -> Optional[dict]:
+        """
+        Record a latency sample and check its stage objective
+        :param stage: name of the measured stage
+        :param duration: measured latency in seconds
+        :param now: sample timestamp (defaults to current time)
+        :returns: evaluation dict if the objective is violated and a
+            violation has not been reported within the cooldown, else None
+        """
+        if stage not in self.objectives or duration is None:
+            return None
+        now = now or time()
+        with self._lock:
+            self._samples[stage].append((now, duration))
+            result = self._evaluate(stage, now)
+            if result["samples"] < self.min_samples or \
+                    result["value"] <= result["threshold"]:
+                return None
+            if now - self._last_violation.get(stage, 0) < self.cooldown:
+                return None
+            self._last_violation[stage] = now
+            return result
+
+    def get_burn_rates(self, now: Optional[float] = None) -> Dict[str, dict]:
+        """
+        Get the current evaluation of every objective
+        :param now: evaluation time (defaults to current time)
+        :returns: dict of stage name to evaluation dict
+        """
+        now = now or time()
+        with self._lock:
+            return {stage: self._evaluate(stage, now)
+                    for stage in self.objectives}
@@ -0,0 +1,152 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from queue import Queue, Empty
+from threading import Lock
+from time import time
+from typing import Callable, List, Tuple
+
+from ovos_plugin_manager.templates.stt import STT
+from ovos_utils.log import LOG
+from speech_recognition import AudioData
+
+
+def transcribe_audio(engine: STT, audio: AudioData, lang: str,
+                     chunk_size: int = 1024) -> List[Tuple[str, float]]:
+    """
+    Transcribe audio with either a streaming or non-streaming STT engine
+    :param engine: STT plugin instance
+    :param audio: AudioData object to transcribe
+    :param lang: language of `audio`
+    :param chunk_size: number of bytes per chunk passed to streaming engines
+    :returns: list of (transcription, confidence)
+    """
+    if hasattr(engine, 'stream_start'):
+        engine.stream_start(lang)
+        data = audio.frame_data
+        for i in range(0, len(data), chunk_size):
+            engine.stream_data(data[i:i + chunk_size])
+        transcriptions = engine.transcribe(None, None)
+    else:
+        transcriptions = engine.transcribe(audio, lang)
+    if isinstance(transcriptions, str):
+        LOG.error("Transcriptions is a str, no alternatives provided")
+        transcriptions = [(transcriptions, 1.0)]
+    return transcriptions or []
+
+
+def warmup_stt(engine: STT, lang: str, seconds: float = 1.0,
+               sample_rate: int = 16000, sample_width: int = 2) -> float:
+    """
+    Run a warmup inference on silent audio so lazy initialization, kernel
+    compilation, and allocations happen before the first real request.
+    :param engine: STT plugin instance
+    :param lang: language to warm up
+    :param seconds: duration of warmup audio
+    :param sample_rate: sample rate of warmup audio
+    :param sample_width: sample width of warmup audio
+    :returns: warmup duration in seconds
+    """
+    audio = AudioData(bytes(int(seconds * sample_rate) * sample_width),
+                      sample_rate, sample_width)
+    start = time()
+    try:
+        transcribe_audio(engine, audio, lang)
+    except Exception as e:
+        LOG.error(f"STT warmup failed: {e}")
+    return time() - start
+
+
+class STTEnginePool:
+    """
+    A bounded pool of STT engine instances. Engines are created on demand up
+    to `size` and each engine is used by at most one caller at a time.
+    """
+
+    def __init__(self, factory: Callable[[], STT], size: int = 2):
+        self._factory = factory
+        self.size = max(size, 1)
+        self._idle = Queue()
+        self._created = 0
+        self._lock = Lock()
+
+    def acquire(self, timeout: float = 60) -> STT:
+        """
+        Get an engine for exclusive use; it must be returned with `release`
+        :param timeout: seconds to wait for an engine to become available
+        :returns: STT engine
+        """
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                try:
+                    return self._factory()
+                except Exception:
+                    self._created -= 1
+                    raise
+        return self._idle.get(timeout=timeout)
+
+    def transcribe(self, audio: AudioData, lang: str,
+                   timeout: float = 60) -> List[Tuple[str, float]]:
+        """
+        Transcribe audio with the next available engine
+        :param audio: AudioData object to transcribe
+        :param lang: language of `audio`
+        :param timeout: seconds to wait for an engine to become available
+        :returns: list of (transcription, confidence)
+        """
+        engine = self.acquire(timeout)
+        try:
+            return transcribe_audio(engine, audio, lang)
+        finally:
+            self.release(engine)
+
+    def release(self, engine: STT):
+        """
+        Return an engine obtained from `acquire` to the pool
+        :param engine: STT engine to return
+        """
+        self._idle.put(engine)
+
+    def shutdown(self):
+        """
+        Release all idle engines
+        """
+        while True:
+            try:
+                engine = self._idle.get_nowait()
+            except Empty:
+                break
+            if hasattr(engine, "shutdown"):
+                engine.shutdown()
+            with self._lock:
+                self._created -= 1
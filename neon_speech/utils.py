@@ -26,11 +26,17 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import json
+import os
+import sys
+
+from hashlib import sha256
 from tempfile import mkstemp
 from ovos_utils.log import LOG, deprecated
+from ovos_utils.xdg_utils import xdg_cache_home
 from neon_utils.packaging_utils import get_package_dependencies
 from ovos_config.config import Configuration
-from typing import List, Union
+from typing import List, Optional, Union
 
 
 def patch_config(config: dict = None):
@@ -68,6 +74,84 @@ def build_extra_dependency_list(config: Union[dict, Configuration], additional:
     return dependencies
 
 
+def get_dependency_fingerprint(dependencies: List[str]) -> str:
+    """
+    Get a fingerprint of a dependency list and the state of installed
+    packages. Installing or removing packages changes the modification time
+    of the directory they are installed in, which changes the fingerprint.
+    :param dependencies: list of requirement specs
+    :returns: hex digest identifying the dependencies and environment
+    """
+    state = [sys.version] + sorted(set(d.strip() for d in dependencies))
+    for path in sys.path:
+        if path and os.path.isdir(path):
+            state.append(f"{path}:{os.stat(path).st_mtime_ns}")
+    return sha256("\n".join(state).encode()).hexdigest()
+
+
+def get_unsatisfied_requirements(dependencies: List[str]) -> List[str]:
+    """
+    Check requirement specs against installed distributions without calling
+    pip. Specs with extras or a URL are not resolved here and are always
+    returned so that pip can check them.
+    :param dependencies: list of requirement specs
+    :returns: list of specs that are not satisfied or could not be checked
+    """
+    from importlib.metadata import PackageNotFoundError, version
+    from packaging.requirements import InvalidRequirement, Requirement
+    unsatisfied = list()
+    for spec in dependencies:
+        try:
+            requirement = Requirement(spec.strip())
+        except InvalidRequirement:
+            unsatisfied.append(spec)
+            continue
+        if requirement.marker and not requirement.marker.evaluate():
+            continue
+        if requirement.extras or requirement.url:
+            unsatisfied.append(spec)
+            continue
+        try:
+            installed = version(requirement.name)
+        except PackageNotFoundError:
+            unsatisfied.append(spec)
+            continue
+        if not requirement.specifier.contains(installed, prereleases=True):
+            unsatisfied.append(spec)
+    return unsatisfied
+
+
+def get_dependency_cache_path() -> str:
+    return os.path.join(xdg_cache_home(), "neon", "speech_dependencies.json")
+
+
+def read_dependency_fingerprint() -> Optional[str]:
+    """
+    Get the fingerprint of the last dependencies verified as installed
+    """
+    try:
+        with open(get_dependency_cache_path()) as f:
+            return json.load(f).get("fingerprint")
+    except (OSError, ValueError):
+        return None
+
+
+def write_dependency_fingerprint(fingerprint: str, dependencies: List[str]):
+    """
+    Record a fingerprint of dependencies verified as installed
+    :param fingerprint: fingerprint from `get_dependency_fingerprint`
+    :param dependencies: list of requirement specs
+    """
+    path = get_dependency_cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"fingerprint": fingerprint,
+                       "dependencies": dependencies}, f, indent=2)
+    except OSError as e:
+        LOG.warning(f"Unable to cache dependency fingerprint: {e}")
+
+
 @deprecated("Replaced by `neon_utils.packaging_utils.install_packages_from_pip`", "5.0.0")
 def install_stt_plugin(plugin: str) -> bool:
     """
@@ -87,11 +171,19 @@ def install_stt_plugin(plugin: str) -> bool:
     return returned == 0
 
 
-def init_stt_plugin(plugin: str):
+def init_stt_plugin(plugin: str, cache_config: Optional[dict] = None):
     """
     Initialize a specified plugin. Useful for doing one-time initialization
-    before deployment
+    before deployment. If `stt.model_cache` is enabled, downloaded models and
+    any runtime state the plugin can export are written to a versioned model
+    cache used at service startup.
+    :param plugin: STT plugin entrypoint name
+    :param cache_config: `stt.model_cache` configuration
     """
+    if cache_config and cache_config.get("enabled"):
+        from neon_speech.model_cache import build_model_cache
+        build_model_cache(plugin, cache_config)
+        return
     from ovos_plugin_manager.stt import load_stt_plugin
     plug = load_stt_plugin(plugin)
     if plug:
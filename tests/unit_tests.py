@@ -51,6 +51,76 @@ os.environ["OVOS_CONFIG_FILENAME"] = "neon.yaml"
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
 
+TEST_AUDIO = join(dirname(__file__), "audio_files", "stop.wav")
+
+
+class _MockServiceConfig(dict):
+    bus = None
+
+
+def get_mock_service(test: unittest.TestCase, listener_config: dict,
+                     api_stt, primary_stt=None):
+    """
+    Get a `NeonSpeechClient` with a mocked voice loop and STT plugins and its
+    API handlers registered on a `FakeBus`
+    :param test: test case to register cleanup with
+    :param listener_config: `listener` configuration to test
+    :param api_stt: engine returned for the API STT
+    :param primary_stt: engine returned for any other STT config
+    :returns: initialized NeonSpeechClient
+    """
+    from unittest.mock import Mock
+    from neon_speech.service import NeonSpeechClient
+    config = service_config = _MockServiceConfig(
+        {"lang": "en-us", "stt": {"module": "test"},
+         "listener": {"plugin_index": False, **listener_config}})
+    bus = FakeBus()
+    bus.connected_event = Event()
+    bus.connected_event.set()
+
+    def _init(client, **_):
+        Thread.__init__(client)
+        client.config = config
+        client.bus = bus
+        client.stt = Mock()
+        client.transformers = Mock()
+        client.transformers.transform.side_effect = lambda a: (a, {})
+        client.status = Mock()
+        client.status.state.name = "READY"
+        client.status.check_ready.return_value = True
+
+    with patch("neon_speech.service.OVOSDinkumVoiceService.__init__",
+               _init), \
+            patch("neon_speech.service.Configuration",
+                  return_value=config), \
+            patch("neon_speech.service.STTFactory") as factory:
+        # Engines created with another config are cascade primaries
+        factory.create.side_effect = \
+            lambda config: api_stt if config is service_config \
+            else primary_stt
+        service = NeonSpeechClient(bus=bus)
+    service.stop = Mock()
+    test.addCleanup(service.shutdown)
+    with patch("neon_speech.service.OVOSDinkumVoiceService."
+               "register_event_handlers"):
+        service.register_event_handlers()
+    return service
+
+
+def request_stt(service, ident: str, audio_file: str = TEST_AUDIO,
+                msg_type: str = "neon.get_stt") -> Message:
+    """
+    Send an API request to a service and wait for the reply
+    :param service: service returned by `get_mock_service`
+    :param ident: request ident the reply is sent to
+    :param audio_file: audio to transcribe
+    :param msg_type: `neon.get_stt` or `neon.audio_input`
+    :returns: reply Message, or None if no reply was received
+    """
+    return service.bus.wait_for_response(
+        Message(msg_type, {"audio_file": audio_file}, {"ident": ident}),
+        ident, 5)
+
 
 class UtilTests(unittest.TestCase):
     @classmethod
@@ -185,6 +255,1772 @@ class UtilTests(unittest.TestCase):
         self.assertEqual(non_streaming.config['url'], "https://0.0.0.0:8080/stt")
 
 
+class AudioUtilsTests(unittest.TestCase):
+    test_file = join(dirname(__file__), "audio_files", "stop.wav")
+
+    def test_get_decoded_size(self):
+        from base64 import b64encode
+        from neon_speech.audio_utils import get_decoded_size
+        for raw in (b"", b"a", b"ab", b"abc", b"abcd" * 100):
+            self.assertEqual(get_decoded_size(b64encode(raw).decode()),
+                             len(raw))
+
+    def test_check_limits(self):
+        from neon_speech.audio_utils import AudioLimitError, \
+            check_payload_size, check_audio_duration
+        check_payload_size(100, None)
+        check_payload_size(100, 100)
+        with self.assertRaises(AudioLimitError):
+            check_payload_size(101, 100)
+        check_audio_duration(None, 10)
+        check_audio_duration(20, 0)
+        with self.assertRaises(AudioLimitError):
+            check_audio_duration(10.5, 10)
+
+    def test_get_audio_duration(self):
+        from neon_speech.audio_utils import get_audio_duration
+        self.assertAlmostEqual(get_audio_duration(self.test_file), 1.216,
+                               places=2)
+
+    def test_iter_audio_windows(self):
+        from neon_speech.audio_utils import iter_audio_windows
+        full = list(iter_audio_windows(self.test_file, 16000, 2))
+        self.assertEqual(len(full), 1)
+        windows = list(iter_audio_windows(self.test_file, 16000, 2, 0.5))
+        self.assertEqual(len(windows), 3)
+        self.assertTrue(all(len(w) <= 16000 for w in windows))
+        self.assertEqual(b"".join(windows), full[0])
+        resampled = list(iter_audio_windows(self.test_file, 8000, 2))
+        self.assertAlmostEqual(len(resampled[0]), len(full[0]) / 2, delta=2)
+
+        mapped = list(iter_audio_windows(self.test_file, 16000, 2, 0.5, True))
+        self.assertTrue(all(isinstance(w, memoryview) for w in mapped))
+        self.assertEqual(b"".join(mapped), full[0])
+        # Files needing conversion are not mapped
+        resampled = list(iter_audio_windows(self.test_file, 8000, 2,
+                                            use_mmap=True))
+        self.assertIsInstance(resampled[0], bytes)
+
+    def test_mapped_wav(self):
+        from neon_speech.audio_utils import MappedWav
+        mapped = MappedWav(self.test_file)
+        self.assertTrue(mapped.is_compatible(16000, 2))
+        self.assertFalse(mapped.is_compatible(8000, 2))
+        self.assertEqual(len(mapped.pcm) % 2, 0)
+        with self.assertRaises(ValueError):
+            MappedWav(__file__)
+
+    def test_merge_window_transcriptions(self):
+        from neon_speech.audio_utils import merge_window_transcriptions
+        single = [("one", 0.9), ("won", 0.5)]
+        self.assertEqual(merge_window_transcriptions([single]), single)
+        merged = merge_window_transcriptions([single, [("two", 0.7)],
+                                              [("", 0.0)]])
+        self.assertEqual(merged[0][0], "one two")
+        self.assertAlmostEqual(merged[0][1], 0.8)
+        # Alternatives are kept
+        self.assertEqual(len(merged), 2)
+        self.assertEqual(merged[1][0], "won two")
+        self.assertAlmostEqual(merged[1][1], 0.6)
+        self.assertEqual(merge_window_transcriptions([]), [])
+
+    def test_split_windows_at_silence(self):
+        import struct
+        from neon_speech.audio_utils import split_windows_at_silence
+        tone = struct.pack('<h', 8000) * 80 + struct.pack('<h', -8000) * 80
+        # 1s windows of speech with a pause 0.2s before each boundary
+        window = tone * 70 + b'\x00\x00' * 1600 + tone * 20
+        windows = list(split_windows_at_silence(iter([window] * 3), 16000, 2,
+                                                search_seconds=0.5))
+        self.assertEqual(b''.join(windows), window * 3)
+        self.assertEqual(len(windows), 3)
+        pause_start = len(tone) * 70
+        for idx in range(2):
+            split = sum(len(w) for w in windows[:idx + 1]) - idx * len(window)
+            self.assertGreater(split, pause_start)
+            self.assertLess(split, pause_start + 3200)
+        self.assertEqual(list(split_windows_at_silence(iter([]), 16000, 2)),
+                         [])
+
+    def test_audio_memory_tracker(self):
+        from neon_speech.audio_utils import AudioMemoryTracker
+        tracker = AudioMemoryTracker()
+        tracker.add(100)
+        tracker.add(50)
+        tracker.release(100)
+        tracker.add(20)
+        report = tracker.report()
+        self.assertEqual(report["peak_audio_bytes"], 150)
+        self.assertGreater(report["peak_rss_bytes"], 0)
+        self.assertGreaterEqual(report["peak_rss_increase_bytes"], 0)
+        self.assertEqual(tracker.current, 70)
+
+    def test_find_speech_bounds(self):
+        import struct
+        from neon_speech.audio_utils import find_speech_bounds, \
+            get_frame_levels
+        silence = b'\x00\x00' * 16000
+        tone = struct.pack('<h', 8000) * 1600 + \
+            struct.pack('<h', -8000) * 1600
+        levels = get_frame_levels(silence + tone, 2, 320)
+        self.assertEqual(len(levels), 60)
+        self.assertLess(levels[0], -100)
+        self.assertGreater(levels[-1], -20)
+
+        self.assertIsNone(find_speech_bounds(silence, 16000, 2))
+        self.assertIsNone(find_speech_bounds(b'', 16000, 2))
+        audio = silence + tone + silence
+        start, end = find_speech_bounds(audio, 16000, 2, margin_seconds=0.1)
+        self.assertEqual(start, len(silence) - 3200)
+        self.assertEqual(end, len(silence) + len(tone) + 3200)
+        self.assertEqual(find_speech_bounds(tone, 16000, 2),
+                         (0, len(tone)))
+
+        from unittest.mock import Mock
+        vad = Mock()
+        vad.is_silence.side_effect = lambda chunk: not any(chunk)
+        self.assertEqual(find_speech_bounds(audio, 16000, 2, vad=vad,
+                                            margin_seconds=0),
+                         (len(silence), len(silence) + len(tone)))
+
+    def test_service_conditioning(self):
+        import wave
+        from tempfile import mkstemp
+        from unittest.mock import Mock
+        api_stt = Mock(spec=["transcribe"])
+        api_stt.transcribe.return_value = [("stop", 0.9)]
+        service = get_mock_service(self, {"conditioning": {"enabled": True}},
+                                   api_stt)
+        _, silent_file = mkstemp(suffix=".wav")
+        self.addCleanup(os.remove, silent_file)
+        with wave.open(silent_file, 'wb') as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(16000)
+            f.writeframes(bytes(32000))
+
+        # Silent audio skips STT
+        resp = request_stt(service, "silent", silent_file)
+        self.assertEqual(resp.data["transcripts"], [])
+        self.assertTrue(resp.data["conditioning"]["silent"])
+        self.assertEqual(resp.data["conditioning"]["trimmed_seconds"], 1.0)
+        api_stt.transcribe.assert_not_called()
+
+        # Speech is transcribed
+        resp = request_stt(service, "speech")
+        self.assertEqual(resp.data["transcripts"], ["stop"])
+        self.assertFalse(resp.data["conditioning"]["silent"])
+        api_stt.transcribe.assert_called_once()
+        audio = api_stt.transcribe.call_args[0][0]
+        self.assertAlmostEqual(len(audio.frame_data) / 32000,
+                               resp.data["conditioning"]["original_seconds"] -
+                               resp.data["conditioning"]["trimmed_seconds"],
+                               places=2)
+
+        # A conditioning VAD is not shared with long audio segmentation
+        vad = Mock()
+        vad.is_silence.side_effect = lambda chunk: not any(chunk)
+        service = get_mock_service(self, {"conditioning": {"enabled": True,
+                                                           "use_vad": True}},
+                                   api_stt)
+        with patch("ovos_plugin_manager.vad.OVOSVADFactory.create",
+                   return_value=vad):
+            resp = request_stt(service, "vad")
+        self.assertEqual(resp.data["transcripts"], ["stop"])
+        vad.is_silence.assert_called()
+        self.assertIs(service._condition_vad, vad)
+        self.assertIsNone(service._segment_vad)
+
+
+class SegmentationTests(unittest.TestCase):
+    class _EnergyVAD:
+        frame_duration_ms = 10
+
+        def is_silence(self, chunk):
+            return not any(chunk)
+
+    def test_silence_segmenter(self):
+        from neon_speech.segmentation import SilenceSegmenter
+        speech = b"\x01\x00" * 16000
+        silence = b"\x00\x00" * 8000
+        segmenter = SilenceSegmenter(self._EnergyVAD(), 16000, 2,
+                                     max_segment_seconds=5,
+                                     min_silence_seconds=0.3,
+                                     min_segment_seconds=0.5)
+        segments = segmenter.feed(speech + silence + speech)
+        segments += segmenter.feed(silence + silence)
+        final = segmenter.flush()
+        self.assertEqual(len(segments), 1)
+        self.assertAlmostEqual(segments[0].start, 0.0)
+        self.assertAlmostEqual(segments[0].end, 1.25)
+        self.assertTrue(segments[0].has_speech)
+        self.assertAlmostEqual(final.start, 1.25)
+        self.assertAlmostEqual(final.end, 3.5)
+        self.assertEqual(b"".join((segments[0].audio, final.audio)),
+                         speech + silence + speech + silence + silence)
+
+        # Segments are bounded without any silence
+        segmenter = SilenceSegmenter(self._EnergyVAD(), 16000, 2,
+                                     max_segment_seconds=0.5)
+        segments = segmenter.feed(speech)
+        self.assertEqual(len(segments), 2)
+        self.assertIsNone(segmenter.flush())
+
+    def test_stt_engine_pool(self):
+        from threading import Barrier
+        from neon_speech.stt_pool import STTEnginePool
+        created = list()
+        barrier = Barrier(2, timeout=5)
+
+        class _Engine:
+            def __init__(self):
+                created.append(self)
+
+            def transcribe(self, audio, lang):
+                barrier.wait()
+                return [(lang, 1.0)]
+
+        pool = STTEnginePool(_Engine, 2)
+        audio = AudioData(b"\x00\x00" * 160, 16000, 2)
+        results = list()
+        threads = [Thread(target=lambda: results.append(
+            pool.transcribe(audio, "en-us"))) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+        self.assertEqual(results, [[("en-us", 1.0)], [("en-us", 1.0)]])
+        self.assertEqual(len(created), 2)
+        barrier = Barrier(1)
+        pool.transcribe(audio, "en-us")
+        self.assertEqual(len(created), 2)
+        pool.shutdown()
+
+
+class SchedulerTests(unittest.TestCase):
+    def test_percentile(self):
+        from neon_speech.scheduler import percentile
+        self.assertIsNone(percentile([], 50))
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 100), 100)
+        self.assertEqual(percentile([3.0], 99), 3.0)
+
+    def test_priority_scheduler(self):
+        from neon_speech.scheduler import PriorityScheduler
+        scheduler = PriorityScheduler(workers=1, max_per_client=1)
+        started = Event()
+        blocker = Event()
+        done = Event()
+        order = list()
+        scheduler.submit(lambda: started.set() or blocker.wait(),
+                         "bulk", "batch")
+        self.assertTrue(started.wait(5))
+        for i in range(3):
+            scheduler.submit(lambda i=i: order.append(("batch", i)),
+                             "bulk", "batch")
+        for i in range(2):
+            scheduler.submit(lambda i=i: order.append(("other", i)),
+                             "bulk", "other")
+        scheduler.submit(lambda: order.append(("user", 0)),
+                         "interactive", "user")
+        scheduler.submit(lambda: order.append(("unknown", 0)), "invalid")
+        scheduler.submit(done.set, "bulk", "batch")
+        stats = scheduler.get_stats()
+        self.assertEqual(stats["interactive"]["queued"], 1)
+        self.assertEqual(stats["bulk"]["queued"], 7)
+        self.assertEqual(stats["running"], {"batch": 1})
+        blocker.set()
+        self.assertTrue(done.wait(5))
+        # Interactive first, then clients share the bulk class fairly
+        self.assertEqual(order, [("user", 0), ("batch", 0), ("other", 0),
+                                 ("unknown", 0), ("batch", 1), ("other", 1),
+                                 ("batch", 2)])
+        stats = scheduler.get_stats()
+        self.assertEqual(stats["interactive"]["count"], 1)
+        self.assertIsInstance(stats["bulk"]["p95_wait"], float)
+        scheduler.shutdown()
+
+
+class CoalescingTests(unittest.TestCase):
+    def test_hash_file(self):
+        from hashlib import sha256
+        from neon_speech.coalescing import hash_file
+        test_file = join(dirname(__file__), "audio_files", "stop.wav")
+        with open(test_file, 'rb') as f:
+            expected = sha256(f.read()).hexdigest()
+        self.assertEqual(hash_file(test_file, 1024), expected)
+
+    def test_in_flight_coalescer(self):
+        from neon_speech.coalescing import InFlightCoalescer
+        coalescer = InFlightCoalescer()
+        release = Event()
+        calls = list()
+        results = list()
+
+        def _compute():
+            calls.append(1)
+            release.wait(5)
+            return {"result": len(calls)}
+
+        threads = [Thread(target=lambda: results.append(
+            coalescer.run("key", _compute))) for _ in range(3)]
+        threads[0].start()
+        while not calls:
+            release.wait(0.01)
+        for t in threads[1:]:
+            t.start()
+        while coalescer.requests < 3:
+            release.wait(0.01)
+        release.set()
+        for t in threads:
+            t.join(5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([r[0] for r in results], [{"result": 1}] * 3)
+        self.assertEqual(sorted(r[1] for r in results), [False, True, True])
+        stats = coalescer.get_stats()
+        self.assertEqual(stats["coalesced"], 2)
+        self.assertGreater(stats["saved_seconds"], 0)
+
+        # Completed computations are not reused
+        self.assertEqual(coalescer.run("key", _compute),
+                         ({"result": 2}, False))
+
+        # Errors are raised to all waiting callers
+        with self.assertRaises(ValueError):
+            coalescer.run("error", lambda: int("error"))
+
+    def test_service_coalescing(self):
+        from unittest.mock import Mock
+        api_stt = Mock(spec=["transcribe"])
+        in_progress = Event()
+        finish = Event()
+
+        def _transcribe(audio, lang):
+            in_progress.set()
+            finish.wait(5)
+            return [("stop", 0.9)]
+        api_stt.transcribe.side_effect = _transcribe
+        service = get_mock_service(self, {"coalesce_requests": True},
+                                   api_stt)
+
+        responses = dict()
+        requests = [Thread(target=lambda i=i: responses.__setitem__(
+            i, request_stt(service, f"request{i}"))) for i in range(2)]
+        requests[0].start()
+        self.assertTrue(in_progress.wait(5))
+        requests[1].start()
+        Event().wait(0.1)
+        finish.set()
+        for request in requests:
+            request.join(5)
+        api_stt.transcribe.assert_called_once()
+        self.assertEqual([responses[i].data["transcripts"] for i in range(2)],
+                         [["stop"], ["stop"]])
+        self.assertEqual([responses[i].data.get("coalesced")
+                          for i in range(2)], [None, True])
+
+        resp = service.bus.wait_for_response(
+            Message("neon.speech.get_status"))
+        self.assertEqual(resp.data["coalescing"]["requests"], 2)
+        self.assertEqual(resp.data["coalescing"]["coalesced"], 1)
+
+
+class AsyncAPITests(unittest.TestCase):
+    def test_async_audio_input(self):
+        from neon_speech.async_api import AsyncSpeechAPI
+        bus = FakeBus()
+
+        latencies = list()
+
+        class _Service:
+            def __init__(self):
+                self.bus = bus
+
+            @staticmethod
+            def _record_latency(stage, duration):
+                latencies.append((stage, duration))
+
+            @staticmethod
+            def _transcribe_audio_input(message):
+                return Message("recognizer_loop:utterance",
+                               {"utterances": ["test"]},
+                               {"ident": message.context["ident"]}), \
+                    {"transcripts": ["test"]}
+
+        api = AsyncSpeechAPI(_Service(), workers=2, ack_timeout=1)
+
+        def _handle_utterance(message):
+            if message.context["ident"] != "no_ack":
+                bus.emit(message.response())
+
+        bus.on("recognizer_loop:utterance", _handle_utterance)
+        responses = dict()
+        received = Event()
+
+        def _handle_reply(message):
+            responses[message.msg_type] = message.data
+            if len(responses) == 2:
+                received.set()
+
+        bus.on("ack", _handle_reply)
+        bus.on("no_ack", _handle_reply)
+        api.handle_audio_input(Message("neon.audio_input", {},
+                                       {"ident": "no_ack"}))
+        api.handle_audio_input(Message("neon.audio_input", {},
+                                       {"ident": "ack"}))
+        self.assertTrue(received.wait(5))
+        self.assertEqual(responses["ack"], {"transcripts": ["test"],
+                                            "skills_recv": True})
+        self.assertEqual(responses["no_ack"], {"transcripts": ["test"],
+                                               "skills_recv": False})
+        # Skills acknowledgement latency is recorded for SLO monitoring
+        self.assertEqual([stage for stage, _ in latencies],
+                         ["skills_ack", "skills_ack"])
+        self.assertGreaterEqual(max(d for _, d in latencies), 1)
+        for _ in range(50):
+            if not api.in_flight:
+                break
+            Event().wait(0.1)
+        self.assertEqual(api.in_flight, 0)
+        api.shutdown()
+
+    def test_unmatched_response_ignored(self):
+        from asyncio import run_coroutine_threadsafe
+        from unittest.mock import Mock
+        from neon_speech.async_api import AsyncSpeechAPI
+        bus = FakeBus()
+        service = Mock()
+        service.bus = bus
+        api = AsyncSpeechAPI(service, workers=1)
+
+        def _handle_request(message):
+            # Replies with another ident or no ident are not for this request
+            bus.emit(message.response(context={"ident": "other"}))
+            bus.emit(Message("test.request.response"))
+            bus.emit(message.response({"matched": True}))
+
+        bus.on("test.request", _handle_request)
+        request = Message("test.request")
+        response = run_coroutine_threadsafe(
+            api.emit_and_wait(request, 2), api.loop).result(5)
+        self.assertTrue(response.data["matched"])
+        self.assertEqual(response.context["ident"], request.context["ident"])
+
+        bus.remove_all_listeners("test.request")
+        bus.on("test.request", lambda m: bus.emit(
+            m.response(context={"ident": "other"})))
+        self.assertIsNone(run_coroutine_threadsafe(
+            api.emit_and_wait(Message("test.request"), 0.2),
+            api.loop).result(5))
+        api.shutdown()
+
+    def test_streaming_requests_wait_on_loop(self):
+        from unittest.mock import Mock
+        from neon_speech.async_api import AsyncSpeechAPI
+        bus = FakeBus()
+        release = Event()
+        handled = list()
+        replies = dict()
+
+        class _Service:
+            api_stt = Mock(spec=["stream_start"])
+
+            def __init__(self):
+                self.bus = bus
+
+            @staticmethod
+            def _get_request_deadline(message):
+                return message.data.get("deadline")
+
+            @staticmethod
+            def _get_error_data(e):
+                return {"error": repr(e)}
+
+            @staticmethod
+            def handle_get_stt(message):
+                handled.append(message.context["ident"])
+                release.wait(5)
+                bus.emit(message.reply(message.context["ident"],
+                                       {"transcripts": ["test"]}))
+
+        for ident in ("first", "second", "late"):
+            bus.on(ident, lambda m: replies.__setitem__(m.msg_type, m.data))
+        api = AsyncSpeechAPI(_Service(), workers=4)
+        api.handle_get_stt(Message("neon.get_stt", {}, {"ident": "first"}))
+        api.handle_get_stt(Message("neon.get_stt", {}, {"ident": "second"}))
+        api.handle_get_stt(Message("neon.get_stt", {"deadline": 0.1},
+                                   {"ident": "late"}))
+        for _ in range(50):
+            if "late" in replies:
+                break
+            Event().wait(0.1)
+        # Only one request is given a worker while the engine is busy
+        self.assertEqual(handled, ["first"])
+        self.assertIn("Timed out", replies["late"]["error"])
+        release.set()
+        for _ in range(50):
+            if "second" in replies:
+                break
+            Event().wait(0.1)
+        self.assertEqual(handled, ["first", "second"])
+        self.assertEqual(replies["second"], {"transcripts": ["test"]})
+        api.shutdown()
+
+
+class SharedSTTTests(unittest.TestCase):
+    def test_priority_lock(self):
+        from neon_speech.shared_stt import PriorityLock
+        lock = PriorityLock()
+        order = []
+        self.assertTrue(lock.acquire())
+        self.assertFalse(lock.acquire(timeout=0.01))
+
+        def _acquire(name, high):
+            lock.acquire(high)
+            order.append(name)
+            lock.release()
+
+        low = Thread(target=_acquire, args=("low", False))
+        low.start()
+        Event().wait(0.05)
+        high = Thread(target=_acquire, args=("high", True))
+        high.start()
+        Event().wait(0.05)
+        lock.release()
+        low.join(5)
+        high.join(5)
+        self.assertEqual(order, ["high", "low"])
+
+    def test_shared_stt(self):
+        from neon_speech.shared_stt import PriorityLock, SharedSTT
+
+        class MockSTT:
+            available_languages = {"en-us"}
+
+            def execute(self, audio, language=None):
+                return "execute"
+
+            def transcribe(self, audio, lang=None):
+                return [("transcribe", 1.0)]
+
+        engine = MockSTT()
+        lock = PriorityLock()
+        voice_loop = SharedSTT(engine, lock, high_priority=True)
+        api = SharedSTT(engine, lock)
+        self.assertEqual(api.available_languages, {"en-us"})
+        self.assertFalse(hasattr(api, "stream_start"))
+        self.assertEqual(voice_loop.execute(None, "en-us"), "execute")
+        self.assertEqual(api.transcribe(None, "en-us"),
+                         [("transcribe", 1.0)])
+        self.assertTrue(lock.acquire(timeout=0))
+        lock.release()
+
+
+class BatchingTests(unittest.TestCase):
+    def test_bucket_and_pad(self):
+        from neon_speech.batching import _BatchItem, bucket_by_length, \
+            pad_audio
+        items = [_BatchItem(AudioData(b"\x01" * n, 16000, 2), "en-us")
+                 for n in (100, 30, 40, 90, 20)]
+        buckets = bucket_by_length(items, 2.0)
+        self.assertEqual([[len(i.audio.frame_data) for i in b]
+                          for b in buckets], [[20, 30, 40], [90, 100]])
+        padded = pad_audio([i.audio for i in buckets[0]])
+        self.assertEqual({len(a.frame_data) for a in padded}, {40})
+        self.assertEqual(padded[0].frame_data, b"\x01" * 20 + bytes(20))
+
+    def test_micro_batcher(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from threading import current_thread
+        from neon_speech.batching import MicroBatcher
+        batch_sizes = []
+
+        class MockBatchSTT:
+            def transcribe(self, audio, lang):
+                batch_sizes.append(1)
+                return [(f"{len(audio.frame_data)}", 1.0)]
+
+            def transcribe_batch(self, audio, lang):
+                batch_sizes.append(len(audio))
+                return [[(f"{len(a.frame_data)}", 1.0)] for a in audio]
+
+        batcher = MicroBatcher(MockBatchSTT, max_batch_size=4, max_wait=0.2)
+        with ThreadPoolExecutor(4) as executor:
+            futures = [executor.submit(
+                batcher.transcribe, AudioData(b"\x00" * n, 16000, 2),
+                "en-us", 5) for n in (100, 110, 120, 130)]
+            results = [f.result() for f in futures]
+        self.assertEqual([r[0][0] for r in results],
+                         ["100", "110", "120", "130"])
+        self.assertEqual(batch_sizes, [4])
+        self.assertEqual(batcher.get_stats()["mean_batch_size"], 4)
+
+        # Plugins without batch support bypass the batcher thread
+        class MockSTT:
+            def transcribe(self, audio, lang):
+                return [(current_thread().name, 1.0)]
+        batcher.shutdown()
+        batcher = MicroBatcher(MockSTT, max_wait=0.01)
+        self.assertEqual(batcher.transcribe(AudioData(b"\x00", 16000, 2),
+                                            "en-us", 5),
+                         [(current_thread().name, 1.0)])
+        self.assertEqual(batcher.get_stats()["bypassed_requests"], 1)
+        self.assertEqual(batcher.get_stats()["batches"], 0)
+        batcher.shutdown()
+
+    def test_service_batching(self):
+        from unittest.mock import Mock
+        api_stt = Mock(spec=["transcribe"])
+        api_stt.transcribe.return_value = [("stop", 0.9)]
+        service = get_mock_service(self, {"batching": {"enabled": True}},
+                                   api_stt)
+        resp = request_stt(service, "unbatched")
+        self.assertEqual(resp.data["transcripts"], ["stop"])
+        api_stt.transcribe.assert_called_once()
+        self.assertEqual(service._batcher.get_stats()["bypassed_requests"], 1)
+
+        # Concurrent requests to an engine with batch support are batched
+        api_stt = Mock(spec=["transcribe", "transcribe_batch"])
+        api_stt.transcribe_batch.side_effect = \
+            lambda audio, lang: [[("stop", 0.9)]] * len(audio)
+        service = get_mock_service(self, {"batching": {"enabled": True,
+                                                       "max_wait": 0.5}},
+                                   api_stt)
+        responses = dict()
+        requests = [Thread(target=lambda i=i: responses.__setitem__(
+            i, request_stt(service, f"batched{i}"))) for i in range(2)]
+        for request in requests:
+            request.start()
+        for request in requests:
+            request.join(5)
+        self.assertEqual([responses[i].data["transcripts"] for i in range(2)],
+                         [["stop"], ["stop"]])
+        api_stt.transcribe_batch.assert_called_once()
+        api_stt.transcribe.assert_not_called()
+        self.assertEqual(service._batcher.get_stats()["mean_batch_size"], 2)
+
+
+class CascadeTests(unittest.TestCase):
+    def test_get_top_confidence(self):
+        from neon_speech.cascade import get_top_confidence
+        self.assertIsNone(get_top_confidence([]))
+        self.assertIsNone(get_top_confidence("text"))
+        self.assertEqual(get_top_confidence([("a", 0.4), ("b", 0.7)]), 0.7)
+
+    def test_cascade(self):
+        from unittest.mock import Mock
+        from neon_speech.cascade import CascadeSTT
+        primary = Mock()
+        secondary = Mock(return_value=[("accurate", 0.95)])
+        tiers = list()
+        cascade = CascadeSTT(primary, secondary, threshold=0.8,
+                             on_result=lambda t, d: tiers.append(t))
+        audio = AudioData(b"\x00" * 320, 16000, 2)
+
+        primary.transcribe.return_value = [("fast", 0.9)]
+        self.assertEqual(cascade.transcribe(audio, "en-us"), [("fast", 0.9)])
+        secondary.assert_not_called()
+        self.assertEqual(tiers, ["primary"])
+
+        primary.transcribe.return_value = [("fast", 0.5)]
+        self.assertEqual(cascade.transcribe(audio, "en-us"),
+                         [("accurate", 0.95)])
+        secondary.assert_called_once_with(audio, "en-us")
+        self.assertEqual(tiers, ["primary", "primary", "secondary"])
+
+        primary.transcribe.side_effect = RuntimeError("failed")
+        self.assertEqual(cascade.transcribe(audio, "en-us"),
+                         [("accurate", 0.95)])
+
+        stats = cascade.get_stats()
+        self.assertEqual(stats["requests"], 3)
+        self.assertEqual(stats["escalations"], 2)
+        self.assertAlmostEqual(stats["escalation_rate"], 2 / 3)
+        self.assertEqual(set(stats["mean_latency"]),
+                         {"primary", "secondary"})
+
+    def test_service_cascade(self):
+        from unittest.mock import Mock
+        api_stt = Mock(spec=["transcribe"])
+        api_stt.transcribe.return_value = [("stop", 0.95)]
+        primary_stt = Mock(spec=["transcribe"])
+        primary_stt.transcribe.return_value = [("stop", 0.9)]
+        service = get_mock_service(
+            self, {"cascade": {"enabled": True, "threshold": 0.8,
+                               "primary": {"module": "fast-plugin"}}},
+            api_stt, primary_stt)
+        self.assertIs(service._cascade.primary, primary_stt)
+        metrics = list()
+        service.bus.on("neon.metric", metrics.append)
+
+        # Confident primary results are returned without the API engine
+        resp = request_stt(service, "confident")
+        self.assertEqual(resp.data["transcripts_with_conf"], [("stop", 0.9)])
+        api_stt.transcribe.assert_not_called()
+
+        # Low confidence results escalate to the API engine
+        primary_stt.transcribe.return_value = [("top", 0.4)]
+        resp = request_stt(service, "escalated")
+        self.assertEqual(resp.data["transcripts_with_conf"],
+                         [("stop", 0.95)])
+        api_stt.transcribe.assert_called_once()
+        self.assertEqual([m.data["name"] for m in metrics
+                          if m.data["name"].startswith("stt_cascade")],
+                         ["stt_cascade_primary", "stt_cascade_primary",
+                          "stt_cascade_secondary"])
+        self.assertEqual(service._cascade.get_stats()["escalations"], 1)
+
+
+class HTTPAPITests(unittest.TestCase):
+    test_file = join(dirname(__file__), "audio_files", "stop.wav")
+
+    def setUp(self):
+        from neon_speech.http_api import STTHTTPServer
+        self.requests = list()
+
+        def _handle(audio_file, params):
+            with open(audio_file, 'rb') as f:
+                self.requests.append((f.read(), params))
+            return 200, {"transcripts_with_conf": [["stop", 0.9]]}
+
+        self.server = STTHTTPServer(("127.0.0.1", 0), {"/stt": _handle},
+                                    workers=2, max_payload_bytes=1024 * 1024)
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_keep_alive(self):
+        import json
+        from http.client import HTTPConnection
+        with open(self.test_file, 'rb') as f:
+            audio = f.read()
+        conn = HTTPConnection("127.0.0.1", self.server.port, timeout=5)
+        for _ in range(2):
+            conn.request("POST", "/stt?lang=en-us", body=audio)
+            resp = conn.getresponse()
+            self.assertEqual(resp.status, 200)
+            self.assertEqual(json.loads(resp.read()),
+                             {"transcripts_with_conf": [["stop", 0.9]]})
+        # Both requests were served on one connection
+        self.assertEqual(self.requests[0], (audio, {"lang": "en-us"}))
+        self.assertEqual(len(self.requests), 2)
+
+        conn.request("POST", "/missing", body=audio)
+        self.assertEqual(conn.getresponse().status, 404)
+        conn.close()
+
+    def test_chunked_raw_upload(self):
+        import wave
+        from http.client import HTTPConnection
+        pcm = b"\x01\x00" * 8000
+        conn = HTTPConnection("127.0.0.1", self.server.port, timeout=5)
+        conn.request("POST", "/stt?format=raw&sample_rate=8000",
+                     body=iter([pcm[:4000], pcm[4000:]]),
+                     encode_chunked=True)
+        resp = conn.getresponse()
+        resp.read()
+        self.assertEqual(resp.status, 200)
+        conn.close()
+        audio, params = self.requests[0]
+        from io import BytesIO
+        with wave.open(BytesIO(audio)) as wav:
+            self.assertEqual(wav.getframerate(), 8000)
+            self.assertEqual(wav.readframes(wav.getnframes()), pcm)
+
+    def test_unsupported_format(self):
+        import json
+        from http.client import HTTPConnection
+        conn = HTTPConnection("127.0.0.1", self.server.port, timeout=5)
+        # The request is rejected before the body is read
+        conn.putrequest("POST", "/stt?format=../../etc/x")
+        conn.putheader("Content-Length", "4")
+        conn.endheaders()
+        resp = conn.getresponse()
+        self.assertEqual(resp.status, 400)
+        self.assertIn("Unsupported audio format", json.loads(resp.read())
+                      ["error"])
+        conn.close()
+        self.assertEqual(self.requests, [])
+
+    def test_payload_limit(self):
+        from http.client import HTTPConnection
+        conn = HTTPConnection("127.0.0.1", self.server.port, timeout=5)
+        # The request is rejected before the body is read
+        conn.putrequest("POST", "/stt")
+        conn.putheader("Content-Length", str(1024 * 1024 + 1))
+        conn.endheaders()
+        self.assertEqual(conn.getresponse().status, 413)
+        conn.close()
+        self.assertEqual(self.requests, [])
+
+    def test_bind_on_start(self):
+        from neon_speech.http_api import STTHTTPServer
+        # The address is not bound until the server is started
+        server = STTHTTPServer(("127.0.0.1", self.server.port), {})
+        self.assertRaises(OSError, server.start)
+        server.stop()
+
+    def test_invalid_deadline(self):
+        from neon_speech.http_api import HTTPError
+        from neon_speech.service import NeonSpeechClient
+        message = NeonSpeechClient._get_http_message(
+            "neon.get_stt", "test.wav", {"lang": "en-us", "deadline": "2.5"})
+        self.assertEqual(message.context["deadline"], 2.5)
+        with self.assertRaises(HTTPError) as e:
+            NeonSpeechClient._get_http_message(
+                "neon.get_stt", "test.wav", {"deadline": "soon"})
+        self.assertEqual(e.exception.status, 400)
+
+
+class SatelliteTests(unittest.TestCase):
+    speech = b"\x10\x27" * 480
+    silence = b"\x00\x00" * 480
+
+    @staticmethod
+    def _get_session(engine, pool=None, **kwargs):
+        from unittest.mock import Mock
+        from neon_speech.satellite import SatelliteSession
+        from neon_speech.stt_pool import STTEnginePool
+        vad = Mock()
+        vad.is_silence.side_effect = lambda chunk: not any(chunk)
+        utterances = list()
+        session = SatelliteSession(
+            vad, pool or STTEnginePool(lambda: engine, 1), "en-us",
+            lambda *args: utterances.append(args), speech_seconds=0.06,
+            silence_seconds=0.09, before_seconds=0.03, **kwargs)
+        return session, utterances
+
+    def test_session_non_streaming(self):
+        from unittest.mock import Mock
+        from neon_speech.satellite import SatelliteState
+        engine = Mock(spec=["transcribe"])
+        engine.transcribe.return_value = [("hello", 0.9)]
+        session, utterances = self._get_session(engine)
+        # Audio is processed in fixed size chunks regardless of input size
+        session.feed(self.silence * 3 + self.speech[:100])
+        self.assertEqual(session.state, SatelliteState.WAITING_SPEECH)
+        session.feed(self.speech[100:] + self.speech * 3)
+        self.assertEqual(session.state, SatelliteState.IN_COMMAND)
+        session.feed(self.silence * 2)
+        self.assertEqual(utterances, [])
+        session.feed(self.silence)
+        self.assertEqual(session.state, SatelliteState.WAITING_SPEECH)
+        # Wait for the command to be finalized
+        session.close()
+        transcriptions, audio, timing = utterances[0]
+        self.assertEqual(transcriptions, [("hello", 0.9)])
+        # One chunk of audio before speech is included
+        self.assertEqual(audio.frame_data,
+                         self.silence + self.speech * 4 + self.silence * 3)
+        self.assertIsInstance(timing["get_stt"], float)
+        engine.transcribe.assert_called_once()
+
+    def test_session_streaming_wake_word(self):
+        from unittest.mock import Mock
+        from neon_speech.satellite import SatelliteState
+        engine = Mock(spec=["stream_start", "stream_data", "transcribe"])
+        engine.transcribe.return_value = [("hello", 0.9)]
+        hotword = Mock(key_phrase="hey neon")
+        hotword.found_wake_word.side_effect = [False, True]
+        events = list()
+        session, utterances = self._get_session(engine, hotword=hotword,
+                                                on_event=events.append,
+                                                max_seconds=0.15)
+        session.feed(self.speech * 2)
+        self.assertEqual(session.state, SatelliteState.IN_COMMAND)
+        self.assertEqual([e["type"] for e in events],
+                         ["wake_word", "listening"])
+        engine.stream_start.assert_called_once_with("en-us")
+        # Commands end at `max_seconds`
+        session.feed(self.speech * 5)
+        self.assertEqual(session.state, SatelliteState.WAITING_WAKEWORD)
+        self.assertEqual(engine.stream_data.call_count, 5)
+        session.close()
+        engine.transcribe.assert_called_once_with(None, None)
+        self.assertEqual(utterances[0][0], [("hello", 0.9)])
+        self.assertEqual(events[-1]["type"], "utterance")
+        self.assertEqual(events[-1]["transcripts"], ["hello"])
+
+    def test_session_does_not_block(self):
+        from unittest.mock import Mock
+        from neon_speech.satellite import SatelliteState
+        from neon_speech.stt_pool import STTEnginePool
+        engine = Mock(spec=["transcribe"])
+        engine.transcribe.return_value = [("hello", 0.9)]
+        events = list()
+        handled = Event()
+        pool = STTEnginePool(lambda: engine, 1)
+        session, _ = self._get_session(engine, pool=pool,
+                                       on_event=events.append,
+                                       acquire_timeout=0.01)
+        session._on_utterance = lambda *_: handled.wait(5)
+        session.feed(self.speech * 3 + self.silence * 3)
+        # The transcript is sent before the utterance is handled
+        for _ in range(50):
+            if events[-1]["type"] == "utterance":
+                break
+            handled.wait(0.1)
+        self.assertEqual(events[-1]["transcripts"], ["hello"])
+        self.assertEqual(session.state, SatelliteState.WAITING_SPEECH)
+
+        # Commands are dropped if no engine is available
+        busy_engine = pool.acquire()
+        session.feed(self.speech * 3)
+        self.assertEqual(events[-1], {"type": "busy"})
+        self.assertEqual(session.state, SatelliteState.WAITING_SPEECH)
+        pool.release(busy_engine)
+        handled.set()
+        session.close()
+
+    def test_server(self):
+        import json
+        from unittest.mock import Mock
+        from websockets.sync.client import connect
+        from neon_speech.satellite import SatelliteServer
+        engine = Mock(spec=["transcribe"])
+        engine.transcribe.return_value = [("hello", 0.9)]
+        options = list()
+
+        def _create_session(opts, send):
+            options.append(opts)
+            session, _ = self._get_session(engine, on_event=send)
+            session._on_utterance = lambda *_: send({"type": "handled"})
+            return session
+
+        server = SatelliteServer(_create_session, port=0)
+        server.start()
+        try:
+            with connect(f"ws://127.0.0.1:{server.port}") as ws:
+                ws.send(json.dumps({"lang": "en-us"}))
+                self.assertEqual(json.loads(ws.recv(5))["type"], "ready")
+                ws.send(self.speech * 3 + self.silence * 3)
+                self.assertEqual(json.loads(ws.recv(5))["type"], "listening")
+                event = json.loads(ws.recv(5))
+                self.assertEqual(event["type"], "utterance")
+                self.assertEqual(event["transcripts"], ["hello"])
+                self.assertEqual(json.loads(ws.recv(5)), {"type": "handled"})
+        finally:
+            server.stop()
+        self.assertEqual(options, [{"lang": "en-us"}])
+
+
+class IdleUnloaderTests(unittest.TestCase):
+    def test_idle_unloader(self):
+        from neon_speech.idle import IdleUnloader
+        loads = []
+
+        class MockEngine:
+            shutdown_called = False
+
+            def shutdown(self):
+                self.shutdown_called = True
+
+        initial = MockEngine()
+        holder = IdleUnloader(MockEngine, idle_seconds=0.1,
+                              on_load=loads.append, check_interval=60)
+        holder.set(initial)
+        self.assertIs(holder.get(), initial)
+        self.assertFalse(holder.release_if_idle())
+        Event().wait(0.15)
+        self.assertTrue(holder.release_if_idle())
+        self.assertTrue(initial.shutdown_called)
+        self.assertFalse(holder.loaded)
+
+        # Reloaded on demand with load time reported
+        reloaded = holder.get()
+        self.assertIsInstance(reloaded, MockEngine)
+        self.assertIsNot(reloaded, initial)
+        self.assertEqual(len(loads), 1)
+        self.assertEqual(holder.get_stats()["loads"], 1)
+
+        # Engine is not released while in use
+        with holder.use() as engine:
+            self.assertIs(engine, reloaded)
+            Event().wait(0.15)
+            self.assertFalse(holder.release_if_idle())
+            self.assertEqual(holder.get_stats()["in_use"], 1)
+        self.assertEqual(holder.get_stats()["in_use"], 0)
+        Event().wait(0.15)
+        self.assertTrue(holder.release_if_idle())
+
+        # Preload hint keeps the engine loaded
+        holder.preload(keep_seconds=60)
+        Event().wait(0.15)
+        self.assertFalse(holder.release_if_idle())
+        holder.shutdown()
+
+    def test_service_idle_unload(self):
+        from unittest.mock import Mock
+        api_stt = Mock(spec=["transcribe", "available_languages"])
+        api_stt.available_languages = {"en-us", "uk-ua"}
+        in_progress = Event()
+        finish = Event()
+
+        def _transcribe(audio, lang):
+            in_progress.set()
+            finish.wait(5)
+            return [("stop", 0.9)]
+        api_stt.transcribe.side_effect = _transcribe
+        service = get_mock_service(self, {"enable_voice_loop": False,
+                                          "idle_unload": {"enabled": True,
+                                                          "idle_seconds": 60}},
+                                   api_stt)
+        holder = service._api_stt_holder
+        self.assertIsNotNone(holder)
+        holder.idle_seconds = 0
+
+        # The engine is not released while a request is in progress
+        responses = list()
+        request = Thread(target=lambda: responses.append(
+            request_stt(service, "in_progress")))
+        request.start()
+        self.assertTrue(in_progress.wait(5))
+        self.assertFalse(holder.release_if_idle())
+        finish.set()
+        request.join(5)
+        self.assertEqual(responses[0].data["transcripts"], ["stop"])
+        self.assertTrue(holder.release_if_idle())
+        self.assertFalse(holder.loaded)
+
+        # Languages are reported without reloading the engine
+        languages = list()
+        service.bus.on("ovos.languages.stt.response", languages.append)
+        service._handle_get_languages_stt(Message("ovos.languages.stt"))
+        self.assertEqual(set(languages[0].data["langs"]), {"en-us", "uk-ua"})
+        self.assertFalse(holder.loaded)
+
+        # The engine is reloaded on the next request
+        with patch("neon_speech.service.STTFactory") as factory:
+            factory.create.return_value = api_stt
+            resp = request_stt(service, "reloaded")
+        self.assertEqual(resp.data["transcripts"], ["stop"])
+        self.assertEqual(holder.get_stats()["loads"], 1)
+
+
+class ClusterTests(unittest.TestCase):
+    def test_cluster_single_owner(self):
+        from neon_speech.cluster import ClusterCoordinator
+        bus = FakeBus()
+        handled = []
+        done = Event()
+        coordinators = list()
+        for idx, load in enumerate((2, 0, 1)):
+            coordinator = ClusterCoordinator(bus, f"instance{idx}",
+                                             claim_window=0.05,
+                                             load_fn=lambda l=load: l)
+
+            def handler(message, name=coordinator.instance_id):
+                handled.append((name, message.data["n"]))
+                done.set()
+            bus.on("neon.get_stt", coordinator.wrap(handler))
+            coordinators.append(coordinator)
+
+        bus.emit(Message("neon.get_stt", {"n": 1}))
+        self.assertTrue(done.wait(5))
+        Event().wait(0.2)
+        # The least loaded instance handles the request
+        self.assertEqual(handled, [("instance1", 1)])
+        for coordinator in coordinators:
+            self.assertEqual(coordinator.get_stats()["tracked"], 0)
+            coordinator.shutdown()
+
+    def test_cluster_failover(self):
+        from neon_speech.cluster import ClusterCoordinator
+        bus = FakeBus()
+        handled = []
+        done = Event()
+        coordinators = list()
+        for idx in range(3):
+            coordinator = ClusterCoordinator(bus, f"instance{idx}",
+                                             claim_window=0.05,
+                                             lease_seconds=0.3,
+                                             load_fn=lambda i=idx: i)
+
+            def handler(message, name=coordinator.instance_id):
+                handled.append(name)
+                done.set()
+            bus.on("neon.audio_input", coordinator.wrap(handler))
+            coordinators.append(coordinator)
+        # instance0 dies after winning the election
+        coordinators[0]._handle = lambda request: None
+
+        bus.emit(Message("neon.audio_input", {}, {"ident": "request"}))
+        self.assertTrue(done.wait(5))
+        Event().wait(0.5)
+        self.assertEqual(handled, ["instance1"])
+        self.assertGreaterEqual(coordinators[1].failovers +
+                                coordinators[2].failovers, 1)
+        for coordinator in coordinators:
+            coordinator.shutdown()
+
+    def test_cluster_late_claimant_yields(self):
+        from neon_speech.cluster import ClusterCoordinator
+        bus = FakeBus()
+        handled = []
+        started = Event()
+        release = Event()
+        busy = ClusterCoordinator(bus, "busy", claim_window=0.05,
+                                  load_fn=lambda: 5)
+        idle = ClusterCoordinator(bus, "idle", claim_window=0.05,
+                                  load_fn=lambda: 0)
+
+        def handler(message, name):
+            handled.append(name)
+            started.set()
+            release.wait(5)
+        message = Message("neon.get_stt", {"n": 1}, {"ident": "request"})
+        busy.wrap(lambda m: handler(m, "busy"))(message)
+        self.assertTrue(started.wait(5))
+        # The less loaded instance receives the request after the election
+        idle.wrap(lambda m: handler(m, "idle"))(message)
+        Event().wait(0.2)
+        release.set()
+        Event().wait(0.1)
+        self.assertEqual(handled, ["busy"])
+        self.assertEqual(idle.get_stats()["tracked"], 0)
+        busy.shutdown()
+        idle.shutdown()
+
+    def test_cluster_missing_heartbeat(self):
+        from neon_speech.cluster import CLAIM, ClusterCoordinator
+        bus = FakeBus()
+        handled = []
+        done = Event()
+        standby = ClusterCoordinator(bus, "standby", claim_window=0.05,
+                                     lease_seconds=0.3, load_fn=lambda: 1)
+        other = ClusterCoordinator(bus, "other", claim_window=0.05,
+                                   lease_seconds=0.3, load_fn=lambda: 2)
+
+        def handler(message, name):
+            handled.append(name)
+            done.set()
+        message = Message("neon.get_stt", {"n": 1}, {"ident": "request"})
+        request_id = ClusterCoordinator.get_request_id(message)
+        # A remote instance's claim arrives before the request
+        bus.emit(Message(CLAIM, {"request_id": request_id,
+                                 "instance": "remote", "load": 0,
+                                 "epoch": 0}))
+        standby.wrap(lambda m: handler(m, "standby"))(message)
+        other.wrap(lambda m: handler(m, "other"))(message)
+        Event().wait(0.15)
+        # Only the next best claimant keeps the payload for a failover
+        self.assertIsNotNone(standby._requests[request_id].message)
+        self.assertIsNone(other._requests[request_id].message)
+
+        # The remote owner never sends a heartbeat or completes
+        self.assertTrue(done.wait(5))
+        Event().wait(0.2)
+        self.assertEqual(handled, ["standby"])
+        self.assertEqual(standby.failovers, 1)
+        self.assertEqual(standby.get_stats()["tracked"], 0)
+        standby.shutdown()
+        other.shutdown()
+
+    def test_service_cluster(self):
+        from unittest.mock import Mock
+        from neon_speech.cluster import ClusterCoordinator
+        api_stt = Mock(spec=["transcribe"])
+        api_stt.transcribe.return_value = [("stop", 0.9)]
+        service = get_mock_service(self, {"cluster": {"enabled": True,
+                                                      "instance_id": "service",
+                                                      "claim_window": 0.05}},
+                                   api_stt)
+        # A more heavily loaded instance shares the bus
+        other_handler = Mock()
+        other = ClusterCoordinator(service.bus, "other", claim_window=0.05,
+                                   load_fn=lambda: 10)
+        self.addCleanup(other.shutdown)
+        service.bus.on("neon.get_stt", other.wrap(other_handler))
+        service.bus.on("neon.audio_input", other.wrap(other_handler))
+        service.bus.on("recognizer_loop:utterance",
+                       lambda m: service.bus.emit(m.response()))
+
+        resp = request_stt(service, "get_stt")
+        self.assertEqual(resp.data["transcripts"], ["stop"])
+        resp = request_stt(service, "audio_input", msg_type="neon.audio_input")
+        self.assertEqual(resp.data["transcripts"], ["stop"])
+        self.assertTrue(resp.data["skills_recv"])
+        other_handler.assert_not_called()
+        self.assertEqual(api_stt.transcribe.call_count, 2)
+
+    def test_get_request_id(self):
+        from neon_speech.cluster import ClusterCoordinator
+        first = Message("neon.get_stt", {"n": 1}, {"ident": "request"})
+        second = Message("neon.get_stt", {"n": 2}, {"ident": "request"})
+        self.assertTrue(ClusterCoordinator.get_request_id(first)
+                        .startswith("neon.get_stt:request:"))
+        self.assertNotEqual(ClusterCoordinator.get_request_id(first),
+                            ClusterCoordinator.get_request_id(second))
+        self.assertEqual(ClusterCoordinator.get_request_id(first),
+                         ClusterCoordinator.get_request_id(
+                             Message.deserialize(first.serialize())))
+
+
+class AdmissionTests(unittest.TestCase):
+    def test_admission_controller(self):
+        from neon_speech.admission import AdmissionController, OverloadError
+        controller = AdmissionController(concurrency=1, initial_rtf=0.5,
+                                         overhead=0.0, smoothing=0.5)
+        self.assertEqual(controller.estimate(10), (5.0, 5.0))
+
+        # No deadline always admits
+        first = controller.admit(10, None)
+        self.assertEqual(controller.in_flight, 1)
+        # Queued behind the first request
+        self.assertEqual(controller.estimate(2), (6.0, 1.0))
+        with self.assertRaises(OverloadError) as ctx:
+            controller.admit(2, 5)
+        error = ctx.exception.to_dict()
+        self.assertEqual(error["error"], "overloaded")
+        self.assertEqual(error["estimated_seconds"], 6.0)
+        self.assertEqual(error["retry_after"], 5.0)
+        self.assertEqual(controller.rejected, 1)
+
+        # Completion updates the measured real-time factor
+        first.complete(2.0)
+        first.complete(2.0)
+        self.assertEqual(controller.in_flight, 0)
+        self.assertAlmostEqual(controller.rtf, 0.35)
+        second = controller.admit(2, 5)
+        second.complete(None)
+        self.assertAlmostEqual(controller.rtf, 0.35)
+        self.assertEqual(controller.get_stats()["pending_work"], 0.0)
+        # A deadline of 0 is enforced
+        self.assertRaises(OverloadError, controller.admit, 1, 0.0)
+        self.assertEqual(controller.in_flight, 0)
+
+
+class PluginIndexTests(unittest.TestCase):
+    def test_plugin_index(self):
+        from ovos_plugin_manager.utils import PluginTypes, load_plugin
+        from neon_speech.plugin_index import PluginIndex
+        index = PluginIndex()
+        vad = "ovos-vad-plugin-webrtcvad"
+        clazz = index.load_plugin(vad, PluginTypes.VAD)
+        self.assertIs(clazz, load_plugin(vad, PluginTypes.VAD))
+        self.assertIs(index.load_plugin(vad, PluginTypes.VAD), clazz)
+        self.assertEqual(index.scans, 1)
+        self.assertIn(vad, index.get_entry_points(PluginTypes.VAD))
+
+        # Unknown plugins trigger a rescan
+        self.assertIsNone(index.load_plugin("not-a-plugin", PluginTypes.VAD))
+        self.assertEqual(index.scans, 2)
+        stats = index.get_stats()
+        self.assertEqual(stats["lookups"], 3)
+        self.assertEqual(stats["cached"], 1)
+
+        index.invalidate()
+        self.assertIs(index.load_plugin(vad, PluginTypes.VAD), clazz)
+        self.assertEqual(index.scans, 3)
+
+    def test_install_plugin_index(self):
+        import ovos_plugin_manager.utils as opm_utils
+        from ovos_plugin_manager.vad import OVOSVADFactory
+        from neon_speech.plugin_index import install_plugin_index
+        original = opm_utils.load_plugin
+        try:
+            index = install_plugin_index()
+            self.assertEqual(opm_utils.load_plugin, index.load_plugin)
+            lookups = index.lookups
+            OVOSVADFactory.get_class({"module": "ovos-vad-plugin-webrtcvad"})
+            self.assertEqual(index.lookups, lookups + 1)
+        finally:
+            opm_utils.load_plugin = original
+
+
+class ModelCacheTests(unittest.TestCase):
+    def test_model_cache(self):
+        from tempfile import mkdtemp
+        from neon_speech.model_cache import get_cache_dir, write_manifest, \
+            verify_cache, load_model_cache, restore_engine_state
+        root = mkdtemp()
+        config = {"path": root, "verify": "sha256"}
+        cache_dir = get_cache_dir("not-installed-plugin", config)
+        self.assertEqual(cache_dir,
+                         join(root, "not-installed-plugin", "unknown"))
+        self.assertIsNone(load_model_cache("not-installed-plugin", config))
+
+        os.makedirs(join(cache_dir, "state"))
+        with open(join(cache_dir, "model.bin"), 'wb') as f:
+            f.write(b"model")
+        with open(join(cache_dir, "state", "runtime.bin"), 'wb') as f:
+            f.write(b"state")
+        write_manifest(cache_dir, "not-installed-plugin", True)
+        manifest = verify_cache(cache_dir, True)
+        self.assertEqual(set(manifest["files"].keys()),
+                         {"model.bin", join("state", "runtime.bin")})
+
+        env = {k: os.environ.get(k) for k in ("HF_HOME", "TORCH_HOME",
+                                              "NEMO_CACHE_DIR")}
+        try:
+            for k in env:
+                os.environ.pop(k, None)
+            # Locations set by the user are not changed
+            os.environ["TORCH_HOME"] = root
+            self.assertEqual(load_model_cache("not-installed-plugin",
+                                              config), cache_dir)
+            self.assertTrue(os.environ["HF_HOME"].startswith(cache_dir))
+            self.assertEqual(os.environ["TORCH_HOME"], root)
+        finally:
+            for k, v in env.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+
+        # Same size, different content is only detected with checksums
+        with open(join(cache_dir, "model.bin"), 'wb') as f:
+            f.write(b"MODEL")
+        self.assertIsNotNone(verify_cache(cache_dir, False))
+        self.assertIsNone(verify_cache(cache_dir, True))
+        os.remove(join(cache_dir, "model.bin"))
+        self.assertIsNone(verify_cache(cache_dir, False))
+
+        class MockEngine:
+            loaded = None
+
+            def load_cache(self, path):
+                self.loaded = path
+        engine = MockEngine()
+        self.assertTrue(restore_engine_state(engine, cache_dir))
+        self.assertEqual(engine.loaded, join(cache_dir, "state"))
+        self.assertFalse(restore_engine_state(object(), cache_dir))
+        shutil.rmtree(root)
+
+    def test_init_stt_plugin(self):
+        from unittest.mock import Mock, patch
+        from neon_speech.utils import init_stt_plugin
+        plugin = Mock()
+        env = {k: os.environ.get(k) for k in ("HF_HOME", "TORCH_HOME",
+                                              "NEMO_CACHE_DIR")}
+        with patch("ovos_plugin_manager.stt.load_stt_plugin",
+                   return_value=plugin), \
+                patch("neon_speech.model_cache.build_model_cache") as build:
+            init_stt_plugin("test-plugin", {"enabled": False})
+            plugin.assert_called_once_with()
+            build.assert_not_called()
+            self.assertEqual(env, {k: os.environ.get(k) for k in env})
+
+            init_stt_plugin("test-plugin", {"enabled": True})
+            build.assert_called_once_with("test-plugin", {"enabled": True})
+            plugin.assert_called_once_with()
+
+    def test_build_model_cache(self):
+        from tempfile import mkdtemp
+        from unittest.mock import patch
+        from neon_speech.model_cache import build_model_cache, verify_cache
+        root = mkdtemp()
+        env = {k: os.environ.pop(k, None) for k in ("HF_HOME", "TORCH_HOME",
+                                                    "NEMO_CACHE_DIR")}
+        init_env = dict()
+
+        class MockEngine:
+            def __init__(self):
+                init_env.update({k: os.environ.get(k) for k in env})
+        try:
+            with patch("ovos_plugin_manager.stt.load_stt_plugin",
+                       return_value=MockEngine):
+                cache_dir = build_model_cache("test-plugin", {"path": root})
+            # Downloads go to the cache only while the plugin is loaded
+            self.assertTrue(init_env["HF_HOME"].startswith(cache_dir))
+            self.assertEqual({k: os.environ.get(k) for k in env},
+                             {k: None for k in env})
+            self.assertIsNotNone(verify_cache(cache_dir))
+        finally:
+            for k, v in env.items():
+                if v is not None:
+                    os.environ[k] = v
+            shutil.rmtree(root)
+
+    def test_warmup_stt(self):
+        from neon_speech.stt_pool import warmup_stt
+        calls = []
+
+        class MockSTT:
+            def transcribe(self, audio, lang):
+                calls.append((len(audio.frame_data), lang))
+                return [("", 0.0)]
+        self.assertIsInstance(warmup_stt(MockSTT(), "en-us", 0.5), float)
+        self.assertEqual(calls, [(16000, "en-us")])
+
+
+class SLOTests(unittest.TestCase):
+    def test_slo_monitor(self):
+        from neon_speech.slo import SLOMonitor
+        monitor = SLOMonitor({"get_stt": {"threshold": 1.0,
+                                          "percentile": 90}},
+                             window_seconds=10, min_samples=5, cooldown=5)
+        self.assertIsNone(monitor.record("unknown", 10.0, 100))
+        for i in range(9):
+            self.assertIsNone(monitor.record("get_stt", 0.5, 100 + i / 10))
+        # One slow sample in ten is within the objective
+        self.assertIsNone(monitor.record("get_stt", 5.0, 101))
+        self.assertAlmostEqual(
+            monitor.get_burn_rates(101)["get_stt"]["burn_rate"], 1.0)
+
+        violation = monitor.record("get_stt", 5.0, 102)
+        self.assertEqual(violation["stage"], "get_stt")
+        self.assertEqual(violation["value"], 5.0)
+        self.assertAlmostEqual(violation["burn_rate"], 2 / 11 / 0.1)
+        # Violations are rate-limited
+        self.assertIsNone(monitor.record("get_stt", 5.0, 103))
+        # Old samples leave the window
+        status = monitor.get_burn_rates(112.5)["get_stt"]
+        self.assertEqual(status["samples"], 1)
+        self.assertEqual(status["burn_rate"], 10.0)
+
+
+class ProfilerTests(unittest.TestCase):
+    def test_sampling_profiler(self):
+        from tempfile import mkdtemp
+        from time import time
+        from neon_speech.profiler import SamplingProfiler
+        root = mkdtemp()
+        profiler = SamplingProfiler(root, interval=0.001,
+                                    malloc_interval=0.05, max_duration=5)
+        self.assertIsNone(profiler.stop())
+        session = profiler.start(60)
+        self.assertEqual(session["duration"], 5)
+        with self.assertRaises(RuntimeError):
+            profiler.start()
+        idle_stop = Event()
+
+        def _idle_thread():
+            idle_stop.wait(5)
+        idle = Thread(target=_idle_thread)
+        idle.start()
+        busy_until = time() + 0.2
+        while time() < busy_until:
+            pass
+        summary = profiler.stop()
+        idle_stop.set()
+        idle.join()
+        self.assertFalse(profiler.running)
+        self.assertGreater(summary["samples"], 0)
+        self.assertGreater(summary["malloc_snapshots"], 1)
+        self.assertEqual(summary["clock"], "cpu")
+        with open(join(session["path"], "cpu.collapsed")) as f:
+            stacks = f.read()
+        # Only threads using CPU time are sampled
+        self.assertIn("test_sampling_profiler", stacks)
+        self.assertNotIn("_idle_thread", stacks)
+        self.assertTrue(os.path.isfile(join(session["path"],
+                                            "malloc-0000.txt")))
+        # Each session writes to a new directory
+        second = profiler.start(trace_malloc=False)
+        profiler.stop()
+        self.assertNotEqual(second["path"], session["path"])
+        shutil.rmtree(root)
+
+
+class PartialTranscriptTests(unittest.TestCase):
+    def test_partial_transcript_publisher(self):
+        from neon_speech.partials import PartialTranscriptPublisher
+        published = []
+        publisher = PartialTranscriptPublisher(published.append,
+                                               min_interval=1, min_chars=2)
+        self.assertFalse(publisher.update(None, 0.5))
+        self.assertFalse(publisher.update("a", 0.5))
+        self.assertTrue(publisher.update(" what ", 1))
+        # Rate limited
+        self.assertFalse(publisher.update("what time", 1.5))
+        # Duplicate
+        self.assertFalse(publisher.update("What", 2))
+        self.assertTrue(publisher.update("what time", 2))
+        publisher.reset()
+        self.assertTrue(publisher.update("what time", 2.1))
+        self.assertEqual(published, ["what", "what time", "what time"])
+
+        # Rate limited transcripts are held until the interval passes
+        self.assertFalse(publisher.update("what time is", 2.5))
+        self.assertFalse(publisher.update(None, 3))
+        self.assertTrue(publisher.update(None, 3.1))
+        self.assertEqual(published[-1], "what time is")
+        # Or until the utterance ends
+        self.assertFalse(publisher.update("what time is it", 3.5))
+        publisher.reset()
+        self.assertEqual(published[-1], "what time is it")
+        publisher.reset()
+        self.assertEqual(len(published), 5)
+
+    def test_service_partial_transcripts(self):
+        from unittest.mock import Mock
+        from ovos_dinkum_listener.voice_loop.voice_loop import ChunkInfo, \
+            ListeningState
+        service = get_mock_service(self, {"partial_transcripts": {
+            "enabled": True, "min_interval": 0}}, Mock(spec=["transcribe"]))
+        with patch("neon_speech.service.OVOSDinkumVoiceService."
+                   "_init_voice_loop", return_value=Mock()):
+            service.voice_loop = service._init_voice_loop({})
+        voice_loop = service.voice_loop
+        voice_loop.state = ListeningState.IN_COMMAND
+        voice_loop.stt.lang = "en-us"
+        partials = list()
+        service.bus.on("recognizer_loop:partial_utterance", partials.append)
+
+        # The voice loop calls back after each chunk of recorded audio
+        for text in (None, "turn", "turn", "turn on"):
+            voice_loop.stt.stream.text = text
+            voice_loop.chunk_callback(ChunkInfo(is_speech=True))
+        self.assertEqual([m.data for m in partials],
+                         [{"utterance": "turn", "lang": "en-us"},
+                          {"utterance": "turn on", "lang": "en-us"}])
+
+        # A new command starts with no published transcript
+        voice_loop.state = ListeningState.WAITING_CMD
+        voice_loop.chunk_callback(ChunkInfo())
+        voice_loop.state = ListeningState.IN_COMMAND
+        voice_loop.chunk_callback(ChunkInfo(is_speech=True))
+        self.assertEqual(len(partials), 3)
+        self.assertEqual(partials[-1].data["utterance"], "turn on")
+
+        # A rate limited transcript is published when the command ends
+        service._partials.min_interval = 60
+        voice_loop.stt.stream.text = "turn on the"
+        voice_loop.chunk_callback(ChunkInfo(is_speech=True))
+        self.assertEqual(len(partials), 3)
+        voice_loop.state = ListeningState.WAITING_CMD
+        voice_loop.chunk_callback(ChunkInfo())
+        self.assertEqual(partials[-1].data["utterance"], "turn on the")
+
+
+class EndpointingTests(unittest.TestCase):
+    def test_endpoint_policy(self):
+        from neon_speech.endpointing import EndpointPolicy
+        policy = EndpointPolicy(stable_seconds=0.2, min_silence_seconds=0.1)
+        self.assertTrue(policy.is_complete("turn on the lights"))
+        self.assertFalse(policy.is_complete("turn on the"))
+        self.assertTrue(policy.is_complete("what is the."))
+        self.assertFalse(policy.is_complete(""))
+
+        self.assertFalse(policy.update("turn on", True, 0.1))
+        self.assertFalse(policy.update("turn on the lights", True, 0.1))
+        # Silence, but hypothesis not yet stable
+        self.assertFalse(policy.update("turn on the lights", False, 0.1))
+        self.assertTrue(policy.update("turn on the lights", False, 0.1))
+        policy.reset()
+        self.assertFalse(policy.update("turn on the", False, 1.0))
+        self.assertFalse(policy.update("turn on the", False, 1.0))
+
+        strict = EndpointPolicy(stable_seconds=0, min_silence_seconds=0,
+                                require_punctuation=True)
+        self.assertFalse(strict.update("turn on the lights", False, 0.1))
+        self.assertTrue(strict.update("turn on the lights.", False, 0.1))
+
+    def test_evaluate_endpointing(self):
+        import wave
+        from tempfile import mkstemp
+        from neon_speech.endpointing import EndpointPolicy, \
+            evaluate_endpointing
+        words = ["turn", "on", "the", "lights"]
+
+        class MockStream:
+            text = None
+
+        class MockStreamingSTT:
+            def stream_start(self, lang):
+                self.stream = MockStream()
+                self.speech = 0
+
+            def stream_data(self, data):
+                if any(data):
+                    self.speech += 1
+                self.stream.text = " ".join(words[:self.speech]) or None
+
+            def transcribe(self, audio, lang):
+                return [(self.stream.text, 1.0)]
+
+        class MockVAD:
+            @staticmethod
+            def is_silence(chunk):
+                return not any(chunk)
+
+        _, path = mkstemp(suffix=".wav")
+        chunk = b"\x00" * 960
+        with wave.open(path, 'wb') as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(16000)
+            f.writeframes(chunk + b"\x01" * 960 * 4 + chunk * 40)
+        results = []
+        summary = evaluate_endpointing(
+            [path], MockStreamingSTT(), MockVAD(),
+            EndpointPolicy(stable_seconds=0.09, min_silence_seconds=0.06),
+            "en-us", silence_seconds=0.6, on_result=results.append)
+        self.assertEqual(summary["files"], 1)
+        self.assertEqual(summary["early_endpoints"], 1)
+        self.assertEqual(summary["truncations"], 0)
+        self.assertAlmostEqual(summary["mean_latency_gained"], 0.51)
+        self.assertEqual(results[0]["early_text"], "turn on the lights")
+
+        # An incomplete hypothesis does not end early
+        words.pop()
+        summary = evaluate_endpointing(
+            [path], MockStreamingSTT(), MockVAD(),
+            EndpointPolicy(stable_seconds=0.09, min_silence_seconds=0.06),
+            "en-us", silence_seconds=0.6)
+        self.assertEqual(summary["early_endpoints"], 0)
+        os.remove(path)
+
+    def test_evaluate_endpointing_mixed(self):
+        import wave
+        from tempfile import mkstemp
+        from neon_speech.endpointing import EndpointPolicy, \
+            evaluate_endpointing
+        words = ["turn", "on", "the", "lights", "now"]
+
+        class MockStream:
+            text = None
+
+        class MockStreamingSTT:
+            def stream_start(self, lang):
+                self.stream = MockStream()
+                self.speech = 0
+
+            def stream_data(self, data):
+                if any(data):
+                    self.speech += 1
+                self.stream.text = " ".join(words[:self.speech]) or None
+
+            def transcribe(self, audio, lang):
+                # No results for audio without speech
+                return [(self.stream.text, 1.0)] if self.stream.text else []
+
+        class MockVAD:
+            @staticmethod
+            def is_silence(chunk):
+                return not any(chunk)
+
+        chunk = b"\x00" * 960
+        speech = b"\x01" * 960
+        paths = list()
+        for frames in (chunk + speech * 4 + chunk * 40,
+                       chunk + speech * 4 + chunk * 10 + speech + chunk * 40,
+                       chunk * 10):
+            _, path = mkstemp(suffix=".wav")
+            with wave.open(path, 'wb') as f:
+                f.setnchannels(1)
+                f.setsampwidth(2)
+                f.setframerate(16000)
+                f.writeframes(frames)
+            paths.append(path)
+        results = []
+        summary = evaluate_endpointing(
+            paths, MockStreamingSTT(), MockVAD(),
+            EndpointPolicy(stable_seconds=0.09, min_silence_seconds=0.06),
+            "en-us", silence_seconds=0.6, on_result=results.append)
+        self.assertEqual(summary["files"], 3)
+        self.assertEqual(summary["early_endpoints"], 2)
+        self.assertEqual(summary["truncations"], 1)
+        self.assertEqual(summary["truncation_rate"], 0.5)
+        self.assertTrue(results[1]["truncated"])
+        self.assertEqual(results[1]["baseline_text"], "turn on the lights now")
+        self.assertEqual(results[2]["baseline_text"], "")
+        # Latency gained without truncation is averaged over correct results
+        self.assertAlmostEqual(summary["mean_latency_gained_correct"],
+                               results[0]["latency_gained"])
+        self.assertAlmostEqual(summary["mean_latency_gained_correct"], 0.51)
+        for path in paths:
+            os.remove(path)
+
+
+class SaveQueueTests(unittest.TestCase):
+    def test_background_save_queue(self):
+        from neon_speech.save_queue import BackgroundSaveQueue
+        started = Event()
+        release = Event()
+        completed = []
+
+        def blocking_write():
+            started.set()
+            release.wait(5)
+            return "/blocked"
+
+        def write(path):
+            return path
+
+        def fail():
+            raise OSError("disk full")
+
+        queue = BackgroundSaveQueue(max_size=2,
+                                    on_complete=completed.append)
+        blocked = queue.submit(blocking_write)
+        self.assertTrue(started.wait(5))
+        first = queue.submit(write, "/first")
+        second = queue.submit(write, "/second")
+        third = queue.submit(write, "/third")
+        failed = queue.submit(fail)
+        self.assertTrue(blocked.handle.startswith("pending://"))
+        self.assertEqual(first.state, "dropped")
+        self.assertEqual(second.state, "dropped")
+        stats = queue.get_stats()
+        self.assertEqual(stats["depth"], 3)
+        self.assertEqual(stats["dropped"], 2)
+
+        release.set()
+        self.assertTrue(queue.join(5))
+        self.assertEqual(third.state, "saved")
+        self.assertEqual(third.path, "/third")
+        self.assertEqual(failed.state, "failed")
+        self.assertEqual([p.path for p in completed],
+                         ["/blocked", "/third", None])
+        stats = queue.get_stats()
+        self.assertEqual((stats["depth"], stats["completed"], stats["failed"]),
+                         (0, 2, 1))
+        queue.shutdown()
+
+
+class RecordingStoreTests(unittest.TestCase):
+    def test_recording_store(self):
+        from tempfile import mkdtemp
+        from neon_speech.recording_store import RecordingStore, \
+            get_segments, iter_records, read_record, export_recordings
+        root = mkdtemp()
+        store = RecordingStore(join(root, "store"), segment_bytes=100,
+                               max_bytes=10000)
+        meta = {"transcriptions": [("hello", 0.9)]}
+        handle = store.append(b"\x01" * 60, meta, 16000, 2)
+        # Metadata is captured when the recording is queued
+        meta["filename"] = handle
+        self.assertTrue(handle.startswith("recording://"))
+        for i in range(2, 5):
+            store.append(bytes([i]) * 60, {"i": i}, 16000, 2)
+        store.flush()
+
+        self.assertEqual(len(get_segments(store.path)), 4)
+        records = list(iter_records(store.path))
+        self.assertEqual(len(records), 4)
+        self.assertEqual(handle.split('#')[1], records[0]["id"])
+        self.assertEqual(json.loads(records[0]["meta"]),
+                         {"transcriptions": [["hello", 0.9]]})
+        self.assertEqual(read_record(records[1]), b"\x02" * 60)
+
+        output = join(root, "export")
+        self.assertEqual(export_recordings(store.path, output), 4)
+        self.assertTrue(os.path.isfile(join(output,
+                                            f"{records[0]['id']}.wav")))
+
+        # Oldest segments are removed to stay within limits
+        # Each segment holds 60 bytes of audio plus its index entry
+        store.max_bytes = 300
+        store.append(b"\x05" * 60, {}, 16000, 2)
+        store.flush()
+        remaining = [r["meta"] for r in iter_records(store.path)]
+        self.assertEqual(len(remaining), 2)
+        self.assertEqual(json.loads(remaining[-1]), {})
+        store.shutdown()
+
+        # A new store continues with a new segment
+        store = RecordingStore(store.path, segment_bytes=100, max_bytes=300)
+        store.append(b"\x06" * 60, {}, 16000, 2)
+        store.shutdown()
+        self.assertEqual(len(list(iter_records(store.path))), 2)
+        shutil.rmtree(root)
+
+
 class ServiceTests(unittest.TestCase):
     bus = FakeBus()
     bus.connected_event = Event()
@@ -466,6 +2302,59 @@ class TestCLI(unittest.TestCase):
         self.runner.invoke(run)
         main.assert_called_once()
 
+    def test_export_recordings(self):
+        from tempfile import mkdtemp
+        from neon_speech.cli import export_recordings
+        from neon_speech.recording_store import RecordingStore
+        root = mkdtemp()
+        store = RecordingStore(join(root, "store"))
+        store.append(b"\x00" * 320, {}, 16000, 2)
+        store.shutdown()
+        result = self.runner.invoke(export_recordings,
+                                    ["--path", store.path,
+                                     join(root, "export")])
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Exported 1 recordings", result.output)
+        shutil.rmtree(root)
+
+    @patch("neon_utils.packaging_utils.install_packages_from_pip")
+    @patch("neon_speech.utils.get_dependency_cache_path")
+    def test_install_dependencies(self, cache_path, install):
+        from tempfile import mkdtemp
+        from neon_speech.cli import install_dependencies
+        root = mkdtemp()
+        cache_path.return_value = join(root, "deps.json")
+        install.return_value = 0
+
+        # Installed requirements do not call pip
+        result = self.runner.invoke(install_dependencies,
+                                    ["-p", "click>=7.0"])
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Dependencies satisfied", result.output)
+        install.assert_not_called()
+        result = self.runner.invoke(install_dependencies,
+                                    ["-p", "click>=7.0"])
+        self.assertIn("Dependencies unchanged", result.output)
+        install.assert_not_called()
+
+        result = self.runner.invoke(install_dependencies,
+                                    ["-p", "not-a-real-package-xyz"])
+        self.assertEqual(result.exit_code, 0)
+        install.assert_called_once_with("neon-speech",
+                                        ["not-a-real-package-xyz"])
+        self.runner.invoke(install_dependencies, ["-p", "click", "-f"])
+        self.assertEqual(install.call_count, 2)
+        shutil.rmtree(root)
+
+    def test_get_unsatisfied_requirements(self):
+        from neon_speech.utils import get_unsatisfied_requirements
+        self.assertEqual(get_unsatisfied_requirements(
+            ["click>=7.0", "click<1.0", "not-a-real-package-xyz",
+             "missing-package; python_version < '3.0'", "!invalid",
+             "click[extra]>=7.0", "click @ https://example.com/click.whl"]),
+            ["click<1.0", "not-a-real-package-xyz", "!invalid",
+             "click[extra]>=7.0", "click @ https://example.com/click.whl"])
+
 
 if __name__ == '__main__':
     unittest.main()